@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+# ─── Puslapių atvaizdavimo matavimas (Streamlit AppTest, be naršyklės) ────────
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, sql):
+        if not sql.lstrip().upper().startswith(_CONTROL):
+            self.count += 1
+
+
+def _widget(elements, label):
+    return next(w for w in elements if w.label == label)
+
+
+def _has(elements, label):
+    return any(w.label == label for w in elements)
+
+
+def _submit_krovinys(at, i):
+    if _has(at.text_input, "Klientas (nėra įvestų)"):
+        _widget(at.text_input, "Klientas (nėra įvestų)").set_value("Bench UAB")
+    _widget(at.text_input, "Užsakymo numeris").set_value(f"BENCH-{i}")
+    # Matuojamas įrašymas, ne atmetimas dėl sugeneruotų persidengimų
+    _widget(at.checkbox, "Įrašyti net jei vilkikas ar priekaba tuo metu užimti").check()
+    _widget(at.button, "💾 Įrašyti krovinį").click()
+
+
+def _submit_vilkikas(at, i):
+    _widget(at.text_input, "Numeris").set_value(f"BENCH{os.getpid()}-{i}")
+    _widget(at.button, "💾 Įrašyti vilkiką").click()
+
+
+def _submit_klientas(at, i):
+    _widget(at.text_input, "Įmonės pavadinimas").set_value(f"Bench klientas {i}")
+    _widget(at.button, "💾 Išsaugoti").click()
+
+
+SUBMITS = {
+    "Kroviniai": _submit_krovinys,
+    "Vilkikai": _submit_vilkikas,
+    "Klientai": _submit_klientas,
+}
+
+
+def _measure(at, counter, action=None):
+    counter.count = 0
+    tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    if action:
+        action()
+    at.run()
+    wall = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return {"laikas_s": wall, "uzklausos": counter.count, "atmintis_mb": peak / 2**20}
+
+
+def _aggregate(samples):
+    return {
+        "laikas_s": statistics.median(s["laikas_s"] for s in samples),
+        "laikas_max_s": max(s["laikas_s"] for s in samples),
+        "uzklausos": max(s["uzklausos"] for s in samples),
+        "atmintis_mb": max(s["atmintis_mb"] for s in samples),
+        "kartai": len(samples),
+    }
+
+
+def run(db, repeats=5, timeout=120):
+    from streamlit.testing.v1 import AppTest
+
+    counter = QueryCounter()
+    db.set_trace(counter)
+    tracemalloc.start()
+    results = []
+    try:
+        at = AppTest.from_file(MAIN, default_timeout=timeout)
+        at.run()  # importai ir schema – neskaičiuojama
+        moduliai = list(at.sidebar.radio[0].options)
+        for modulis in moduliai:
+            radio = at.sidebar.radio[0]
+            first = _measure(at, counter, lambda: radio.set_value(modulis))
+            results.append({"puslapis": modulis, "veiksmas": "atidarymas", **_aggregate([first])})
+            reruns = [_measure(at, counter) for _ in range(repeats)]
+            results.append({"puslapis": modulis, "veiksmas": "perpaleidimas", **_aggregate(reruns)})
+            if modulis in SUBMITS:
+                submits = [_measure(at, counter, lambda i=i: SUBMITS[modulis](at, i))
+                           for i in range(repeats)]
+                results.append({"puslapis": modulis, "veiksmas": "įrašymas", **_aggregate(submits)})
+    finally:
+        tracemalloc.stop()
+        db.set_trace(None)
+    return results
+
+
+def table_sizes(db):
+    return {t: db.query_one(f"SELECT COUNT(*) FROM {t}")[0] for t in
+            ("kroviniai", "vilkikai", "priekabos", "vairuotojai", "klientai")}
+
+
+def print_report(results, baseline=None):
+    base = {(r["puslapis"], r["veiksmas"]): r for r in (baseline or {}).get("rezultatai", [])}
+    print(f"{'Puslapis':<14}{'Veiksmas':<15}{'ms':>9}{'užkl.':>7}{'MB':>8}{'Δ ms':>10}")
+    for r in results:
+        old = base.get((r["puslapis"], r["veiksmas"]))
+        delta = f"{(r['laikas_s'] - old['laikas_s']) * 1000:+.0f}" if old else ""
+        print(f"{r['puslapis']:<14}{r['veiksmas']:<15}{r['laikas_s'] * 1000:>9.0f}"
+              f"{r['uzklausos']:>7}{r['atmintis_mb']:>8.1f}{delta:>10}")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="DISPO modulių atvaizdavimo benchmark")
+    p.add_argument("--db", default=os.environ.get("DISPO_DB", "dispo_new.db"))
+    p.add_argument("--kartai", type=int, default=5, help="perpaleidimų skaičius vienam matavimui")
+    p.add_argument("--isvestis", default=f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    p.add_argument("--palyginti", help="ankstesnis JSON rezultatas palyginimui")
+    p.add_argument("--generuoti", type=int, metavar="KROVINIAI",
+                   help="prieš matuojant sugeneruoti tiek krovinių (sample_data)")
+    args = p.parse_args(argv)
+
+    # DB kelias turi būti nustatytas prieš importuojant db / main.py
+    os.environ["DISPO_DB"] = args.db
+    from db import get_db
+    db = get_db(args.db)
+    if args.generuoti:
+        from sample_data import generate
+        generate(db, kroviniai=args.generuoti)
+
+    results = run(db, args.kartai)
+    out = {
+        "laikas": datetime.now().isoformat(timespec="seconds"),
+        "db": os.path.abspath(args.db),
+        "dydziai": table_sizes(db),
+        "python": platform.python_version(),
+        "rezultatai": results,
+    }
+    with open(args.isvestis, "w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+    baseline = None
+    if args.palyginti:
+        with open(args.palyginti, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+    print(f"Rezultatai: {args.isvestis}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import json
+
+import numpy as np
+
+import conflicts
+import kpi
+import search
+
+# ─── Krovinio įrašymas (vykdoma rašytojo transakcijoje) ───────────────────────
+FIELDS = [
+    "klientas", "uzsakymo_numeris", "pakrovimo_numeris",
+    "pakrovimo_data", "pakrovimo_laikas_nuo", "pakrovimo_laikas_iki",
+    "iskrovimo_data", "iskrovimo_laikas_nuo", "iskrovimo_laikas_iki",
+    "pakrovimo_salis", "pakrovimo_miestas", "iskrovimo_salis", "iskrovimo_miestas",
+    "vilkikas", "priekaba", "atsakingas_vadybininkas",
+    "kilometrai", "frachtas", "svoris", "paleciu_skaicius", "busena", "priekabu_tipas"
+]
+
+INSERT_SQL = f"""
+    INSERT INTO kroviniai ({", ".join(FIELDS)})
+    VALUES ({", ".join("?" for _ in FIELDS)})
+"""
+
+def order_number(base, kiekis):
+    """kiekis-asis to paties bazinio numerio panaudojimas: X, X-1, X-2, ..."""
+    return base if kiekis <= 1 else f"{base}-{kiekis - 1}"
+
+
+def _number_taken(conn, numeris):
+    return conn.execute(
+        "SELECT 1 FROM kroviniai WHERE uzsakymo_numeris = ? LIMIT 1", (numeris,)
+    ).fetchone() is not None
+
+
+def allocate_order_number(conn, base, taken=()):
+    """Kitas laisvas base numeris. Skaitiklis didinamas toje pačioje transakcijoje
+    kaip ir INSERT; jei numeris jau užimtas (pvz. 'X-1' įvestas ranka), imamas
+    kitas. taken – šioje transakcijoje jau paskirti, bet dar neįrašyti numeriai."""
+    while True:
+        kiekis = conn.execute("""
+            INSERT INTO uzsakymo_numeriai(bazinis, kiekis) VALUES(?, 1)
+            ON CONFLICT(bazinis) DO UPDATE SET kiekis = kiekis + 1
+            RETURNING kiekis
+        """, (base,)).fetchone()[0]
+        numeris = order_number(base, kiekis)
+        if numeris not in taken and not _number_taken(conn, numeris):
+            return numeris
+
+
+def insert(conn, values):
+    """Įrašo krovinį; grąžina (id, galutinis užsakymo numeris)."""
+    values = dict(values)
+    values["uzsakymo_numeris"] = allocate_order_number(conn, values["uzsakymo_numeris"])
+    cur = conn.execute(INSERT_SQL, [values.get(f) for f in FIELDS])
+    kpi.apply(conn, [values])
+    return cur.lastrowid, values["uzsakymo_numeris"]
+
+
+def save(db, values, check_conflicts=False):
+    """check_conflicts – persidengimas tikrinamas toje pačioje transakcijoje;
+    radus, kyla conflicts.ConflictError ir niekas neįrašoma."""
+    def run(conn):
+        if check_conflicts:
+            conflicts.check(conn, values)
+        return insert(conn, values)
+    return db.transaction(run, tables=["kroviniai", "kpi"])
+
+
+def allocate_order_numbers(conn, bases):
+    """Masinis allocate_order_number: bases – pandas Series, grąžina numerius."""
+    unique = bases.unique().tolist()
+    esami = dict(conn.execute(
+        "SELECT bazinis, kiekis FROM uzsakymo_numeriai "
+        "WHERE bazinis IN (SELECT value FROM json_each(?))", (json.dumps(unique),)
+    ).fetchall())
+    kiekis = bases.map(esami).fillna(0).astype("int64") + bases.groupby(bases).cumcount() + 1
+    galutiniai = kiekis.groupby(bases).max()
+    conn.executemany("""
+        INSERT INTO uzsakymo_numeriai(bazinis, kiekis) VALUES(?, ?)
+        ON CONFLICT(bazinis) DO UPDATE SET kiekis = excluded.kiekis
+    """, zip(galutiniai.index.tolist(), galutiniai.tolist()))
+    numeriai = bases.where(kiekis <= 1, bases + "-" + (kiekis - 1).astype(str))
+    # Retas atvejis: numeris jau yra bazėje (įvestas su priesaga ranka) arba
+    # sutampa su kitos bazės numeriu šiame pakete – tokioms eilutėms po vieną
+    uzimti = {r[0] for r in conn.execute(
+        "SELECT uzsakymo_numeris FROM kroviniai "
+        "WHERE uzsakymo_numeris IN (SELECT value FROM json_each(?))",
+        (json.dumps(numeriai.unique().tolist()),),
+    )}
+    kolizijos = numeriai.isin(uzimti) | numeriai.duplicated()
+    if kolizijos.any():
+        numeriai = numeriai.copy()
+        taken = set(numeriai[~kolizijos])
+        for i in np.flatnonzero(kolizijos.to_numpy()):
+            numeriai.iloc[i] = allocate_order_number(conn, bases.iloc[i], taken)
+            taken.add(numeriai.iloc[i])
+    return numeriai
+
+
+def insert_many(conn, frame):
+    """Įrašo DataFrame su FIELDS stulpeliais vienu executemany; grąžina eilučių sk."""
+    frame = frame.assign(uzsakymo_numeris=allocate_order_numbers(conn, frame["uzsakymo_numeris"]))
+    # Trūkstami stulpeliai (pvz. vėliau pridėti laukai) – NULL, kaip cargo_import
+    rows = frame.reindex(columns=FIELDS)
+    rows = rows.astype(object).where(rows.notna(), None)
+    with search.deferred_index(conn, ["kroviniai"]):
+        conn.executemany(INSERT_SQL, rows.itertuples(index=False, name=None))
+    kpi.apply(conn, frame)
+    return len(frame)
@@ -0,0 +1,155 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+import cargo
+
+# ─── Masinis krovinių importas iš CSV / XLSX ──────────────────────────────────
+CHUNK_SIZE = 20000
+MAX_REPORT_ROWS = 10000  # atmestų eilučių klaidų ataskaitoje; kitos tik skaičiuojamos
+INT_FIELDS = ["kilometrai", "svoris", "paleciu_skaicius"]
+FLOAT_FIELDS = ["frachtas"]
+TIME_DEFAULTS = {
+    "pakrovimo_laikas_nuo": "08:00:00", "pakrovimo_laikas_iki": "17:00:00",
+    "iskrovimo_laikas_nuo": "08:00:00", "iskrovimo_laikas_iki": "17:00:00",
+}
+DEFAULT_BUSENA = "nesuplanuotas"
+
+
+def read_chunks(file, name, chunksize=CHUNK_SIZE):
+    """Skaito failą dalimis; kiekviena dalis – DataFrame su tekstinėmis reikšmėmis."""
+    if name.lower().endswith((".xlsx", ".xlsm")):
+        yield from _read_xlsx_chunks(file, chunksize)
+    else:
+        yield from pd.read_csv(
+            file, chunksize=chunksize, dtype=str, keep_default_na=False,
+            sep=_sniff_sep(file), encoding="utf-8-sig",
+        )
+
+
+def _sniff_sep(file):
+    # Excel su LT lokale CSV saugo su ';'
+    head = file.read(4096)
+    file.seek(0)
+    if isinstance(head, bytes):
+        head = head.decode("utf-8", errors="ignore")
+    first = head.splitlines()[0] if head else ""
+    return ";" if first.count(";") > first.count(",") else ","
+
+
+def _read_xlsx_chunks(file, chunksize):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("XLSX importui reikalingas paketas openpyxl (pip install openpyxl).")
+    wb = load_workbook(file, read_only=True, data_only=True)
+    rows = wb.active.iter_rows(values_only=True)
+    header = [str(h).strip() if h is not None else "" for h in next(rows, [])]
+    buf = []
+    for row in rows:
+        buf.append(row)
+        if len(buf) >= chunksize:
+            yield _xlsx_frame(buf, header)
+            buf = []
+    if buf:
+        yield _xlsx_frame(buf, header)
+    wb.close()
+
+
+def _xlsx_frame(rows, header):
+    df = pd.DataFrame(rows, columns=header)
+    return df.astype(object).where(df.notna(), "").astype(str)
+
+
+def _parse_unique(col, parse):
+    # Datų ir laikų skirtingų reikšmių nedaug – verčiame tik unikalias
+    uniq = pd.Series(col.unique())
+    return col.map(pd.Series(parse(uniq).to_numpy(), index=uniq.to_numpy()))
+
+
+def _date(col):
+    # XLSX datos ateina kaip "YYYY-MM-DD 00:00:00"
+    iso = col.str[:10].str.replace(r"[./]", "-", regex=True)
+    return _parse_unique(iso, lambda u: pd.to_datetime(
+        u, format="%Y-%m-%d", errors="coerce").dt.strftime("%Y-%m-%d"))
+
+
+def _time(col, default):
+    parsed = _parse_unique(col, lambda u: pd.to_datetime(
+        u, format="mixed", errors="coerce").dt.strftime("%H:%M:%S"))
+    return parsed.where(col != "", default)
+
+
+def validate(chunk, trailers):
+    """Grąžina (tinkamos eilutės FIELDS pavidalu, atmestos eilutės su 'klaida')."""
+    df = chunk.reindex(columns=cargo.FIELDS, fill_value="").fillna("").astype(str)
+    for col in cargo.FIELDS:
+        df[col] = df[col].str.strip()
+    klaida = pd.Series("", index=df.index, dtype=object)
+
+    def mark(mask, msg):
+        klaida[mask & (klaida == "")] = msg
+
+    mark((df["klientas"] == "") | (df["uzsakymo_numeris"] == ""),
+         "Privalomi laukai: Klientas ir Užsakymo numeris")
+    pak = _date(df["pakrovimo_data"])
+    isk = _date(df["iskrovimo_data"])
+    mark(pak.isna() | isk.isna(), "Neteisinga data (laukiama YYYY-MM-DD)")
+    mark(pak > isk, "Pakrovimo data negali būti vėlesnė už iškrovimo datą")
+    df["pakrovimo_data"], df["iskrovimo_data"] = pak, isk
+
+    for col, default in TIME_DEFAULTS.items():
+        t = _time(df[col], default)
+        mark(t.isna(), f"Neteisingas laikas: {col}")
+        df[col] = t
+    for col in INT_FIELDS + FLOAT_FIELDS:
+        raw = df[col].str.replace(",", ".", regex=False)
+        num = pd.to_numeric(raw.where(raw != "", "0"), errors="coerce")
+        bad = num.isna()
+        if col in INT_FIELDS:
+            bad |= num.notna() & (num != np.floor(num))
+        mark(bad, f"Neteisingas skaičius: {col}")
+        df[col] = num
+
+    ok = klaida == ""
+    good = df[ok].copy()
+    for col in INT_FIELDS:
+        good[col] = good[col].astype("int64")
+    good["frachtas"] = good["frachtas"].astype("float64")
+    # Kaip formoje: priekaba pagal vilkiką, vadybininkas – vadyb_<vilkikas>
+    good["priekaba"] = good["priekaba"].where(
+        good["priekaba"] != "", good["vilkikas"].map(trailers).fillna(""))
+    good["atsakingas_vadybininkas"] = good["atsakingas_vadybininkas"].where(
+        good["atsakingas_vadybininkas"] != "", "vadyb_" + good["vilkikas"].str.lower())
+    good["busena"] = good["busena"].where(good["busena"] != "", DEFAULT_BUSENA)
+
+    rejected = chunk[~ok].copy()
+    rejected.insert(0, "klaida", klaida[~ok])
+    return good, rejected
+
+
+def import_file(db, file, name, trailers, chunksize=CHUNK_SIZE, progress=None):
+    """Importuoja failą dalimis; kiekviena dalis – viena rašymo transakcija.
+
+    Grąžina (įrašyta, atmesta, klaidų ataskaita CSV baitais arba None);
+    ataskaitoje – ne daugiau MAX_REPORT_ROWS pirmų atmestų eilučių.
+    """
+    irasyta = atmesta = 0
+    report = io.StringIO()
+    offset = 2  # antraštė – 1 eilutė
+    for chunk in read_chunks(file, name, chunksize):
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk), name="eilute")
+        offset += len(chunk)
+        good, rejected = validate(chunk, trailers)
+        if len(good):
+            irasyta += db.transaction(
+                lambda conn: cargo.insert_many(conn, good), tables=["kroviniai", "kpi"])
+        if len(rejected):
+            if atmesta < MAX_REPORT_ROWS:
+                rejected.iloc[:MAX_REPORT_ROWS - atmesta].to_csv(report, header=atmesta == 0)
+            atmesta += len(rejected)
+        if progress:
+            progress(irasyta, atmesta)
+    data = report.getvalue().encode("utf-8-sig") if atmesta else None
+    return irasyta, atmesta, data
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+
+import cargo
+
+# ─── Krovinių sąrašas puslapiais (keyset / seek) ──────────────────────────────
+COLUMNS = ["id"] + cargo.FIELDS
+DEFAULT_COLUMNS = [
+    "id", "klientas", "uzsakymo_numeris", "pakrovimo_data", "pakrovimo_miestas",
+    "iskrovimo_data", "iskrovimo_miestas", "vilkikas", "frachtas", "busena"
+]
+# Rikiuojama tik pagal stulpelius, kurie visada užpildyti (NULL sugadintų seek sąlygą)
+SORT_COLUMNS = ["id", "pakrovimo_data", "iskrovimo_data"]
+# Eilučių skaičiai: po įrašymo senas skaičius dar rodomas COUNT_MAX_AGE s,
+# laikoma ne daugiau MAX_COUNTS filtrų derinių
+COUNT_MAX_AGE = 10.0
+MAX_COUNTS = 64
+
+_counts = OrderedDict()
+_counts_lock = threading.Lock()
+
+
+def build_where(filters):
+    clauses, params = [], []
+    if filters.get("data_nuo"):
+        clauses.append("pakrovimo_data >= ?")
+        params.append(str(filters["data_nuo"]))
+    if filters.get("data_iki"):
+        clauses.append("pakrovimo_data <= ?")
+        params.append(str(filters["data_iki"]))
+    for col in ("klientas", "vilkikas", "busena"):
+        if filters.get(col):
+            clauses.append(f"{col} = ?")
+            params.append(filters[col])
+    return clauses, params
+
+
+def fetch_page(db, columns, filters, sort="id", descending=True, after=None, limit=50):
+    """Grąžina (puslapis, kitas_žymeklis); žymeklis – (rikiavimo reikšmė, id).
+
+    Kitas puslapis pradedamas nuo paskutinės matytos eilutės, todėl kaina
+    priklauso nuo puslapio dydžio, o ne nuo to, kiek eilučių praleista.
+    """
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"Netinkamas rikiavimo stulpelis: {sort}")
+    columns = [c for c in columns if c in COLUMNS and c != "id"]
+    clauses, params = build_where(filters)
+    op = "<" if descending else ">"
+    direction = "DESC" if descending else "ASC"
+    if after is not None:
+        if sort == "id":
+            clauses.append(f"id {op} ?")
+            params.append(after[1])
+        else:
+            clauses.append(f"({sort}, id) {op} (?, ?)")
+            params.extend(after)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    order = "id" if sort == "id" else f"{sort} {direction}, id"
+    select = ", ".join(["id"] + columns + ([sort] if sort != "id" and sort not in columns else []))
+    sql = f"SELECT {select} FROM kroviniai {where} ORDER BY {order} {direction} LIMIT ?"
+    page = db.query_df(sql, params + [limit + 1])
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page.iloc[:limit]
+        last = page.iloc[-1]
+        next_cursor = (last[sort], int(last["id"]))
+    return page[["id"] + columns], next_cursor
+
+
+def count(db, ref, filters, max_age=COUNT_MAX_AGE):
+    """Eilučių skaičius pagal filtrus.
+
+    Nepasikeitus kroviniams – iš podėlio; pasikeitus, ankstesnis skaičius dar
+    naudojamas max_age sekundžių, kad kiekvienas įrašymas nekeltų COUNT(*)
+    visiems atidarytiems filtrams.
+    """
+    clauses, params = build_where(filters)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    key = (db.path, where, tuple(params))
+    version = ref.version("kroviniai")
+    with _counts_lock:
+        hit = _counts.get(key)
+        if hit is not None and (hit[0] == version or time.monotonic() - hit[1] < max_age):
+            _counts.move_to_end(key)
+            return hit[2]
+    value = db.query_one(f"SELECT COUNT(*) FROM kroviniai {where}", params)[0]
+    with _counts_lock:
+        _counts[key] = (version, time.monotonic(), value)
+        _counts.move_to_end(key)
+        while len(_counts) > MAX_COUNTS:
+            _counts.popitem(last=False)
+    return value
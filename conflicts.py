@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+# ─── Vilkikų / priekabų užimtumo konfliktai ───────────────────────────────────
+# Du kroviniai konfliktuoja, jei jų pakrovimo→iškrovimo intervalai persidengia
+# griežtai: iškrauti ir pakrauti tą pačią dieną galima, todėl bendra kraštinė
+# diena konfliktu nelaikoma.
+UNITS = {"vilkikas": "Vilkikas", "priekaba": "Priekaba"}
+
+# Ilgiausia reisų trukmė dienomis – pagal išraiškos indeksą (O(log n))
+MAX_TRIP_SQL = """
+    SELECT COALESCE(MAX(julianday(iskrovimo_data) - julianday(pakrovimo_data)), 0)
+    FROM kroviniai
+"""
+
+# (vienetas, pakrovimo_data) indeksas: pakrovimas turi būti intervale
+# (nuo - ilgiausias reisas, iki), tad skenuojamas tik siauras indekso gabalas
+_OVERLAP_SQL = """
+    SELECT id, uzsakymo_numeris, klientas, pakrovimo_data, iskrovimo_data, busena, {col} AS numeris
+    FROM kroviniai
+    WHERE {col} = :numeris
+      AND pakrovimo_data > date(:nuo, '-' || :maks || ' days')
+      AND pakrovimo_data < :iki
+      AND iskrovimo_data > :nuo
+      AND id <> :id
+    ORDER BY pakrovimo_data
+"""
+
+
+class ConflictError(Exception):
+    """Krovinys persidengia su jau suplanuotais; conflicts – DataFrame."""
+
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__(f"Persidengia su {len(conflicts)} krovinių")
+
+
+def find(conn, values, exclude_id=None):
+    """Kroviniai, su kuriais values persidengtų tame pačiame vilkike ar priekaboje."""
+    maks = int(conn.execute(MAX_TRIP_SQL).fetchone()[0])
+    frames = []
+    for col, label in UNITS.items():
+        if not values.get(col):
+            continue
+        params = {
+            "numeris": values[col], "nuo": str(values["pakrovimo_data"]),
+            "iki": str(values["iskrovimo_data"]), "maks": maks, "id": exclude_id or -1,
+        }
+        found = pd.read_sql_query(_OVERLAP_SQL.format(col=col), conn, params=params)
+        frames.append(found.assign(tipas=label))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def check(conn, values, exclude_id=None):
+    """Kelia ConflictError, jei yra persidengimų; kviečiama rašymo transakcijoje."""
+    found = find(conn, values, exclude_id)
+    if len(found):
+        raise ConflictError(found)
+
+
+# ─── Viso parko ataskaita intervale ───────────────────────────────────────────
+REPORT_SQL = """
+    SELECT id, uzsakymo_numeris, vilkikas, priekaba, pakrovimo_data, iskrovimo_data
+    FROM kroviniai
+    WHERE pakrovimo_data >= date(:nuo, '-' || :maks || ' days')
+      AND pakrovimo_data <= :iki
+      AND iskrovimo_data >= :nuo
+"""
+
+
+def _overlaps(df, col):
+    # Surikiavus pagal (vienetas, pakrovimas, iškrovimas), krovinys konfliktuoja,
+    # jei jis prasideda anksčiau nei baigiasi vėliausiai pasibaigiantis ankstesnis.
+    # Rikiavimas ir pagal iškrovimą užtikrina, kad vienos dienos krovinys nebus
+    # laikomas konfliktu su tą pačią dieną prasidedančiu ilgesniu.
+    df = df[df[col].fillna("") != ""].sort_values([col, "pak", "isk", "id"])
+    if df.empty:
+        return pd.DataFrame()
+    unit = df[col].to_numpy()
+    end = df["isk"].to_numpy()
+    new_group = np.r_[True, unit[1:] != unit[:-1]]
+    grp = np.cumsum(new_group)
+    cummax = pd.Series(end).groupby(grp).cummax().to_numpy()
+    # Kuris krovinys laiko tą maksimumą – id perkeliamas į priekį grupės ribose
+    holder = pd.Series(np.where(end == cummax, df["id"].to_numpy(), np.nan)).groupby(grp).ffill()
+    prev_end = np.r_[np.datetime64("NaT"), cummax[:-1]]
+    prev_id = np.r_[np.nan, holder.to_numpy()[:-1]]
+    prev_end[new_group] = np.datetime64("NaT")
+    hit = df["pak"].to_numpy() < prev_end
+    out = df[hit]
+    return pd.DataFrame({
+        "tipas": UNITS[col],
+        "numeris": out[col].to_numpy(),
+        "id": out["id"].to_numpy(),
+        "uzsakymo_numeris": out["uzsakymo_numeris"].to_numpy(),
+        "pakrovimo_data": out["pakrovimo_data"].to_numpy(),
+        "iskrovimo_data": out["iskrovimo_data"].to_numpy(),
+        "persidengia_su_id": prev_id[hit].astype("int64"),
+    })
+
+
+def report(db, nuo, iki):
+    """Persidengimai [nuo, iki] lange visam parkui (vilkikai ir priekabos).
+
+    Pateikiamas kiekvienas krovinys, prasidedantis kol tame pačiame vienete dar
+    vykdomas ankstesnis; persidengia_su_id – vėliausiai pasibaigiantis iš jų.
+    """
+    with db.reader() as conn:
+        maks = int(conn.execute(MAX_TRIP_SQL).fetchone()[0])
+        df = db.query_df(REPORT_SQL, {"nuo": str(nuo), "iki": str(iki), "maks": maks}, conn=conn)
+    df["pak"] = pd.to_datetime(df["pakrovimo_data"], errors="coerce").to_numpy("datetime64[D]")
+    df["isk"] = pd.to_datetime(df["iskrovimo_data"], errors="coerce").to_numpy("datetime64[D]")
+    df = df[df["pak"].notna() & df["isk"].notna()]
+    parts = [p for p in (_overlaps(df, col) for col in UNITS) if len(p)]
+    if not parts:
+        return pd.DataFrame(columns=["tipas", "numeris", "id", "uzsakymo_numeris",
+                                     "pakrovimo_data", "iskrovimo_data", "persidengia_su_id"])
+    return pd.concat(parts, ignore_index=True)
@@ -0,0 +1,241 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import queue
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import pandas as pd
+
+DB_PATH = os.environ.get("DISPO_DB", "dispo_new.db")
+
+# ─── Prisijungimo nustatymai ──────────────────────────────────────────────────
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",      # ~64 MB puslapių podėlis
+    "PRAGMA mmap_size = 268435456",    # 256 MB
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 30000",
+)
+
+_TARGET_RE = re.compile(r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|UPDATE|DELETE\s+FROM)\s+(\w+)", re.I)
+
+
+def target_table(sql):
+    m = _TARGET_RE.match(sql)
+    return m.group(1).lower() if m else None
+
+
+def _transaction_label(fn, tables):
+    name = f"{getattr(fn, '__module__', None) or ''}.{getattr(fn, '__qualname__', repr(fn))}"
+    return f"TRANSACTION {name.lstrip('.')} ({', '.join(sorted(tables))})"
+
+
+def connect(path, readonly=False):
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    if readonly:
+        conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+class Database:
+    """Skaitymo prisijungimų telkinys ir vienas rašymo srautas.
+
+    Skaitymai vyksta lygiagrečiai per WAL, o visi įrašymai eina per vieną
+    rašytojo giją, kuri eilėje susikaupusius darbus sujungia į vieną
+    transakciją (kiekvienas darbas – atskirame SAVEPOINT, todėl vieno klaida
+    neatšaukia kitų).
+    """
+
+    def __init__(self, path=DB_PATH, readers=8, batch_size=256):
+        self.path = path
+        self.batch_size = batch_size
+        self._writes = queue.Queue()
+        self._listeners = []
+        self._observers = []
+        # Rašytojo prisijungimas atidaromas čia, kad klaida kiltų kviečiančiajam
+        # (ne mirštančioje gijoje); jis sukuria failą ir įjungia WAL prieš skaitytojus
+        writer_conn = connect(path)
+        self._writer = threading.Thread(target=self._write_loop, args=(writer_conn,),
+                                        name="dispo-writer", daemon=True)
+        self._writer.start()
+        self._connections = [connect(path, readonly=True) for _ in range(readers)]
+        self._readers = queue.LifoQueue()
+        for conn in self._connections:
+            self._readers.put(conn)
+
+    # ─── Skaitymas ────────────────────────────────────────────────────────────
+    @contextmanager
+    def reader(self):
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def query(self, sql, params=()):
+        with self.reader() as conn:
+            t0 = time.perf_counter()
+            rows = conn.execute(sql, params).fetchall()
+            self._observe(sql, params, len(rows), t0)
+            return rows
+
+    def query_one(self, sql, params=()):
+        with self.reader() as conn:
+            t0 = time.perf_counter()
+            row = conn.execute(sql, params).fetchone()
+            self._observe(sql, params, int(row is not None), t0)
+            return row
+
+    def query_df(self, sql, params=(), conn=None):
+        """conn – jau paimtas skaitymo prisijungimas, kai keli skaitymai turi
+        matyti tą pačią būseną."""
+        if conn is None:
+            with self.reader() as conn:
+                return self.query_df(sql, params, conn)
+        t0 = time.perf_counter()
+        df = pd.read_sql_query(sql, conn, params=params)
+        self._observe(sql, params, len(df), t0)
+        return df
+
+    # ─── Rašymas ──────────────────────────────────────────────────────────────
+    def submit(self, fn, tables=()):
+        """Įdeda fn(conn) į rašymo eilę; grąžina Future su fn rezultatu.
+
+        tables – lentelės, kurias darbas keičia; po sėkmingo COMMIT apie jas
+        pranešama klausytojams (pvz. žinynų podėliui).
+        """
+        fut = Future()
+        self._writes.put((fn, fut, frozenset(tables)))
+        return fut
+
+    def transaction(self, fn, tables=()):
+        """submit() ir laukimas rezultato; stebėtojams pranešama kaip vienas
+        sakinys 'TRANSACTION modulis.funkcija (lentelės)' su laukimo trukme."""
+        tables = tuple(tables)
+        t0 = time.perf_counter()
+        try:
+            return self.submit(fn, tables).result()
+        finally:
+            self._observe(_transaction_label(fn, tables), (), None, t0)
+
+    def execute(self, sql, params=()):
+        def run(conn):
+            cur = conn.execute(sql, params)
+            return cur.lastrowid, cur.rowcount
+
+        t0 = time.perf_counter()
+        lastrowid, rowcount = self.submit(run, tables=filter(None, [target_table(sql)])).result()
+        self._observe(sql, params, rowcount, t0)
+        return lastrowid
+
+    def executemany(self, sql, rows):
+        t0 = time.perf_counter()
+        rowcount = self.submit(
+            lambda conn: conn.executemany(sql, rows).rowcount,
+            tables=filter(None, [target_table(sql)]),
+        ).result()
+        self._observe(sql, (), rowcount, t0)
+        return rowcount
+
+    def add_listener(self, fn):
+        """fn(tables) kviečiamas rašytojo gijoje po kiekvieno COMMIT."""
+        self._listeners.append(fn)
+
+    def add_observer(self, fn):
+        """fn(sql, params, eilutės, sekundės) po kiekvieno query*/execute*/transaction kvietimo
+        kviečiančioje gijoje; naudoja profiliuotojas."""
+        self._observers.append(fn)
+
+    def _observe(self, sql, params, rows, t0):
+        if self._observers:
+            seconds = time.perf_counter() - t0
+            for fn in self._observers:
+                fn(sql, params, rows, seconds)
+
+    def set_trace(self, fn):
+        """fn(sql) kiekvienam įvykdytam sakiniui (None – išjungti); naudoja benchmark."""
+        for conn in self._connections:
+            conn.set_trace_callback(fn)
+        self.transaction(lambda conn: conn.set_trace_callback(fn))
+
+    def close(self):
+        self._writes.put(None)
+        self._writer.join()
+        for conn in self._connections:
+            conn.close()
+
+    def _write_loop(self, conn):
+        stop = False
+        while not stop:
+            item = self._writes.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._run_batch(conn, batch)
+        conn.close()
+
+    def _run_batch(self, conn, batch):
+        results = []
+        changed = set()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for fn, fut, tables in batch:
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT darbas")
+                try:
+                    res = fn(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO darbas")
+                    conn.execute("RELEASE darbas")
+                    results.append((fut, None, e))
+                else:
+                    conn.execute("RELEASE darbas")
+                    results.append((fut, res, None))
+                    changed |= tables
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for fn, fut, tables in batch:
+                if not fut.done():
+                    if not fut.running():
+                        fut.set_running_or_notify_cancel()
+                    fut.set_exception(e)
+            return
+        if changed:
+            for listener in self._listeners:
+                listener(changed)
+        for fut, res, err in results:
+            if err is None:
+                fut.set_result(res)
+            else:
+                fut.set_exception(err)
+
+
+_db = None
+_db_lock = threading.Lock()
+
+
+def get_db(path=DB_PATH):
+    """Vienas Database objektas visam serverio procesui."""
+    global _db
+    with _db_lock:
+        if _db is None:
+            _db = Database(path)
+        return _db
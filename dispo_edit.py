@@ -0,0 +1,188 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+import kpi
+from dispo_grid import ISKROVIMAS, PAKROVIMAS
+
+# ─── DISPO lentelės redagavimas ───────────────────────────────────────────────
+# (eilutės tipas, dienos stulpelis) -> kroviniai laukas
+KROVINIO_LAUKAI = {
+    (ISKROVIMAS, "Laikas nuo"): "iskrovimo_laikas_nuo",
+    (ISKROVIMAS, "Laikas iki"): "iskrovimo_laikas_iki",
+    (ISKROVIMAS, "Vieta"): "iskrovimo_miestas",
+    (PAKROVIMAS, "Laikas nuo"): "pakrovimo_laikas_nuo",
+    (PAKROVIMAS, "Laikas iki"): "pakrovimo_laikas_iki",
+    (PAKROVIMAS, "Vieta"): "pakrovimo_miestas",
+    (PAKROVIMAS, "Atsakingas"): "atsakingas_vadybininkas",
+    (PAKROVIMAS, "Krauti km"): "kilometrai",
+    (PAKROVIMAS, "Frachtas (EUR)"): "frachtas",
+}
+# Vilkiko stulpelis -> vilkikai laukas
+VILKIKO_LAUKAI = {"Trans. vadybininkas": "vadybininkas", "Priekabos nr.": "priekaba"}
+
+_DIENOS_LAUKAI = tuple(dict.fromkeys(label for _, label in KROVINIO_LAUKAI))
+_LAIKAI = {"iskrovimo_laikas_nuo", "iskrovimo_laikas_iki",
+           "pakrovimo_laikas_nuo", "pakrovimo_laikas_iki"}
+
+
+class StaleEditError(Exception):
+    """Kažkas pakeitė tas pačias eilutes po lentelės parodymo; stale – DataFrame."""
+
+    def __init__(self, stale):
+        self.stale = stale
+        super().__init__(f"{len(stale)} eilučių jau pakeista kito naudotojo")
+
+
+def editable_columns(grid):
+    return [c for c in grid.columns
+            if c in VILKIKO_LAUKAI or c.split(" – ")[-1] in _DIENOS_LAUKAI and " – " in c]
+
+
+def diff(before, after):
+    """Pakeisti redaguojami langeliai: DataFrame [eilute, stulpelis, buvo, dabar]."""
+    cols = editable_columns(before)
+    b, a = before[cols], after[cols].reindex_like(before[cols])
+    tekstas = b.columns[b.dtypes == object]
+    b = b.assign(**{c: b[c].fillna("") for c in tekstas})
+    a = a.assign(**{c: a[c].fillna("") for c in tekstas})
+    skiriasi = ~((b == a) | (b.isna() & a.isna())).to_numpy()
+    eil, col = np.nonzero(skiriasi)
+    return pd.DataFrame({
+        "eilute": eil,
+        "stulpelis": np.asarray(cols, dtype=object)[col],
+        "buvo": b.to_numpy()[eil, col],
+        "dabar": a.to_numpy()[eil, col],
+    })
+
+
+def _cell_ids(kroviniai, vilkikai, eil, dienos):
+    # Langelis (vilkikas, eilutė, diena) -> vienintelis jo krovinys; keli – neaišku
+    parts = []
+    for tipas, col in ((ISKROVIMAS, "iskrovimo_data"), (PAKROVIMAS, "pakrovimo_data")):
+        parts.append(pd.DataFrame({
+            "vilkikas": kroviniai["vilkikas"], "eil": tipas, "diena": kroviniai[col],
+            "id": kroviniai["id"], "versija": kroviniai["versija"],
+        }))
+    ev = pd.concat(parts, ignore_index=True)
+    keys = ["vilkikas", "eil", "diena"]
+    ev["keli"] = ev.duplicated(keys, keep=False)
+    ev = ev.drop_duplicates(keys).set_index(keys)
+    return ev.reindex(pd.MultiIndex.from_arrays([vilkikai, eil, dienos], names=keys))
+
+
+def _value(laukas, v):
+    if laukas in _LAIKAI:
+        v = "" if v is None else str(v).strip()
+        if not v:
+            return None
+        t = pd.to_datetime(v, format="%H:%M", errors="coerce")
+        if pd.isna(t):
+            raise ValueError("laikas turi būti HH:MM")
+        return t.strftime("%H:%M:%S")
+    if laukas in ("kilometrai", "frachtas"):
+        if v is None or pd.isna(v):
+            return None
+        if float(v) < 0:
+            raise ValueError("reikšmė negali būti neigiama")
+        return int(round(float(v))) if laukas == "kilometrai" else float(v)
+    return None if v is None else str(v).strip()
+
+
+def plan(changes, grid, kroviniai, vilkikai):
+    """Pakeitimus susieja su kroviniai / vilkikai eilutėmis.
+
+    Grąžina (kroviniu, vilkiku, praleisti): pirmi du – [id|numeris, versija,
+    laukas, reiksme], praleisti – langeliai, kurių įrašyti negalima, su priežastimi.
+    """
+    trucks = grid["Vilkiko nr."].to_numpy()[changes["eilute"].to_numpy()]
+    # _truck_frame: po dvi eilutes vilkikui – iškrovimas, po to pakrovimas
+    eil = changes["eilute"].to_numpy() % 2
+    dalys = changes["stulpelis"].str.split(" – ", n=1)
+    vilkiko = changes["stulpelis"].isin(VILKIKO_LAUKAI).to_numpy()
+    diena = np.where(vilkiko, None, dalys.str[0])
+    label = np.where(vilkiko, changes["stulpelis"], dalys.str[-1])
+    cells = _cell_ids(kroviniai, trucks, eil, diena)
+    fleet = vilkikai.set_index("numeris")["versija"]
+
+    kroviniu, vilkiku, praleisti = [], [], []
+    for i, ch in enumerate(changes.itertuples(index=False)):
+        langelis = {"stulpelis": ch.stulpelis, "vilkikas": trucks[i]}
+        if vilkiko[i]:
+            if trucks[i] not in fleet.index:
+                praleisti.append({**langelis, "priezastis": "vilkiko nėra vilkikų sąraše"})
+                continue
+            laukas = VILKIKO_LAUKAI[ch.stulpelis]
+            vilkiku.append({"numeris": trucks[i], "versija": int(fleet[trucks[i]]),
+                            "laukas": laukas, "reiksme": _value(laukas, ch.dabar)})
+            continue
+        laukas = KROVINIO_LAUKAI.get((eil[i], label[i]))
+        cell = cells.iloc[i]
+        if laukas is None:
+            praleisti.append({**langelis, "priezastis": "šioje eilutėje laukas neredaguojamas"})
+        elif pd.isna(cell["id"]):
+            praleisti.append({**langelis, "priezastis": "langelyje nėra krovinio"})
+        elif cell["keli"]:
+            praleisti.append({**langelis, "priezastis": "langelyje keli kroviniai – taisykite Kroviniuose"})
+        else:
+            try:
+                reiksme = _value(laukas, ch.dabar)
+            except ValueError as e:
+                praleisti.append({**langelis, "priezastis": str(e)})
+                continue
+            kroviniu.append({"id": int(cell["id"]), "versija": int(cell["versija"]),
+                             "laukas": laukas, "reiksme": reiksme})
+    # Ta pati vieta redaguota abiejose vilkiko eilutėse – galioja paskutinė
+    vilkiku = pd.DataFrame(vilkiku, columns=["numeris", "versija", "laukas", "reiksme"])
+    return (
+        pd.DataFrame(kroviniu, columns=["id", "versija", "laukas", "reiksme"]),
+        vilkiku.drop_duplicates(["numeris", "laukas"], keep="last"),
+        pd.DataFrame(praleisti, columns=["stulpelis", "vilkikas", "priezastis"]),
+    )
+
+
+_KROVINIAI_SQL = "SELECT * FROM kroviniai WHERE id IN (SELECT value FROM json_each(?))"
+_VILKIKAI_SQL = """
+    SELECT numeris, versija FROM vilkikai
+    WHERE numeris IN (SELECT value FROM json_each(?))
+"""
+
+
+def _stale(expected, key, current):
+    want = expected.drop_duplicates(key).set_index(key)["versija"]
+    have = current.set_index(key)["versija"].reindex(want.index)
+    return want.index[have.to_numpy() != want.to_numpy()].tolist()
+
+
+def _update(conn, table, key, updates):
+    for laukas, grupe in updates.groupby("laukas", sort=False):
+        reiksmes = grupe["reiksme"].astype(object).where(grupe["reiksme"].notna(), None)
+        conn.executemany(f"UPDATE {table} SET {laukas} = ? WHERE {key} = ?",
+                         zip(reiksmes.tolist(), grupe[key].tolist()))
+
+
+def save(db, kroviniu, vilkiku):
+    """Visi pakeitimai vienoje rašymo transakcijoje su versijų patikra.
+
+    Jei bent viena eilutė pasikeitė po lentelės parodymo, kyla StaleEditError
+    ir niekas neįrašoma. KPI suvestinės pataisomos: senas indėlis atimamas,
+    naujas pridedamas. Grąžina (kroviniai, vilkikai) pakeistų eilučių sk.
+    """
+    ids = json.dumps(sorted(set(kroviniu["id"].tolist())))
+    numeriai = json.dumps(sorted(set(vilkiku["numeris"].tolist())))
+
+    def run(conn):
+        seni = pd.read_sql_query(_KROVINIAI_SQL, conn, params=(ids,))
+        esami = pd.read_sql_query(_VILKIKAI_SQL, conn, params=(numeriai,))
+        stale = [("Krovinys", i) for i in _stale(kroviniu, "id", seni)]
+        stale += [("Vilkikas", n) for n in _stale(vilkiku, "numeris", esami)]
+        if stale:
+            raise StaleEditError(pd.DataFrame(stale, columns=["tipas", "id"]))
+        if len(kroviniu):
+            kpi.apply(conn, seni, -1)
+            _update(conn, "kroviniai", "id", kroviniu)
+            kpi.apply(conn, pd.read_sql_query(_KROVINIAI_SQL, conn, params=(ids,)))
+        _update(conn, "vilkikai", "numeris", vilkiku)
+        return len(seni), len(esami)
+    return db.transaction(run, tables=["kroviniai", "kpi", "vilkikai"])
@@ -0,0 +1,286 @@
+import pandas as pd
+import numpy as np
+from datetime import timedelta
+
+import driving_time
+from conflicts import MAX_TRIP_SQL
+from distances import city_keys
+from tech_apziura import truck_days
+
+# ─── DISPO lentelės stulpeliai ────────────────────────────────────────────────
+common_columns = [
+    "Vilkiko nr.", "Ekspeditorius", "Trans. vadybininkas",
+    "Priekabos nr.", "TA liko (d.)", "Vair. sk.", "Savaitinė atstova",
+    "Transporto grupė", "Eksp. grupės nr."
+]
+day_columns = [
+    "Bendras darbo laikas", "Likęs darbo laikas atvykus",
+    "Atvykimo laikas", "Laikas nuo", "Laikas iki", "Vieta",
+    "Atsakingas", "Tušti km", "Krauti km",
+    "Kelių išlaidos (EUR)", "Frachtas (EUR)"
+]
+
+# Eilutės tipas: po dvi eilutes vienam vilkikui – pirma iškrovimas, po to pakrovimas
+ISKROVIMAS, PAKROVIMAS = 0, 1
+
+# Vienas intervalinis užklausimas visam langui: visi kroviniai, kurių
+# pakrovimo→iškrovimo intervalas persidengia su langu (ir ilgesni už langą).
+# Apatinė pakrovimo riba (nuo - ilgiausias reisas) riboja indekso skenavimą.
+KROVINIU_SQL = """
+    SELECT id, vilkikas,
+           pakrovimo_data, pakrovimo_laikas_nuo, pakrovimo_laikas_iki,
+           iskrovimo_data, iskrovimo_laikas_nuo, iskrovimo_laikas_iki,
+           pakrovimo_salis, pakrovimo_miestas, iskrovimo_salis, iskrovimo_miestas,
+           atsakingas_vadybininkas, kilometrai, frachtas, versija
+    FROM kroviniai
+    WHERE pakrovimo_data >= date(:nuo, '-' || :maks || ' days')
+      AND pakrovimo_data <= :iki
+      AND iskrovimo_data >= :nuo
+"""
+# Paskutinis kiekvieno vilkiko krovinys prieš langą – tuštiems km iki pirmo pakrovimo
+ANKSTESNIU_SQL = """
+    SELECT id, vilkikas, MAX(pakrovimo_data) AS pakrovimo_data, pakrovimo_laikas_nuo,
+           iskrovimo_salis, iskrovimo_miestas
+    FROM kroviniai
+    WHERE pakrovimo_data >= date(?, '-30 days') AND pakrovimo_data < ?
+      AND vilkikas <> ''
+    GROUP BY vilkikas
+"""
+VILKIKU_SQL = """
+    SELECT v.numeris, v.vadybininkas, v.vairuotojai, v.priekaba, v.versija,
+           (SELECT COUNT(*) FROM vairuotojai d
+            WHERE d.priskirtas_vilkikas = v.numeris) AS priskirta
+    FROM vilkikai v
+    ORDER BY v.numeris
+"""
+
+# Įvykio laukai -> DISPO dienos stulpeliai
+_EVENT_FIELDS = {
+    "nuo": "Laikas nuo",
+    "iki": "Laikas iki",
+    "vieta": "Vieta",
+    "atsakingas": "Atsakingas",
+    "tusti_km": "Tušti km",
+    "krauti_km": "Krauti km",
+    "frachtas": "Frachtas (EUR)",
+}
+_NUMERIC_SUFFIXES = ("Bendras darbo laikas", "Likęs darbo laikas atvykus",
+                     "Tušti km", "Krauti km", "Frachtas (EUR)")
+
+
+def day_column_names(dienos):
+    return [f"{d.strftime('%Y-%m-%d')} – {col}" for d in dienos for col in day_columns]
+
+
+def _events(kroviniai, nuo, iki):
+    # Kiekvienas krovinys virsta iki dviejų įvykių: iškrovimo ir pakrovimo dieną
+    isk = kroviniai[kroviniai["iskrovimo_data"].between(nuo, iki)]
+    pak = kroviniai[kroviniai["pakrovimo_data"].between(nuo, iki)]
+    unload = pd.DataFrame({
+        "vilkikas": isk["vilkikas"],
+        "eil": ISKROVIMAS,
+        "diena": isk["iskrovimo_data"],
+        "nuo": isk["iskrovimo_laikas_nuo"],
+        "iki": isk["iskrovimo_laikas_iki"],
+        "vieta": isk["iskrovimo_miestas"],
+        "atsakingas": None,
+        "tusti_km": np.nan,
+        "krauti_km": np.nan,
+        "frachtas": np.nan,
+    })
+    load = pd.DataFrame({
+        "vilkikas": pak["vilkikas"],
+        "eil": PAKROVIMAS,
+        "diena": pak["pakrovimo_data"],
+        "nuo": pak["pakrovimo_laikas_nuo"],
+        "iki": pak["pakrovimo_laikas_iki"],
+        "vieta": pak["pakrovimo_miestas"],
+        "atsakingas": pak["atsakingas_vadybininkas"],
+        "tusti_km": pak["tusti_km"] if "tusti_km" in pak else np.nan,
+        "krauti_km": pd.to_numeric(pak["krauti_km"] if "krauti_km" in pak else pak["kilometrai"],
+                                   errors="coerce"),
+        "frachtas": pd.to_numeric(pak["frachtas"], errors="coerce"),
+    })
+    ev = pd.concat([unload, load], ignore_index=True)
+    ev["nuo"] = ev["nuo"].astype("object").where(ev["nuo"].notna(), "").astype(str).str[:5]
+    ev["iki"] = ev["iki"].astype("object").where(ev["iki"].notna(), "").astype(str).str[:5]
+    return ev
+
+
+def _aggregate(ev):
+    keys = ["vilkikas", "eil", "diena"]
+    dup = ev.duplicated(keys, keep=False)
+    single = ev[~dup].set_index(keys)
+    if not dup.any():
+        return single
+    # Kelių krovinių ta pačią dieną sujungimas – tik toms grupėms, kurių reikia
+    multi = ev[dup].sort_values(keys + ["nuo"]).groupby(keys, sort=False)
+    joined = multi.agg(
+        nuo=("nuo", "min"),
+        iki=("iki", "max"),
+        vieta=("vieta", lambda s: ", ".join(dict.fromkeys(s.dropna().astype(str)))),
+        atsakingas=("atsakingas", "first"),
+        tusti_km=("tusti_km", lambda s: s.sum(min_count=1)),
+        krauti_km=("krauti_km", lambda s: s.sum(min_count=1)),
+        frachtas=("frachtas", lambda s: s.sum(min_count=1)),
+    )
+    return pd.concat([single, joined])
+
+
+def build_day_block(kroviniai, dienos):
+    """Pivotuoja krovinius į (vilkikas, eilutė) × dienos stulpelių bloką."""
+    nuo, iki = str(dienos[0]), str(dienos[-1])
+    columns = day_column_names(dienos)
+    ev = _events(kroviniai, nuo, iki)
+    if ev.empty:
+        return pd.DataFrame(
+            columns=columns,
+            index=pd.MultiIndex.from_tuples([], names=["vilkikas", "eil"]),
+        )
+    agg = _aggregate(ev)[list(_EVENT_FIELDS)]
+    wide = agg.unstack("diena")
+    wide.columns = [f"{d} – {_EVENT_FIELDS[f]}" for f, d in wide.columns]
+    return wide.reindex(columns=columns)
+
+
+def with_distances(kroviniai, ankstesni, engine):
+    """Prideda tusti_km (nuo ankstesnio to paties vilkiko iškrovimo iki pakrovimo)
+    ir krauti_km (įvesti kilometrai, o jei jų nėra – apskaičiuoti)."""
+    cols = ["id", "vilkikas", "pakrovimo_data", "pakrovimo_laikas_nuo",
+            "iskrovimo_salis", "iskrovimo_miestas"]
+    seq = pd.concat([ankstesni.reindex(columns=cols), kroviniai[cols]], ignore_index=True)
+    seq = seq.drop_duplicates("id", keep="last").sort_values(
+        ["vilkikas", "pakrovimo_data", "pakrovimo_laikas_nuo", "id"])
+    isk = pd.Series(city_keys(seq["iskrovimo_salis"], seq["iskrovimo_miestas"]), index=seq.index)
+    ankstesnis = isk.groupby(seq["vilkikas"].to_numpy()).shift().fillna("")
+    pak_keys = city_keys(kroviniai["pakrovimo_salis"], kroviniai["pakrovimo_miestas"])
+    isk_keys = city_keys(kroviniai["iskrovimo_salis"], kroviniai["iskrovimo_miestas"])
+    is_kur = kroviniai["id"].map(pd.Series(ankstesnis.to_numpy(), index=seq["id"].to_numpy()))
+
+    out = kroviniai.copy()
+    out["tusti_km"] = engine.km(is_kur.fillna("").to_numpy(), pak_keys)
+    ivesti = pd.to_numeric(out["kilometrai"], errors="coerce")
+    out["krauti_km"] = ivesti.where(ivesti > 0, engine.km(pak_keys, isk_keys))
+    return out
+
+
+def _fingerprints(kroviniai):
+    if kroviniai.empty:
+        return pd.Series(dtype="uint64")
+    h = pd.util.hash_pandas_object(kroviniai, index=False)
+    return h.groupby(kroviniai["vilkikas"].to_numpy()).sum()
+
+
+def _truck_frame(vilkikai, extra):
+    trucks = vilkikai.copy()
+    if len(extra):
+        trucks = pd.concat(
+            [trucks, pd.DataFrame({"numeris": sorted(extra)})], ignore_index=True
+        )
+    vair_sk = driving_time.crew_size(trucks["vairuotojai"], trucks["priskirta"].fillna(0))
+    common = pd.DataFrame({
+        "Vilkiko nr.": trucks["numeris"],
+        "Ekspeditorius": "",
+        "Trans. vadybininkas": trucks["vadybininkas"].fillna(""),
+        "Priekabos nr.": trucks["priekaba"].fillna(""),
+        "TA liko (d.)": trucks.get("ta_liko", np.nan),
+        "Vair. sk.": vair_sk,
+        "Savaitinė atstova": "",
+        "Transporto grupė": "",
+        "Eksp. grupės nr.": "",
+    })
+    # Dvi eilutės vienam vilkikui
+    common = common.loc[common.index.repeat(2)].reset_index(drop=True)
+    common.index = pd.MultiIndex.from_arrays(
+        [common["Vilkiko nr."], np.tile([ISKROVIMAS, PAKROVIMAS], len(trucks))],
+        names=["vilkikas", "eil"],
+    )
+    return common
+
+
+class DispoGrid:
+    """DISPO planavimo lentelė su inkrementiniu atnaujinimu tarp perpaleidimų.
+
+    Laikomas sesijoje; kiekvieno perpaleidimo metu daromas vienas krovinių
+    užklausimas visam langui, o dienų blokai perskaičiuojami tik tiems
+    vilkikams, kurių kroviniai pasikeitė.
+    """
+
+    def __init__(self):
+        self._window = None
+        self._fingerprints = None
+        self._block = None
+        self._fleet = None
+        self._kroviniai = None
+        self._grid = None
+
+    @property
+    def window(self):
+        """(pradžios data 'YYYY-MM-DD', dienų sk.) paskutinio refresh()."""
+        return self._window
+
+    def snapshot(self):
+        """Paskutinė grąžinta lentelė ir jos šaltiniai (kroviniai, vilkikai) –
+        su jais lyginami ir susiejami redagavimo pakeitimai (dispo_edit)."""
+        return self._grid, self._kroviniai, self._fleet
+
+    def refresh(self, db, start_date, dienu_sk, ta=None, atstumai=None, pasiulymai=None):
+        """ta – tech_apziura.due() rezultatas; vilkiko eilutėje rodomas mažiausias
+        vilkiko ir jo priekabos likęs TA dienų skaičius. atstumai –
+        distances.DistanceEngine tuštiems ir kroviniams km. pasiulymai – Series
+        krovinio id -> vilkikas (planner): kroviniai rodomi pasiūlytuose vilkikuose."""
+        dienos = [start_date + timedelta(days=i) for i in range(dienu_sk)]
+        nuo, iki = str(dienos[0]), str(dienos[-1])
+        with db.reader() as conn:
+            maks = int(conn.execute(MAX_TRIP_SQL).fetchone()[0])
+            kroviniai = db.query_df(KROVINIU_SQL, {"nuo": nuo, "iki": iki, "maks": maks}, conn=conn)
+            vilkikai = db.query_df(VILKIKU_SQL, conn=conn)
+            if atstumai is not None:
+                ankstesni = db.query_df(ANKSTESNIU_SQL, (nuo, nuo), conn=conn)
+        if pasiulymai is not None and len(pasiulymai):
+            kroviniai["vilkikas"] = kroviniai["id"].map(pasiulymai).fillna(kroviniai["vilkikas"])
+        kroviniai = kroviniai[kroviniai["vilkikas"].fillna("") != ""]
+        if atstumai is not None:
+            kroviniai = with_distances(kroviniai, ankstesni, atstumai)
+        if ta is not None:
+            vilkikai["ta_liko"] = truck_days(ta, vilkikai["numeris"], vilkikai["priekaba"])
+
+        fingerprints = _fingerprints(kroviniai)
+        window = (nuo, dienu_sk)
+        if self._block is None or window != self._window:
+            block = build_day_block(kroviniai, dienos)
+            changed = True
+        else:
+            old, new = self._fingerprints.align(fingerprints, fill_value=0)
+            pakeisti = old.index[old.to_numpy() != new.to_numpy()]
+            changed = len(pakeisti) > 0
+            block = self._block
+            if changed:
+                keep = ~block.index.get_level_values("vilkikas").isin(pakeisti)
+                fresh = build_day_block(kroviniai[kroviniai["vilkikas"].isin(pakeisti)], dienos)
+                block = pd.concat([block[keep], fresh])
+
+        fleet_changed = self._fleet is None or not vilkikai.equals(self._fleet)
+        self._window, self._fingerprints, self._block = window, fingerprints, block
+        self._kroviniai = kroviniai
+        if changed or fleet_changed or self._grid is None:
+            self._fleet = vilkikai
+            self._grid = self._assemble(vilkikai, block, kroviniai, dienos)
+        return self._grid
+
+    def _assemble(self, vilkikai, block, kroviniai, dienos):
+        extra = set(block.index.get_level_values("vilkikas")) - set(vilkikai["numeris"])
+        common = _truck_frame(vilkikai, extra)
+        days = block.reindex(common.index)
+        # Darbo ir poilsio laikas – visam parkui viena matrica (pigu, todėl ne inkrementiškai)
+        laikas = driving_time.compute(
+            kroviniai, common["Vilkiko nr."].to_numpy()[::2], common["Vair. sk."].to_numpy()[::2], dienos)
+        eilutems = laikas.reindex(common["Vilkiko nr."].to_numpy())
+        common["Savaitinė atstova"] = eilutems.pop("Savaitinė atstova").to_numpy()
+        days[list(eilutems.columns)] = eilutems.to_numpy()
+        grid = pd.concat([common, days], axis=1)
+        skaiciai = [c for c in days.columns if c.endswith(_NUMERIC_SUFFIXES)]
+        grid[skaiciai] = grid[skaiciai].astype("float64")
+        tekstas = grid.columns[grid.dtypes == object]
+        grid[tekstas] = grid[tekstas].fillna("")
+        return grid.reset_index(drop=True)
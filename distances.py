@@ -0,0 +1,220 @@
+import json
+import logging
+import threading
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# ─── Atstumai tarp miestų (be interneto: koordinačių lentelė + haversine) ─────
+KELIO_KOEF = 1.2        # tiesios linijos atstumas -> apytikslis kelio atstumas
+ZEMES_SPINDULYS = 6371.0
+MAX_PAIRS = 200000      # atstumų podėlio lentelėje; seniausiai naudoti šalinami
+ISVALYTI_IKI = 0.9      # viršijus MAX_PAIRS, šalinama iki šios dalies
+MAX_MEMO = 100000       # porų proceso žodyne; viršijus – pradedama iš naujo
+KM_NUOKRYPIS = 0.3      # įvestų krautų km nuokrypis nuo apskaičiuotų, nuo kurio įspėjama
+_TRANSLIT = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ß": "ss", "æ": "ae", "œ": "oe"})
+
+log = logging.getLogger(__name__)
+
+def normalize(text):
+    """'Łódź ' -> 'lodz': be diakritikų, mažosiomis, be tarpų kraštuose."""
+    text = str(text or "").strip().lower().translate(_TRANSLIT)
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def city_key(salis, miestas):
+    miestas = normalize(miestas)
+    return f"{normalize(salis)}|{miestas}" if miestas else ""
+
+
+def city_keys(salis, miestas):
+    """Vektoriškai city_key() – normalizuojamos tik unikalios reikšmės."""
+    s = pd.Series(salis, dtype=object).fillna("").astype(str)
+    m = pd.Series(miestas, dtype=object).fillna("").astype(str)
+    pairs = pd.MultiIndex.from_arrays([s.to_numpy(), m.to_numpy()])
+    codes, uniq = pairs.factorize()
+    keys = np.array([city_key(a, b) for a, b in uniq], dtype=object)
+    return keys[codes] if len(codes) else np.array([], dtype=object)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype="float64")) for x in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * ZEMES_SPINDULYS * np.arcsin(np.sqrt(a))
+
+
+# ─── Miestų koordinatės (schema – migrations.py) ──────────────────────────────
+def save_cities(conn, cities):
+    """cities – (šalis, miestas, platuma, ilguma). Iš podėlio šalinamos tik poros
+    su miestais, kurių koordinatės pasikeitė arba kurie nauji: coordinates()
+    miestą randa ir pagal miesto_raktas, tad tikrinama be šalies. Grąžina
+    išmestų porų sk."""
+    rows = [(city_key(s, m), normalize(m), s, m, lat, lon) for s, m, lat, lon in cities]
+    seni = {r[0]: (r[1], r[2]) for r in conn.execute(
+        "SELECT raktas, platuma, ilguma FROM miestai WHERE raktas IN (SELECT value FROM json_each(?))",
+        (json.dumps([r[0] for r in rows]),))}
+    pakeisti = sorted({r[1] for r in rows if seni.get(r[0]) != (r[4], r[5])})
+    conn.executemany("""
+        INSERT INTO miestai(raktas, miesto_raktas, salis, miestas, platuma, ilguma)
+        VALUES(?, ?, ?, ?, ?, ?)
+        ON CONFLICT(raktas) DO UPDATE SET
+            salis = excluded.salis, miestas = excluded.miestas,
+            platuma = excluded.platuma, ilguma = excluded.ilguma
+    """, rows)
+    if not pakeisti:
+        return 0
+    istrinta = conn.execute("""
+        DELETE FROM atstumai
+        WHERE substr(is_raktas, instr(is_raktas, '|') + 1) IN (SELECT value FROM json_each(:m))
+           OR substr(i_raktas, instr(i_raktas, '|') + 1) IN (SELECT value FROM json_each(:m))
+    """, {"m": json.dumps(pakeisti)}).rowcount
+    # Variklio porų įvertis perskaičiuojamas kitame _store (tame pačiame rašytojuje)
+    with _engine_lock:
+        if _engine is not None:
+            _engine._pairs = None
+    return istrinta
+
+
+# ─── Atstumų variklis ─────────────────────────────────────────────────────────
+class DistanceEngine:
+    """Atstumai km tarp miestų raktų porų, vektoriškai visai partijai.
+
+    Trys lygiai: proceso žodynas -> atstumai lentelė (LRU pagal 'naudota')
+    -> haversine iš miestai koordinačių. Naujos poros ir 'naudota' žymos
+    rašomos per rašymo eilę nelaukiant. Nežinomas miestas -> NaN.
+    """
+
+    def __init__(self, db, ref, max_pairs=MAX_PAIRS, max_memo=MAX_MEMO):
+        self.db = db
+        self.ref = ref
+        self.max_pairs = max_pairs
+        self.max_memo = max_memo
+        self._lock = threading.Lock()
+        self._memo = {}
+        self._miestai_version = None
+        # Apytikslis atstumai eilučių sk. (tik rašytojo gijoje); None – dar neskaičiuota
+        self._pairs = None
+
+    def km(self, from_keys, to_keys):
+        a = np.asarray(from_keys, dtype=object)
+        b = np.asarray(to_keys, dtype=object)
+        out = np.full(len(a), np.nan)
+        valid = pd.notna(a) & pd.notna(b)
+        valid[valid] = (a[valid] != "") & (b[valid] != "")
+        if not valid.any():
+            return out
+        a, b = a[valid], b[valid]
+        lo, hi = np.where(a <= b, a, b), np.where(a <= b, b, a)
+        codes, uniq = pd.MultiIndex.from_arrays([lo, hi]).factorize()
+        values = self._lookup(list(uniq))
+        out[valid] = values[codes]
+        return out
+
+    def _lookup(self, pairs):
+        version = self.ref.version("miestai")
+        with self._lock:
+            if version != self._miestai_version:
+                self._memo, self._miestai_version = {}, version
+            known = {p: self._memo[p] for p in pairs if p in self._memo}
+        missing = [p for p in pairs if p not in known]
+        if missing:
+            found = self._load(missing)
+            # Nežinomi miestai irgi įsimenami (NaN), kad kas kartą nebūtų ieškoma
+            new = {p: found.get(p, np.nan) for p in missing}
+            known.update(new)
+            with self._lock:
+                if len(self._memo) + len(new) > self.max_memo:
+                    self._memo = {}
+                self._memo.update(new)
+        return np.array([known[p] for p in pairs], dtype="float64")
+
+    def _load(self, pairs):
+        payload = json.dumps([list(p) for p in pairs])
+        cached = {(r[0], r[1]): r[2] for r in self.db.query("""
+            SELECT a.is_raktas, a.i_raktas, a.km
+            FROM json_each(?) j
+            JOIN atstumai a ON a.is_raktas = json_extract(j.value, '$[0]')
+                           AND a.i_raktas = json_extract(j.value, '$[1]')
+        """, (payload,))}
+        new = [p for p in pairs if p not in cached]
+        computed = {}
+        if new:
+            coords = self.coordinates({k for p in new for k in p})
+            lat = np.array([[coords.get(k, (np.nan, np.nan))[0] for k in p] for p in new])
+            lon = np.array([[coords.get(k, (np.nan, np.nan))[1] for k in p] for p in new])
+            km = np.round(haversine_km(lat[:, 0], lon[:, 0], lat[:, 1], lon[:, 1]) * KELIO_KOEF)
+            computed = {p: v for p, v in zip(new, km) if not np.isnan(v)}
+        if cached or computed:
+            fut = self.db.submit(lambda conn: self._store(conn, list(cached), computed), tables=["atstumai"])
+            fut.add_done_callback(_log_store_error)
+        return {**cached, **computed}
+
+    def coordinates(self, keys):
+        """raktas -> (platuma, ilguma); jei šalis nesutampa – pagal vienareikšmį miestą."""
+        keys = sorted(keys)
+        rows = self.db.query("""
+            SELECT raktas, miesto_raktas, platuma, ilguma FROM miestai
+            WHERE raktas IN (SELECT value FROM json_each(:k))
+               OR miesto_raktas IN (SELECT substr(value, instr(value, '|') + 1) FROM json_each(:k))
+        """, {"k": json.dumps(keys)})
+        exact = {r[0]: (r[2], r[3]) for r in rows}
+        by_city = {}
+        for r in rows:
+            by_city.setdefault(r[1], set()).add((r[2], r[3]))
+        out = {}
+        for k in keys:
+            if k in exact:
+                out[k] = exact[k]
+            else:
+                cands = by_city.get(k.split("|", 1)[-1], ())
+                if len(cands) == 1:
+                    out[k] = next(iter(cands))
+        return out
+
+    def _store(self, conn, touched, computed):
+        now = time.time()
+        conn.executemany("""
+            INSERT INTO atstumai(is_raktas, i_raktas, km, naudota) VALUES(?, ?, ?, ?)
+            ON CONFLICT(is_raktas, i_raktas) DO UPDATE SET naudota = excluded.naudota
+        """, [(a, b, km, now) for (a, b), km in computed.items()])
+        conn.executemany(
+            "UPDATE atstumai SET naudota = ? WHERE is_raktas = ? AND i_raktas = ?",
+            [(now, a, b) for a, b in touched],
+        )
+        # Tikslus COUNT(*) tik kai įvertis viršija ribą; kitu atveju – pridedamos naujos
+        # poros (įvertis gali būti per didelis, bet ne per mažas; save_cities jį atstato)
+        if self._pairs is None:
+            self._pairs = conn.execute("SELECT COUNT(*) FROM atstumai").fetchone()[0]
+        else:
+            self._pairs += len(computed)
+        if self._pairs <= self.max_pairs:
+            return
+        kiek = conn.execute("SELECT COUNT(*) FROM atstumai").fetchone()[0]
+        if kiek > self.max_pairs:
+            conn.execute("""
+                DELETE FROM atstumai WHERE (is_raktas, i_raktas) IN (
+                    SELECT is_raktas, i_raktas FROM atstumai ORDER BY naudota LIMIT ?
+                )
+            """, (kiek - int(self.max_pairs * ISVALYTI_IKI),))
+            kiek = int(self.max_pairs * ISVALYTI_IKI)
+        self._pairs = kiek
+
+
+def _log_store_error(fut):
+    if fut.exception() is not None:
+        log.error("Nepavyko įrašyti atstumų podėlio", exc_info=fut.exception())
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine(db, ref):
+    global _engine
+    with _engine_lock:
+        if _engine is None or _engine.db is not db:
+            _engine = DistanceEngine(db, ref)
+        return _engine
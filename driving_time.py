@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+# ─── Vairavimo ir poilsio laikas (supaprastintas ES Reg. 561/2006) ────────────
+VIDUTINIS_GREITIS = 70      # km/h
+DIENOS_VAIRAVIMAS = 9       # h vienam vairuotojui per dieną
+SAVAITES_VAIRAVIMAS = 56    # h vienam vairuotojui per savaitę
+KROVIMO_DARBAS = 1          # h kitam darbui per pakrovimą / iškrovimą
+DIENOS_IKI_POILSIO = 6      # savaitinis poilsis – ne vėliau kaip po 6 darbo dienų
+SAVAITINIS_POILSIS = 45     # h (reguliarus)
+MAX_IGULA = 2               # daugiau nei du vairuotojai vienu metu nevairuoja
+PAROS_POILSIS = 11          # h kasdienis poilsis po dienos vairavimo
+
+
+def crew_size(vairuotojai, priskirta=None):
+    """Įgula: vardų sąraše per kablelį arba priskirtų vairuotojų sk. (didesnis)."""
+    vardai = pd.Series(vairuotojai, dtype=object).fillna("").astype(str).str.strip()
+    n = np.where(vardai == "", 0, vardai.str.count(",") + 1)
+    if priskirta is not None:
+        n = np.maximum(n, np.asarray(priskirta, dtype="int64"))
+    return n
+
+
+def travel_hours(km):
+    """Kelionės trukmė (h) vienam vairuotojui su kasdieniais poilsiais; vektoriškai."""
+    h = np.asarray(km, dtype="float64") / VIDUTINIS_GREITIS
+    return h + np.floor(h / DIENOS_VAIRAVIMAS) * PAROS_POILSIS
+
+
+def _day_index(data, start):
+    d = pd.to_datetime(data, errors="coerce").to_numpy("datetime64[D]")
+    return (d - np.datetime64(start, "D")).astype("float64")
+
+
+def compute(kroviniai, trucks, crew, dienos):
+    """Vilkikai × dienos matricos visam parkui vienu kartu.
+
+    kroviniai – su tusti_km / krauti_km (dispo_grid.with_distances); crew –
+    įgulos dydis kiekvienam trucks vilkikui;
+    grąžina DataFrame (indeksas – vilkikas): kiekvienai dienai bendras darbo
+    laikas ir likęs vairavimo laikas atvykus, bei 'Savaitinė atstova'.
+    """
+    trucks = pd.Index(trucks)
+    n, m = len(trucks), len(dienos)
+    start = dienos[0]
+    vairavimas = np.zeros((n, m + 1))   # +1 – skirtumų masyvo uodega
+    darbas = np.zeros((n, m))
+
+    k = kroviniai[kroviniai["vilkikas"].isin(trucks)]
+    ti = trucks.get_indexer(k["vilkikas"])
+    pak = _day_index(k["pakrovimo_data"], start)
+    isk = _day_index(k["iskrovimo_data"], start)
+    ok = ~np.isnan(pak) & ~np.isnan(isk) & (isk >= pak)
+    ti, pak, isk = ti[ok], pak[ok].astype("int64"), isk[ok].astype("int64")
+    # Be atstumų variklio – tik įvesti kilometrai
+    tusti = k["tusti_km"] if "tusti_km" in k else pd.Series(0, index=k.index)
+    krauti = k["krauti_km"] if "krauti_km" in k else k["kilometrai"]
+    tusti = np.nan_to_num(pd.to_numeric(tusti, errors="coerce").to_numpy()[ok]) / VIDUTINIS_GREITIS
+    krauti = np.nan_to_num(pd.to_numeric(krauti, errors="coerce").to_numpy()[ok]) / VIDUTINIS_GREITIS
+
+    # Tušti km – pakrovimo dieną; krauti km – tolygiai per pakrovimo..iškrovimo dienas
+    in_pak = (pak >= 0) & (pak < m)
+    np.add.at(vairavimas, (ti[in_pak], pak[in_pak]), tusti[in_pak])
+    per_diena = krauti / (isk - pak + 1)
+    a, b = np.clip(pak, 0, m), np.clip(isk + 1, 0, m)
+    span = a < b
+    np.add.at(vairavimas, (ti[span], a[span]), per_diena[span])
+    np.add.at(vairavimas, (ti[span], b[span]), -per_diena[span])
+    vairavimas = np.round(np.cumsum(vairavimas, axis=1)[:, :m], 6)  # be slankaus kablelio likučių
+    in_isk = (isk >= 0) & (isk < m)
+    np.add.at(darbas, (ti[in_pak], pak[in_pak]), KROVIMO_DARBAS)
+    np.add.at(darbas, (ti[in_isk], isk[in_isk]), KROVIMO_DARBAS)
+
+    igula = np.clip(np.asarray(crew, dtype="int64"), 1, MAX_IGULA)[:, None]
+    # Savaitės (pirm.–sekm.) suma iki dienos imtinai; dienos prieš langą nežinomos
+    savaite = np.array([d.isocalendar()[:2] for d in dienos])
+    nauja = np.r_[True, (savaite[1:] != savaite[:-1]).any(axis=1)]
+    cum = np.cumsum(vairavimas, axis=1)
+    pradzia = np.maximum.accumulate(np.where(nauja, np.arange(m), 0))
+    pries = np.where(pradzia > 0, cum[:, np.maximum(pradzia - 1, 0)], 0)
+    savaites_suma = cum - pries
+    likes = np.minimum(DIENOS_VAIRAVIMAS * igula - vairavimas,
+                       SAVAITES_VAIRAVIMAS * igula - savaites_suma)
+    likes = np.clip(likes, 0, None)
+
+    # Savaitinis poilsis: po 6 iš eilės dienų su vairavimu
+    dirba = vairavimas > 0
+    c = np.cumsum(dirba, axis=1)
+    seka = c - np.maximum.accumulate(np.where(~dirba, c, 0), axis=1)
+    reikia = seka >= DIENOS_IKI_POILSIO
+    pirma = np.where(reikia.any(axis=1), reikia.argmax(axis=1), -1)
+    atstova = [f"nuo {dienos[i] + timedelta(days=1)} ({SAVAITINIS_POILSIS} h)" if i >= 0 else ""
+               for i in pirma]
+
+    cols = {}
+    for j, d in enumerate(dienos):
+        p = d.strftime("%Y-%m-%d")
+        kur = dirba[:, j] | (darbas[:, j] > 0)
+        cols[f"{p} – Bendras darbo laikas"] = np.where(kur, np.round(vairavimas[:, j] + darbas[:, j], 1), np.nan)
+        cols[f"{p} – Likęs darbo laikas atvykus"] = np.where(kur, np.round(likes[:, j], 1), np.nan)
+    out = pd.DataFrame(cols, index=trucks)
+    out["Savaitinė atstova"] = atstova
+    return out
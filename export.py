@@ -0,0 +1,157 @@
+import argparse
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from db import DB_PATH, Database
+
+# ─── Srautinis lentelių eksportas į CSV / Parquet ─────────────────────────────
+TABLES = ["kroviniai", "vilkikai", "priekabos"]
+DATE_COLUMNS = {"kroviniai": "pakrovimo_data"}
+CHUNK_SIZE = 50000
+FORMATS = ["csv", "parquet"]
+
+
+def table_columns(db, table):
+    """[(stulpelis, deklaruotas tipas)] pagal PRAGMA table_info."""
+    if table not in TABLES:
+        raise ValueError(f"Nežinoma lentelė: {table}")
+    return [(r[1], r[2].upper()) for r in db.query(f"PRAGMA table_info({table})")]
+
+
+def iter_chunks(db, table, columns=None, date_from=None, date_to=None, chunksize=CHUNK_SIZE):
+    """Grąžina DataFrame dalis; atmintyje vienu metu laikoma tik viena dalis."""
+    known = [c for c, _ in table_columns(db, table)]
+    columns = [c for c in (columns or known) if c in known]
+    clauses, params = [], []
+    if date_from or date_to:
+        if table not in DATE_COLUMNS:
+            raise ValueError(f"Lentelė {table} neturi datos filtro.")
+        col = DATE_COLUMNS[table]
+        if date_from:
+            clauses.append(f"{col} >= ?")
+            params.append(str(date_from))
+        if date_to:
+            clauses.append(f"{col} <= ?")
+            params.append(str(date_to))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT {', '.join(columns)} FROM {table} {where} ORDER BY id"
+    with db.reader() as conn:
+        yield from pd.read_sql_query(sql, conn, params=params, chunksize=chunksize)
+
+
+def write_csv(chunks, out):
+    rows = 0
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(out, index=False, header=i == 0, mode="w" if i == 0 else "a")
+        rows += len(chunk)
+    return rows
+
+
+def _arrow_type(decl):
+    import pyarrow as pa
+    if "INT" in decl:
+        return pa.int64()
+    if "REAL" in decl or "FLOA" in decl or "DOUB" in decl:
+        return pa.float64()
+    return pa.string()
+
+
+def write_parquet(chunks, out, types):
+    """types – {stulpelis: deklaruotas SQLite tipas}; schema nepriklauso nuo dalies turinio."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet eksportui reikalingas paketas pyarrow (pip install pyarrow).")
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                schema = pa.schema([(c, _arrow_type(types[c])) for c in chunk.columns])
+                writer = pq.ParquetWriter(out, schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def export(db, table, out, fmt="csv", columns=None, date_from=None, date_to=None,
+           chunksize=CHUNK_SIZE):
+    """Eksportuoja lentelę į failą (kelias arba atviras failas); grąžina eilučių sk."""
+    chunks = iter_chunks(db, table, columns, date_from, date_to, chunksize)
+    if fmt == "parquet":
+        return write_parquet(chunks, out, dict(table_columns(db, table)))
+    if fmt == "csv":
+        return write_csv(chunks, out)
+    raise ValueError(f"Nežinomas formatas: {fmt}")
+
+
+# ─── Streamlit atsisiuntimas ──────────────────────────────────────────────────
+def export_panel(db, table):
+    import streamlit as st
+    with st.expander("📤 Eksportas (CSV / Parquet)"):
+        visi = [c for c, _ in table_columns(db, table)]
+        stulpeliai = st.multiselect("Stulpeliai", visi, visi, key=f"exp_cols_{table}")
+        c1, c2, c3 = st.columns(3)
+        fmt = c1.selectbox("Formatas", FORMATS, key=f"exp_fmt_{table}")
+        nuo = iki = None
+        if table in DATE_COLUMNS:
+            nuo = c2.date_input("Data nuo", None, key=f"exp_nuo_{table}")
+            iki = c3.date_input("Data iki", None, key=f"exp_iki_{table}")
+        if st.button("📦 Paruošti failą", key=f"exp_btn_{table}"):
+            # Rašoma į laikiną failą diske, ne į atmintį
+            fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+            os.close(fd)
+            try:
+                eil = export(db, table, path, fmt, stulpeliai, nuo, iki)
+            except Exception as e:
+                os.remove(path)
+                st.error(f"❌ Klaida eksportuojant: {e}")
+            else:
+                old = st.session_state.get(f"exp_path_{table}")
+                if old and os.path.exists(old):
+                    os.remove(old)
+                st.session_state[f"exp_path_{table}"] = path
+                st.success(f"✅ Paruošta eilučių: {eil}.")
+        path = st.session_state.get(f"exp_path_{table}")
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                st.download_button(
+                    "⬇️ Atsisiųsti", f, file_name=f"{table}{os.path.splitext(path)[1]}",
+                    key=f"exp_dl_{table}",
+                )
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    p = argparse.ArgumentParser(description="DISPO lentelių eksportas į CSV / Parquet")
+    p.add_argument("lentele", choices=TABLES)
+    p.add_argument("failas", help="išvesties failas; '-' – stdout (tik CSV)")
+    p.add_argument("--formatas", choices=FORMATS,
+                   help="numatytai pagal failo plėtinį")
+    p.add_argument("--stulpeliai", help="kableliais atskirti stulpeliai")
+    p.add_argument("--nuo", help="pakrovimo data nuo (YYYY-MM-DD)")
+    p.add_argument("--iki", help="pakrovimo data iki (YYYY-MM-DD)")
+    p.add_argument("--dalis", type=int, default=CHUNK_SIZE, help="eilučių vienoje dalyje")
+    p.add_argument("--db", default=DB_PATH)
+    args = p.parse_args(argv)
+
+    fmt = args.formatas or ("parquet" if args.failas.endswith(".parquet") else "csv")
+    out = sys.stdout if args.failas == "-" else args.failas
+    columns = args.stulpeliai.split(",") if args.stulpeliai else None
+    db = Database(args.db, readers=1)
+    try:
+        eil = export(db, args.lentele, out, fmt, columns, args.nuo, args.iki, args.dalis)
+    finally:
+        db.close()
+    print(f"Eksportuota eilučių: {eil}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
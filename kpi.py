@@ -0,0 +1,176 @@
+import argparse
+from datetime import timedelta
+
+import pandas as pd
+
+# ─── KPI suvestinės (inkrementiškai palaikomos) ───────────────────────────────
+# Dimensija -> kroviniai stulpelis; "viso" – bendra suma be dimensijos
+DIMENSIONS = {
+    "vilkikas": "vilkikas",
+    "klientas": "klientas",
+    "vadybininkas": "atsakingas_vadybininkas",
+    "viso": None,
+}
+# Laikotarpio lygis -> kiek simbolių iš pakrovimo_data ('YYYY-MM-DD' / 'YYYY-MM')
+LEVELS = {"diena": 10, "menuo": 7}
+MEASURES = ["kroviniu_sk", "frachtas", "kilometrai", "svoris", "paleciu_skaicius"]
+
+
+def table_name(dim, level):
+    return f"kpi_{dim}_{level}"
+
+
+def create_tables(conn):
+    for dim, col in DIMENSIONS.items():
+        for level in LEVELS:
+            key = "laikotarpis, reiksme" if col else "laikotarpis"
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table_name(dim, level)} (
+                    laikotarpis TEXT NOT NULL,
+                    {"reiksme TEXT NOT NULL," if col else ""}
+                    kroviniu_sk INTEGER NOT NULL DEFAULT 0,
+                    frachtas REAL NOT NULL DEFAULT 0,
+                    kilometrai INTEGER NOT NULL DEFAULT 0,
+                    svoris INTEGER NOT NULL DEFAULT 0,
+                    paleciu_skaicius INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY ({key})
+                ) WITHOUT ROWID
+            """)
+
+
+def apply(conn, rows, sign=1):
+    """Prideda (sign=1) arba atima (sign=-1) krovinių indėlį į suvestines.
+
+    rows – DataFrame arba dict'ų sąrašas su kroviniai stulpeliais; kviečiama
+    toje pačioje rašymo transakcijoje kaip ir krovinio INSERT/UPDATE.
+    """
+    df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+    df = df.reindex(columns=["pakrovimo_data"] + MEASURES[1:] + [c for c in DIMENSIONS.values() if c])
+    df = df[df["pakrovimo_data"].notna() & (df["pakrovimo_data"].astype(str) != "")]
+    if df.empty:
+        return
+    vals = pd.DataFrame({
+        "kroviniu_sk": sign,
+        "frachtas": pd.to_numeric(df["frachtas"], errors="coerce").fillna(0) * sign,
+        "kilometrai": pd.to_numeric(df["kilometrai"], errors="coerce").fillna(0).astype("int64") * sign,
+        "svoris": pd.to_numeric(df["svoris"], errors="coerce").fillna(0).astype("int64") * sign,
+        "paleciu_skaicius": pd.to_numeric(df["paleciu_skaicius"], errors="coerce").fillna(0).astype("int64") * sign,
+    }, index=df.index)
+    data = df["pakrovimo_data"].astype(str)
+    for level, n in LEVELS.items():
+        vals["laikotarpis"] = data.str[:n]
+        for dim, col in DIMENSIONS.items():
+            keys = ["laikotarpis"]
+            if col:
+                vals["reiksme"] = df[col].fillna("").astype(str)
+                keys.append("reiksme")
+            agg = vals.groupby(keys, sort=False)[MEASURES].sum().reset_index()
+            _upsert(conn, table_name(dim, level), keys, agg)
+
+
+def _upsert(conn, table, keys, agg):
+    cols = keys + MEASURES
+    conn.executemany(f"""
+        INSERT INTO {table}({", ".join(cols)}) VALUES({", ".join("?" for _ in cols)})
+        ON CONFLICT({", ".join(keys)}) DO UPDATE SET
+        {", ".join(f"{m} = {m} + excluded.{m}" for m in MEASURES)}
+    """, agg[cols].astype(object).itertuples(index=False, name=None))
+
+
+def rebuild(conn):
+    """Perskaičiuoja visas suvestines iš kroviniai (backfill)."""
+    create_tables(conn)
+    for dim, col in DIMENSIONS.items():
+        for level, n in LEVELS.items():
+            table = table_name(dim, level)
+            period = f"substr(pakrovimo_data, 1, {n})"
+            select = f"{period}, COALESCE({col}, '')" if col else period
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(f"""
+                INSERT INTO {table}
+                SELECT {select}, COUNT(*), COALESCE(SUM(frachtas), 0),
+                       COALESCE(SUM(kilometrai), 0), COALESCE(SUM(svoris), 0),
+                       COALESCE(SUM(paleciu_skaicius), 0)
+                FROM kroviniai
+                WHERE pakrovimo_data IS NOT NULL AND pakrovimo_data <> ''
+                GROUP BY {", ".join(str(i + 1) for i in range(2 if col else 1))}
+            """)
+
+
+# ─── Skaitymas ataskaitai ─────────────────────────────────────────────────────
+def _split_range(nuo, iki):
+    """[nuo, iki] -> (pilni mėnesiai, dienų intervalai kraštuose)."""
+    first_full = nuo if nuo.day == 1 else (nuo.replace(day=28) + timedelta(days=4)).replace(day=1)
+    after = iki + timedelta(days=1)
+    last_full_end = after.replace(day=1)  # pirmas mėnuo, kuris jau nepilnas
+    if first_full >= last_full_end:
+        return None, [(nuo, iki)]
+    months = (first_full.strftime("%Y-%m"), (last_full_end - timedelta(days=1)).strftime("%Y-%m"))
+    edges = []
+    if nuo < first_full:
+        edges.append((nuo, first_full - timedelta(days=1)))
+    if last_full_end <= iki:
+        edges.append((last_full_end, iki))
+    return months, edges
+
+
+def summary(db, dim, nuo, iki):
+    """Sumos pagal dimensiją intervale; pilni mėnesiai imami iš mėnesių lentelės."""
+    months, edges = _split_range(nuo, iki)
+    parts, params = [], []
+    if months:
+        parts.append(f"SELECT * FROM {table_name(dim, 'menuo')} WHERE laikotarpis BETWEEN ? AND ?")
+        params += list(months)
+    for a, b in edges:
+        parts.append(f"SELECT * FROM {table_name(dim, 'diena')} WHERE laikotarpis BETWEEN ? AND ?")
+        params += [str(a), str(b)]
+    key = "reiksme" if DIMENSIONS[dim] else "'viso' AS reiksme"
+    group = "GROUP BY reiksme" if DIMENSIONS[dim] else ""
+    return db.query_df(f"""
+        SELECT {key}, SUM(kroviniu_sk) AS kroviniu_sk, SUM(frachtas) AS frachtas,
+               SUM(kilometrai) AS kilometrai, SUM(svoris) AS svoris,
+               SUM(paleciu_skaicius) AS paleciu_skaicius,
+               ROUND(SUM(frachtas) / NULLIF(SUM(kilometrai), 0), 2) AS eur_km
+        FROM ({" UNION ALL ".join(parts)})
+        {group}
+        ORDER BY frachtas DESC
+    """, params)
+
+
+def timeline(db, nuo, iki, granularity="diena"):
+    """Bendros sumos laike: diena, ISO savaitė ('YYYY-Www') arba mėnuo."""
+    if granularity == "menuo":
+        table, a, b = table_name("viso", "menuo"), nuo.strftime("%Y-%m"), iki.strftime("%Y-%m")
+    else:
+        table, a, b = table_name("viso", "diena"), str(nuo), str(iki)
+    df = db.query_df(f"""
+        SELECT laikotarpis, kroviniu_sk, frachtas, kilometrai
+        FROM {table}
+        WHERE laikotarpis BETWEEN ? AND ?
+        ORDER BY laikotarpis
+    """, (a, b))
+    if granularity != "savaite":
+        return df
+    # SQLite %W – ne ISO savaitė (metų riboje skiriasi), tad grupuojama pandas
+    iso = pd.to_datetime(df["laikotarpis"]).dt.isocalendar()
+    savaite = iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)
+    return (df.drop(columns="laikotarpis").groupby(savaite.rename("laikotarpis")).sum()
+            .reset_index())
+
+
+# ─── CLI: suvestinių perskaičiavimas ──────────────────────────────────────────
+def main(argv=None):
+    from db import DB_PATH, Database
+    p = argparse.ArgumentParser(description="DISPO KPI suvestinių perskaičiavimas")
+    p.add_argument("--db", default=DB_PATH)
+    args = p.parse_args(argv)
+    db = Database(args.db, readers=1)
+    try:
+        db.transaction(rebuild)
+    finally:
+        db.close()
+    print("KPI suvestinės perskaičiuotos.")
+
+
+if __name__ == "__main__":
+    main()
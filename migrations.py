@@ -0,0 +1,481 @@
+import re
+import sqlite3
+import threading
+import unicodedata
+import weakref
+
+# Migracijos nekviečia programos kodo (kpi, distances, search ir pan.): žingsnio
+# DDL ir pradiniai duomenys užfiksuoti čia, kad jau sunumeruotas žingsnis visada
+# darytų tą patį. Vėlesni pakeitimai – tik nauju žingsniu MIGRATIONS gale.
+
+# ─── Pradinė schema ───────────────────────────────────────────────────────────
+lookup_ddl = """
+CREATE TABLE IF NOT EXISTS lookup (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kategorija TEXT,
+    reiksme TEXT UNIQUE
+)
+"""
+
+table_ddls = {
+    "kroviniai": """
+        CREATE TABLE IF NOT EXISTS kroviniai (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            klientas TEXT,
+            uzsakymo_numeris TEXT,
+            pakrovimo_numeris TEXT,
+            pakrovimo_data TEXT,
+            pakrovimo_laikas_nuo TEXT,
+            pakrovimo_laikas_iki TEXT,
+            iskrovimo_data TEXT,
+            iskrovimo_laikas_nuo TEXT,
+            iskrovimo_laikas_iki TEXT,
+            pakrovimo_salis TEXT,
+            pakrovimo_miestas TEXT,
+            iskrovimo_salis TEXT,
+            iskrovimo_miestas TEXT,
+            vilkikas TEXT,
+            priekaba TEXT,
+            atsakingas_vadybininkas TEXT,
+            kilometrai INTEGER,
+            frachtas REAL,
+            svoris INTEGER,
+            paleciu_skaicius INTEGER,
+            busena TEXT
+        )
+    """,
+    "vilkikai": """
+        CREATE TABLE IF NOT EXISTS vilkikai (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            numeris TEXT UNIQUE,
+            marke TEXT,
+            pagaminimo_metai INTEGER,
+            tech_apziura DATE,
+            vadybininkas TEXT,
+            vairuotojai TEXT,
+            priekaba TEXT
+        )
+    """,
+    "priekabos": """
+        CREATE TABLE IF NOT EXISTS priekabos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            priekabu_tipas TEXT,
+            numeris TEXT UNIQUE,
+            marke TEXT,
+            pagaminimo_metai INTEGER,
+            tech_apziura DATE,
+            priskirtas_vilkikas TEXT
+        )
+    """,
+    "grupes": """
+        CREATE TABLE IF NOT EXISTS grupes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            numeris TEXT UNIQUE,
+            pavadinimas TEXT,
+            aprasymas TEXT
+        )
+    """,
+    "vairuotojai": """
+        CREATE TABLE IF NOT EXISTS vairuotojai (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            vardas TEXT,
+            pavarde TEXT,
+            gimimo_metai INTEGER,
+            tautybe TEXT,
+            priskirtas_vilkikas TEXT
+        )
+    """,
+    "klientai": """
+        CREATE TABLE IF NOT EXISTS klientai (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pavadinimas TEXT,
+            kontaktai TEXT,
+            salis TEXT,
+            miestas TEXT,
+            regionas TEXT,
+            vat_numeris TEXT
+        )
+    """,
+    "darbuotojai": """
+        CREATE TABLE IF NOT EXISTS darbuotojai (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            vardas TEXT,
+            pavarde TEXT,
+            pareigybe TEXT,
+            el_pastas TEXT,
+            telefonas TEXT,
+            grupe TEXT
+        )
+    """
+}
+
+
+def _v1_pradine_schema(conn):
+    conn.execute(lookup_ddl)
+    for ddl in table_ddls.values():
+        conn.execute(ddl)
+
+
+def _v2_indeksai(conn):
+    for sql in (
+        "CREATE INDEX IF NOT EXISTS ix_kroviniai_vilkikas_pakrovimo ON kroviniai(vilkikas, pakrovimo_data)",
+        "CREATE INDEX IF NOT EXISTS ix_kroviniai_uzsakymo_numeris ON kroviniai(uzsakymo_numeris)",
+        "CREATE INDEX IF NOT EXISTS ix_kroviniai_busena ON kroviniai(busena)",
+        # DISPO lango užklausimas: pakrovimo ARBA iškrovimo data intervale
+        "CREATE INDEX IF NOT EXISTS ix_kroviniai_pakrovimo_data ON kroviniai(pakrovimo_data)",
+        "CREATE INDEX IF NOT EXISTS ix_kroviniai_iskrovimo_data ON kroviniai(iskrovimo_data)",
+        "CREATE INDEX IF NOT EXISTS ix_lookup_kategorija ON lookup(kategorija)",
+    ):
+        conn.execute(sql)
+    conn.execute("ANALYZE")
+
+
+def _iso_date(col):
+    return f"date(replace(replace({col}, '.', '-'), '/', '-'))"
+
+
+def _v3_datos_iso(conn):
+    # Datos – 'YYYY-MM-DD', laikai – 'HH:MM:SS': leksikografinė tvarka = chronologinė.
+    # Neatpažintos reikšmės paliekamos kaip yra.
+    datos = {
+        "kroviniai": ["pakrovimo_data", "iskrovimo_data"],
+        "vilkikai": ["tech_apziura"],
+        "priekabos": ["tech_apziura"],
+    }
+    for table, cols in datos.items():
+        for col in cols:
+            conn.execute(f"""
+                UPDATE {table} SET {col} = {_iso_date(col)}
+                WHERE {_iso_date(col)} IS NOT NULL AND {col} <> {_iso_date(col)}
+            """)
+    for col in ("pakrovimo_laikas_nuo", "pakrovimo_laikas_iki",
+                "iskrovimo_laikas_nuo", "iskrovimo_laikas_iki"):
+        conn.execute(f"""
+            UPDATE kroviniai SET {col} = time({col})
+            WHERE time({col}) IS NOT NULL AND {col} <> time({col})
+        """)
+
+
+_V4_PRIESAGA_RE = re.compile(r"^(.*)-(\d+)$")
+
+
+def _v4_uzsakymu_skaitikliai(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS uzsakymo_numeriai (
+            bazinis TEXT PRIMARY KEY,
+            kiekis INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    # Skaitikliai pagal jau įrašytus numerius (X, X-1, X-2 -> 3)
+    counts = dict(conn.execute(
+        "SELECT uzsakymo_numeris, COUNT(*) FROM kroviniai "
+        "WHERE uzsakymo_numeris IS NOT NULL GROUP BY uzsakymo_numeris"
+    ).fetchall())
+    kiekiai = dict(counts)
+    for numeris in counts:
+        m = _V4_PRIESAGA_RE.match(numeris)
+        if m and m.group(1) in counts:
+            base = m.group(1)
+            kiekiai[base] = max(kiekiai[base], int(m.group(2)) + 1)
+    conn.executemany(
+        "INSERT OR REPLACE INTO uzsakymo_numeriai(bazinis, kiekis) VALUES(?, ?)",
+        kiekiai.items(),
+    )
+
+
+# KPI suvestinės: dimensija -> kroviniai stulpelis, lygis -> pakrovimo_data ilgis
+_V5_DIMENSIJOS = {"vilkikas": "vilkikas", "klientas": "klientas",
+                  "vadybininkas": "atsakingas_vadybininkas", "viso": None}
+_V5_LYGIAI = {"diena": 10, "menuo": 7}
+
+
+def _v5_kpi_suvestines(conn):
+    for dim, col in _V5_DIMENSIJOS.items():
+        for level, n in _V5_LYGIAI.items():
+            table = f"kpi_{dim}_{level}"
+            key = "laikotarpis, reiksme" if col else "laikotarpis"
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    laikotarpis TEXT NOT NULL,
+                    {"reiksme TEXT NOT NULL," if col else ""}
+                    kroviniu_sk INTEGER NOT NULL DEFAULT 0,
+                    frachtas REAL NOT NULL DEFAULT 0,
+                    kilometrai INTEGER NOT NULL DEFAULT 0,
+                    svoris INTEGER NOT NULL DEFAULT 0,
+                    paleciu_skaicius INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY ({key})
+                ) WITHOUT ROWID
+            """)
+            period = f"substr(pakrovimo_data, 1, {n})"
+            select = f"{period}, COALESCE({col}, '')" if col else period
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(f"""
+                INSERT INTO {table}
+                SELECT {select}, COUNT(*), COALESCE(SUM(frachtas), 0),
+                       COALESCE(SUM(kilometrai), 0), COALESCE(SUM(svoris), 0),
+                       COALESCE(SUM(paleciu_skaicius), 0)
+                FROM kroviniai
+                WHERE pakrovimo_data IS NOT NULL AND pakrovimo_data <> ''
+                GROUP BY {"1, 2" if col else "1"}
+            """)
+
+
+def _v6_ta_indeksai(conn):
+    # TA stebėjimas skaito tik vienetus, kurių apžiūra baigiasi iki horizonto
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_vilkikai_tech_apziura ON vilkikai(tech_apziura)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_priekabos_tech_apziura ON priekabos(tech_apziura)")
+
+
+def _v7_konfliktu_indeksai(conn):
+    # Priekabos užimtumo paieška ir ilgiausio reiso trukmė (išraiškos indeksas)
+    conn.execute("""CREATE INDEX IF NOT EXISTS ix_kroviniai_priekaba_pakrovimo
+                    ON kroviniai(priekaba, pakrovimo_data)""")
+    conn.execute("""CREATE INDEX IF NOT EXISTS ix_kroviniai_trukme
+                    ON kroviniai(julianday(iskrovimo_data) - julianday(pakrovimo_data))""")
+
+
+# (šalis, miestas, platuma, ilguma) – 8 migracijos pradinis sąrašas
+_V8_MIESTAI = [
+    ("LT", "Vilnius", 54.69, 25.28), ("LT", "Kaunas", 54.90, 23.90),
+    ("LT", "Klaipėda", 55.71, 21.13), ("LT", "Šiauliai", 55.93, 23.31),
+    ("LT", "Panevėžys", 55.73, 24.36), ("LT", "Alytus", 54.40, 24.05),
+    ("LT", "Marijampolė", 54.56, 23.35), ("LT", "Utena", 55.50, 25.60),
+    ("LV", "Riga", 56.95, 24.11), ("LV", "Daugavpils", 55.87, 26.54),
+    ("LV", "Liepāja", 56.51, 21.01), ("LV", "Jelgava", 56.65, 23.72),
+    ("EE", "Tallinn", 59.44, 24.75), ("EE", "Tartu", 58.38, 26.72),
+    ("EE", "Pärnu", 58.39, 24.50),
+    ("PL", "Warszawa", 52.23, 21.01), ("PL", "Kraków", 50.06, 19.94),
+    ("PL", "Łódź", 51.76, 19.46), ("PL", "Wrocław", 51.11, 17.04),
+    ("PL", "Poznań", 52.41, 16.93), ("PL", "Gdańsk", 54.35, 18.65),
+    ("PL", "Szczecin", 53.43, 14.55), ("PL", "Katowice", 50.26, 19.02),
+    ("PL", "Białystok", 53.13, 23.16), ("PL", "Lublin", 51.25, 22.57),
+    ("DE", "Berlin", 52.52, 13.40), ("DE", "Hamburg", 53.55, 9.99),
+    ("DE", "München", 48.14, 11.58), ("DE", "Köln", 50.94, 6.96),
+    ("DE", "Frankfurt am Main", 50.11, 8.68), ("DE", "Stuttgart", 48.78, 9.18),
+    ("DE", "Düsseldorf", 51.23, 6.77), ("DE", "Leipzig", 51.34, 12.37),
+    ("DE", "Dresden", 51.05, 13.74), ("DE", "Hannover", 52.38, 9.73),
+    ("DE", "Bremen", 53.08, 8.80), ("DE", "Nürnberg", 49.45, 11.08),
+    ("DE", "Dortmund", 51.51, 7.47),
+    ("NL", "Amsterdam", 52.37, 4.90), ("NL", "Rotterdam", 51.92, 4.48),
+    ("NL", "Venlo", 51.37, 6.17), ("NL", "Eindhoven", 51.44, 5.48),
+    ("BE", "Antwerpen", 51.22, 4.40), ("BE", "Bruxelles", 50.85, 4.35),
+    ("BE", "Gent", 51.05, 3.72), ("BE", "Liège", 50.63, 5.57),
+    ("FR", "Paris", 48.86, 2.35), ("FR", "Lyon", 45.76, 4.84),
+    ("FR", "Marseille", 43.30, 5.37), ("FR", "Lille", 50.63, 3.06),
+    ("FR", "Strasbourg", 48.57, 7.75), ("FR", "Bordeaux", 44.84, -0.58),
+    ("FR", "Toulouse", 43.60, 1.44), ("FR", "Nantes", 47.22, -1.55),
+    ("IT", "Milano", 45.46, 9.19), ("IT", "Torino", 45.07, 7.69),
+    ("IT", "Verona", 45.44, 10.99), ("IT", "Bologna", 44.49, 11.34),
+    ("IT", "Roma", 41.90, 12.50),
+    ("ES", "Madrid", 40.42, -3.70), ("ES", "Barcelona", 41.39, 2.17),
+    ("ES", "Valencia", 39.47, -0.38),
+    ("CZ", "Praha", 50.08, 14.44), ("CZ", "Brno", 49.20, 16.61),
+    ("CZ", "Ostrava", 49.82, 18.26), ("SK", "Bratislava", 48.15, 17.11),
+    ("AT", "Wien", 48.21, 16.37), ("AT", "Linz", 48.31, 14.29),
+    ("AT", "Graz", 47.07, 15.44), ("HU", "Budapest", 47.50, 19.04),
+    ("CH", "Zürich", 47.38, 8.54), ("CH", "Basel", 47.56, 7.59),
+    ("DK", "København", 55.68, 12.57), ("DK", "Aarhus", 56.16, 10.20),
+    ("SE", "Stockholm", 59.33, 18.07), ("SE", "Göteborg", 57.71, 11.97),
+    ("SE", "Malmö", 55.60, 13.00), ("NO", "Oslo", 59.91, 10.75),
+    ("FI", "Helsinki", 60.17, 24.94),
+    ("GB", "London", 51.51, -0.13), ("GB", "Birmingham", 52.49, -1.89),
+    ("GB", "Manchester", 53.48, -2.24),
+    ("RO", "București", 44.43, 26.10), ("BG", "Sofia", 42.70, 23.32),
+    ("SI", "Ljubljana", 46.06, 14.51), ("HR", "Zagreb", 45.81, 15.98),
+    ("UA", "Kyiv", 50.45, 30.52), ("UA", "Lviv", 49.84, 24.03),
+    ("BY", "Minsk", 53.90, 27.56),
+]
+_V8_TRANSLIT = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ß": "ss", "æ": "ae", "œ": "oe"})
+
+
+def _v8_normalize(text):
+    text = str(text or "").strip().lower().translate(_V8_TRANSLIT)
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def _v8_atstumai(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS miestai (
+            raktas TEXT PRIMARY KEY,
+            miesto_raktas TEXT NOT NULL,
+            salis TEXT NOT NULL,
+            miestas TEXT NOT NULL,
+            platuma REAL NOT NULL,
+            ilguma REAL NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_miestai_miesto_raktas ON miestai(miesto_raktas)")
+    # Simetriškas: raktai saugomi surikiuoti (is_raktas <= i_raktas)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS atstumai (
+            is_raktas TEXT NOT NULL,
+            i_raktas TEXT NOT NULL,
+            km REAL NOT NULL,
+            naudota REAL NOT NULL,
+            PRIMARY KEY (is_raktas, i_raktas)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_atstumai_naudota ON atstumai(naudota)")
+    conn.executemany("""
+        INSERT INTO miestai(raktas, miesto_raktas, salis, miestas, platuma, ilguma)
+        VALUES(?, ?, ?, ?, ?, ?)
+        ON CONFLICT(raktas) DO UPDATE SET
+            salis = excluded.salis, miestas = excluded.miestas,
+            platuma = excluded.platuma, ilguma = excluded.ilguma
+    """, [(f"{_v8_normalize(s)}|{_v8_normalize(m)}", _v8_normalize(m), s, m, lat, lon)
+          for s, m, lat, lon in _V8_MIESTAI])
+    conn.execute("DELETE FROM atstumai")
+
+
+def _v9_vairuotoju_indeksas(conn):
+    # DISPO įgulos dydis pagal priskirtus vairuotojus
+    conn.execute("""CREATE INDEX IF NOT EXISTS ix_vairuotojai_priskirtas_vilkikas
+                    ON vairuotojai(priskirtas_vilkikas)""")
+
+
+def _v10_eiluciu_versijos(conn):
+    # Optimistinė DISPO redagavimo patikra: versija didinama bet kuriuo UPDATE
+    for table, key in (("kroviniai", "id"), ("vilkikai", "id")):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN versija INTEGER NOT NULL DEFAULT 0")
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tr_{table}_versija AFTER UPDATE ON {table}
+            WHEN NEW.versija = OLD.versija
+            BEGIN
+                UPDATE {table} SET versija = OLD.versija + 1 WHERE {key} = NEW.{key};
+            END
+        """)
+
+
+# lentelė -> indeksuojami stulpeliai (11 migracijos būklė)
+_V11_PAIESKA = {
+    "kroviniai": ["uzsakymo_numeris", "pakrovimo_numeris", "klientas",
+                  "pakrovimo_miestas", "iskrovimo_miestas", "vilkikas", "priekaba"],
+    "klientai": ["pavadinimas", "miestas", "vat_numeris"],
+    "vilkikai": ["numeris", "priekaba", "vairuotojai"],
+    "priekabos": ["numeris", "priekabu_tipas"],
+    "vairuotojai": ["vardas", "pavarde"],
+}
+
+
+def _v11_paieska(conn):
+    # Išorinio turinio (content=) FTS5 lentelės ir sinchronizavimo trigeriai
+    for table, cols in _V11_PAIESKA.items():
+        fts = f"paieska_{table}"
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {", ".join(cols)}, content='{table}', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+            )
+        """)
+        new = ", ".join(f"new.{c}" for c in cols)
+        old = ", ".join(f"old.{c}" for c in cols)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tr_{fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {", ".join(cols)}) VALUES (new.id, {new});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tr_{fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {", ".join(cols)}) VALUES ('delete', old.id, {old});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tr_{fts}_au AFTER UPDATE OF {", ".join(cols)} ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {", ".join(cols)}) VALUES ('delete', old.id, {old});
+                INSERT INTO {fts}(rowid, {", ".join(cols)}) VALUES (new.id, {new});
+            END
+        """)
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def _v12_krovinio_priekabos_tipas(conn):
+    # Reikalingas priekabos tipas (tuščia – tinka bet kuri); naudoja auto-planavimas
+    conn.execute("ALTER TABLE kroviniai ADD COLUMN priekabu_tipas TEXT")
+    conn.execute("""CREATE INDEX IF NOT EXISTS ix_kroviniai_busena_pakrovimo
+                    ON kroviniai(busena, pakrovimo_data)""")
+
+
+def _v13_paieska_prefiksai(conn):
+    # Krovinių indekse lieka tik 2 ir 3 simbolių prefiksai: ilgesnės užklausos
+    # ir be prefiksų indekso randamos per <1 ms, o indeksas ~20 % mažesnis.
+    # Trigeriai nekeičiami – jie nurodo lentelę pavadinimu.
+    cols = _V11_PAIESKA["kroviniai"]
+    conn.execute("DROP TABLE paieska_kroviniai")
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE paieska_kroviniai USING fts5(
+            {", ".join(cols)}, content='kroviniai', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """)
+    conn.execute("INSERT INTO paieska_kroviniai(paieska_kroviniai) VALUES ('rebuild')")
+
+
+# ─── Migracijų sąrašas: (versija, aprašymas, žingsnis) – tik pridėti gale ─────
+MIGRATIONS = [
+    (1, "pradinė schema", _v1_pradine_schema),
+    (2, "indeksai DISPO ir sąrašų užklausimams", _v2_indeksai),
+    (3, "datos ir laikai ISO formatu", _v3_datos_iso),
+    (4, "užsakymo numerių skaitikliai", _v4_uzsakymu_skaitikliai),
+    (5, "KPI suvestinės", _v5_kpi_suvestines),
+    (6, "TA datų indeksai", _v6_ta_indeksai),
+    (7, "krovinių persidengimo indeksai", _v7_konfliktu_indeksai),
+    (8, "miestų koordinatės ir atstumų podėlis", _v8_atstumai),
+    (9, "vairuotojų priskyrimo indeksas", _v9_vairuotoju_indeksas),
+    (10, "krovinių ir vilkikų eilučių versijos", _v10_eiluciu_versijos),
+    (11, "FTS5 paieškos indeksai", _v11_paieska),
+    (12, "krovinio priekabos tipas", _v12_krovinio_priekabos_tipas),
+    (13, "krovinių paieškos prefiksai", _v13_paieska_prefiksai),
+]
+
+
+def current_version(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            versija INTEGER PRIMARY KEY,
+            aprasymas TEXT,
+            pritaikyta TEXT DEFAULT (datetime('now'))
+        )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(versija), 0) FROM schema_version").fetchone()[0]
+
+
+def _migrate(conn):
+    pritaikyta = []
+    versija = current_version(conn)
+    for nr, aprasymas, zingsnis in MIGRATIONS:
+        if nr <= versija:
+            continue
+        zingsnis(conn)
+        conn.execute(
+            "INSERT INTO schema_version(versija, aprasymas) VALUES(?, ?)", (nr, aprasymas)
+        )
+        pritaikyta.append(nr)
+    return pritaikyta
+
+
+def migrate(db):
+    """Pritaiko trūkstamas migracijas vienoje rašymo transakcijoje.
+
+    Esamos dispo_new.db bazės (be schema_version) pradedamos nuo 1 versijos –
+    pradinė schema naudoja CREATE TABLE IF NOT EXISTS, todėl duomenys lieka.
+    """
+    try:
+        versija = db.query_one("SELECT COALESCE(MAX(versija), 0) FROM schema_version")[0]
+    except sqlite3.OperationalError:
+        versija = 0
+    if versija >= MIGRATIONS[-1][0]:
+        return []
+    return db.transaction(_migrate, tables=list(table_ddls) + ["lookup", "miestai"])
+
+
+_migrated = weakref.WeakSet()
+_migrated_lock = threading.Lock()
+
+
+def ensure_schema(db):
+    """migrate() tik pirmą kartą šiame serverio procese; vėlesni perpaleidimai
+    schemos nebetikrina."""
+    with _migrated_lock:
+        if db not in _migrated:
+            migrate(db)
+            _migrated.add(db)
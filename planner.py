@@ -0,0 +1,333 @@
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import conflicts
+import kpi
+from distances import KELIO_KOEF, city_keys, get_engine, haversine_km
+from driving_time import KROVIMO_DARBAS, travel_hours
+
+# ─── Auto-planavimas: nesuplanuoti kroviniai -> vilkikai ─────────────────────
+# Godus algoritmas: kroviniai imami pagal pakrovimo laiką, kiekvienam visam
+# parkui vienu NumPy žingsniu tikrinama, kurie vilkikai jį gali paimti (priekabos
+# tipas, TA, užimtumas, laiko langai), ir parenkamas mažiausiai tuščių km
+# reikalaujantis. Skaičiuojama atskirame procese – Streamlit gija neužimama.
+NESUPLANUOTAS = "nesuplanuotas"
+SUPLANUOTAS = "suplanuotas"
+MAX_TUSTI_KM = 800          # toliau tuščias vilkikas nesiunčiamas
+NEZINOMA_VIETA_KM = 400     # vilkikas be istorijos ar miestas be koordinačių
+ISTORIJA_DIENU = 30         # paskutinės vilkiko vietos paieška prieš langą
+PROGRESO_ZINGSNIS = 25      # kas kiek krovinių atnaujinamas progresas / tikrinamas atšaukimas
+MAX_WORKERS = 2
+
+NESUPLANUOTI_SQL = """
+    SELECT id, versija, uzsakymo_numeris, klientas,
+           pakrovimo_data, pakrovimo_laikas_nuo, pakrovimo_laikas_iki,
+           iskrovimo_data, iskrovimo_laikas_nuo, iskrovimo_laikas_iki,
+           pakrovimo_salis, pakrovimo_miestas, iskrovimo_salis, iskrovimo_miestas,
+           kilometrai, priekabu_tipas
+    FROM kroviniai
+    WHERE busena = :busena AND pakrovimo_data BETWEEN :nuo AND :iki
+      AND iskrovimo_data >= pakrovimo_data
+"""
+# Jau suplanuoti (ir vykdomi) kroviniai, galintys riboti lango krovinius
+UZIMTUMO_SQL = """
+    SELECT id, vilkikas, priekaba,
+           pakrovimo_data, pakrovimo_laikas_nuo, pakrovimo_laikas_iki,
+           iskrovimo_data, iskrovimo_laikas_nuo,
+           pakrovimo_salis, pakrovimo_miestas, iskrovimo_salis, iskrovimo_miestas
+    FROM kroviniai
+    WHERE pakrovimo_data >= date(:nuo, '-' || (:istorija + :maks) || ' days')
+      AND pakrovimo_data <= date(:iki, '+' || :maks || ' days')
+      AND iskrovimo_data >= date(:nuo, '-' || :istorija || ' days')
+      AND busena <> :busena
+"""
+VILKIKU_SQL = """
+    SELECT v.numeris, v.priekaba, p.priekabu_tipas,
+           v.tech_apziura AS vilkiko_ta, p.tech_apziura AS priekabos_ta
+    FROM vilkikai v
+    LEFT JOIN priekabos p ON p.numeris = v.priekaba
+    WHERE COALESCE(v.priekaba, '') <> ''
+    ORDER BY v.numeris
+"""
+
+
+def _days(data, start):
+    return (pd.to_datetime(pd.Series(data), errors="coerce") - pd.Timestamp(start)).dt.days.to_numpy("float64")
+
+
+def _hours(data, laikas, start, default):
+    # Valandos nuo lango pradžios; 'HH:MM' ir 'HH:MM:SS', tuščias – default
+    s = pd.Series(laikas, dtype=object).fillna("").astype(str).str.strip()
+    s = s.where(s.str.len() != 5, s + ":00")
+    h = (pd.to_timedelta(s, errors="coerce") / pd.Timedelta(hours=1)).fillna(default)
+    return _days(data, start) * 24 + h.to_numpy()
+
+
+def load(db, engine, nuo, iki):
+    """Duomenys iš DB vienu skaitymu; grąžina (solve() įvestis, kroviniai, vilkikai)."""
+    with db.reader() as conn:
+        maks = int(conn.execute(conflicts.MAX_TRIP_SQL).fetchone()[0])
+        kroviniai = db.query_df(NESUPLANUOTI_SQL, {
+            "busena": NESUPLANUOTAS, "nuo": str(nuo), "iki": str(iki)}, conn=conn)
+        uzimta = db.query_df(UZIMTUMO_SQL, {
+            "busena": NESUPLANUOTAS, "nuo": str(nuo), "iki": str(iki),
+            "istorija": ISTORIJA_DIENU, "maks": maks}, conn=conn)
+        vilkikai = db.query_df(VILKIKU_SQL, conn=conn)
+
+    # Užimtumas vilkikui: jo paties kroviniai ir kroviniai su jo priekaba
+    trucks = pd.Index(vilkikai["numeris"])
+    pagal_priekaba = pd.Series(np.arange(len(trucks)), index=vilkikai["priekaba"])
+    pagal_priekaba = pagal_priekaba[~pagal_priekaba.index.duplicated()]
+    savi = uzimta.assign(t=trucks.get_indexer(uzimta["vilkikas"].fillna("")), savas=True)
+    per_priekaba = uzimta.assign(
+        t=uzimta["priekaba"].map(pagal_priekaba).fillna(-1).astype("int64").to_numpy(), savas=False)
+    busy = pd.concat([savi, per_priekaba], ignore_index=True)
+    busy = busy[busy["t"] >= 0].sort_values(["savas"], ascending=False)
+    busy = busy.drop_duplicates(["id", "t"]).sort_values(["t", "pakrovimo_data", "pakrovimo_laikas_nuo"])
+
+    # Miestų atstumų matrica (+ NaN eilutė/stulpelis indeksui -1)
+    c_from = city_keys(kroviniai["pakrovimo_salis"], kroviniai["pakrovimo_miestas"])
+    c_to = city_keys(kroviniai["iskrovimo_salis"], kroviniai["iskrovimo_miestas"])
+    b_from = city_keys(busy["pakrovimo_salis"], busy["pakrovimo_miestas"])
+    b_to = city_keys(busy["iskrovimo_salis"], busy["iskrovimo_miestas"])
+    miestai = pd.Index(pd.unique(np.concatenate([c_from, c_to, b_from, b_to]).astype(str)))
+    miestai = miestai[miestai != ""]
+    coords = engine.coordinates(set(miestai))
+    lat = np.array([coords.get(k, (np.nan, np.nan))[0] for k in miestai], dtype="float64")
+    lon = np.array([coords.get(k, (np.nan, np.nan))[1] for k in miestai], dtype="float64")
+    km = np.full((len(miestai) + 1, len(miestai) + 1), np.nan)
+    km[:-1, :-1] = np.round(haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :]) * KELIO_KOEF)
+
+    # Užimtumas -> vilkikai × K matricos
+    t = busy["t"].to_numpy()
+    slot = busy.groupby("t").cumcount().to_numpy()
+    shape = (len(trucks), int(slot.max()) + 1 if len(slot) else 1)
+
+    def pad(values, fill):
+        out = np.full(shape, fill, dtype=np.asarray(values).dtype if len(values) else "float64")
+        out[t, slot] = values
+        return out
+
+    ivesti = pd.to_numeric(kroviniai["kilometrai"], errors="coerce").to_numpy("float64")
+    c_from_i, c_to_i = miestai.get_indexer(c_from), miestai.get_indexer(c_to)
+    apskaiciuoti = km[c_from_i, c_to_i]
+    tipai = pd.Index(pd.unique(pd.concat([kroviniai["priekabu_tipas"], vilkikai["priekabu_tipas"]])
+                               .fillna("").astype(str).str.strip()))
+    ta = np.fmin(_days(vilkikai["vilkiko_ta"], nuo), _days(vilkikai["priekabos_ta"], nuo))
+
+    def tipas(col):
+        s = col.fillna("").astype(str).str.strip()
+        return np.where(s == "", -1, tipai.get_indexer(s))
+
+    data = {
+        "c_pak_day": _days(kroviniai["pakrovimo_data"], nuo),
+        "c_isk_day": _days(kroviniai["iskrovimo_data"], nuo),
+        "c_pak_nuo": _hours(kroviniai["pakrovimo_data"], kroviniai["pakrovimo_laikas_nuo"], nuo, 0),
+        "c_pak_iki": _hours(kroviniai["pakrovimo_data"], kroviniai["pakrovimo_laikas_iki"], nuo, 24),
+        "c_isk_nuo": _hours(kroviniai["iskrovimo_data"], kroviniai["iskrovimo_laikas_nuo"], nuo, 0),
+        "c_isk_iki": _hours(kroviniai["iskrovimo_data"], kroviniai["iskrovimo_laikas_iki"], nuo, 24),
+        "c_from": c_from_i,
+        "c_to": c_to_i,
+        "c_km": np.where(ivesti > 0, ivesti, np.nan_to_num(apskaiciuoti)),
+        "c_tipas": tipas(kroviniai["priekabu_tipas"]),
+        "t_tipas": tipas(vilkikai["priekabu_tipas"]),
+        "t_ta_day": np.where(np.isnan(ta), np.inf, ta),   # nežinoma TA neriboja
+        "b_ok": pad(np.ones(len(t), dtype=bool), False),
+        "b_own": pad(busy["savas"].to_numpy(dtype=bool), False),
+        "b_pak_day": pad(_days(busy["pakrovimo_data"], nuo), np.nan),
+        "b_isk_day": pad(_days(busy["iskrovimo_data"], nuo), np.nan),
+        "b_pak_nuo": pad(_hours(busy["pakrovimo_data"], busy["pakrovimo_laikas_nuo"], nuo, 0), np.nan),
+        "b_pak_iki": pad(_hours(busy["pakrovimo_data"], busy["pakrovimo_laikas_iki"], nuo, 24), np.nan),
+        "b_end": pad(_hours(busy["iskrovimo_data"], busy["iskrovimo_laikas_nuo"], nuo, 0)
+                     + KROVIMO_DARBAS, np.nan),
+        "b_from": pad(miestai.get_indexer(b_from), -1),
+        "b_to": pad(miestai.get_indexer(b_to), -1),
+        "km": km,
+    }
+    return data, kroviniai, vilkikai
+
+
+def solve(data, progress=None, cancel=None):
+    """Godus priskyrimas; grąžina {'krovinys', 'vilkikas', 'tusti_km'} masyvus
+    arba None, jei atšaukta. Vykdoma proceso baseine (tik NumPy)."""
+    d = data
+    km = d["km"]
+    n_trucks = len(d["t_tipas"])
+    rows = np.arange(n_trucks)
+    # Paskutinis šio algoritmo priskirtas krovinys kiekvienam vilkikui
+    a_end_day = np.full(n_trucks, -np.inf)
+    a_end = np.full(n_trucks, -np.inf)
+    a_pos = np.full(n_trucks, -1)
+    b_ok, b_own = d["b_ok"], d["b_own"]
+    out_c, out_t, out_km = [], [], []
+
+    order = np.argsort(d["c_pak_nuo"], kind="stable")
+    for n, c in enumerate(order):
+        if n % PROGRESO_ZINGSNIS == 0:
+            if cancel is not None and cancel.is_set():
+                return None
+            if progress is not None:
+                progress.value = n / len(order)
+        pak_day, isk_day = d["c_pak_day"][c], d["c_isk_day"][c]
+        if np.isnan(pak_day) or np.isnan(isk_day):
+            continue
+        ok = d["t_ta_day"] >= isk_day
+        if d["c_tipas"][c] >= 0:
+            ok &= d["t_tipas"] == d["c_tipas"][c]
+        # Griežtas persidengimas dienomis – kaip conflicts modulyje
+        with np.errstate(invalid="ignore"):
+            ok &= ~(b_ok & (d["b_pak_day"] < isk_day) & (d["b_isk_day"] > pak_day)).any(axis=1)
+            ok &= ~(a_end_day > pak_day)
+        if not ok.any():
+            continue
+
+        # Iš kur atvažiuoja: vėliausias savas užimtumas iki pakrovimo arba priskirtas krovinys
+        with np.errstate(invalid="ignore"):
+            prev_m = b_ok & b_own & (d["b_isk_day"] <= pak_day)
+        j = np.where(prev_m, d["b_end"], -np.inf).argmax(axis=1)
+        has_prev = prev_m.any(axis=1)
+        p_end = np.where(has_prev, d["b_end"][rows, j], -np.inf)
+        p_pos = np.where(has_prev, d["b_to"][rows, j], -1)
+        later = a_end > p_end
+        p_end, p_pos = np.where(later, a_end, p_end), np.where(later, a_pos, p_pos)
+        empty = np.nan_to_num(km[p_pos, d["c_from"][c]], nan=NEZINOMA_VIETA_KM)
+        ok &= empty <= MAX_TUSTI_KM
+
+        # Laiko langai: pakrovimas iki pakrovimo_laikas_iki, iškrovimas iki iskrovimo_laikas_iki
+        start = np.maximum(d["c_pak_nuo"][c], p_end + travel_hours(empty))
+        ok &= start <= d["c_pak_iki"][c]
+        arrive = np.maximum(d["c_isk_nuo"][c], start + KROVIMO_DARBAS + travel_hours(d["c_km"][c]))
+        ok &= arrive <= d["c_isk_iki"][c]
+        end = arrive + KROVIMO_DARBAS
+
+        # Ar spės į kitą jau suplanuotą pakrovimą
+        with np.errstate(invalid="ignore"):
+            next_m = b_ok & b_own & (d["b_pak_day"] >= isk_day)
+        k = np.where(next_m, d["b_pak_nuo"], np.inf).argmin(axis=1)
+        has_next = next_m.any(axis=1)
+        n_from = np.where(has_next, d["b_from"][rows, k], -1)
+        to_next = np.nan_to_num(km[d["c_to"][c], n_from], nan=NEZINOMA_VIETA_KM)
+        direct = np.nan_to_num(km[p_pos, n_from], nan=NEZINOMA_VIETA_KM)
+        ok &= ~has_next | (end + travel_hours(to_next) <= d["b_pak_iki"][rows, k])
+
+        cost = np.where(ok, empty + np.where(has_next, to_next - direct, 0), np.inf)
+        best = int(cost.argmin())
+        if not np.isfinite(cost[best]):
+            continue
+        a_end_day[best], a_end[best], a_pos[best] = isk_day, end[best], d["c_to"][c]
+        out_c.append(c)
+        out_t.append(best)
+        out_km.append(empty[best])
+    if progress is not None:
+        progress.value = 1.0
+    return {"krovinys": np.array(out_c, dtype="int64"), "vilkikas": np.array(out_t, dtype="int64"),
+            "tusti_km": np.array(out_km, dtype="float64")}
+
+
+# ─── Vykdymas proceso baseine ─────────────────────────────────────────────────
+_pool = None
+_manager = None
+_pool_lock = threading.Lock()
+
+
+def _executor():
+    global _pool, _manager
+    with _pool_lock:
+        if _pool is None:
+            # spawn – vaikinis procesas nepaveldi Streamlit ir rašytojo gijų
+            ctx = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=ctx)
+            _manager = ctx.Manager()
+    return _pool, _manager
+
+
+class PlanJob:
+    """Vykdomas planavimas: progresas (0..1), atšaukimas ir pasiūlymai."""
+
+    def __init__(self, future, progress, cancel, kroviniai, vilkikai):
+        self._future = future
+        self._progress = progress
+        self._cancel = cancel
+        self._kroviniai = kroviniai
+        self._vilkikai = vilkikai
+
+    def progress(self):
+        return 1.0 if self._future.done() else self._progress.value
+
+    def cancel(self):
+        self._cancel.set()
+
+    def done(self):
+        return self._future.done()
+
+    def proposals(self):
+        """Pasiūlymų DataFrame arba None, jei atšaukta; solve() klaidos kyla čia."""
+        res = self._future.result()
+        if res is None:
+            return None
+        k = self._kroviniai.iloc[res["krovinys"]]
+        v = self._vilkikai.iloc[res["vilkikas"]]
+        return pd.DataFrame({
+            "id": k["id"].to_numpy(),
+            "uzsakymo_numeris": k["uzsakymo_numeris"].to_numpy(),
+            "klientas": k["klientas"].to_numpy(),
+            "pakrovimo_data": k["pakrovimo_data"].to_numpy(),
+            "marsrutas": (k["pakrovimo_miestas"].fillna("") + " → "
+                          + k["iskrovimo_miestas"].fillna("")).to_numpy(),
+            "vilkikas": v["numeris"].to_numpy(),
+            "priekaba": v["priekaba"].to_numpy(),
+            "tusti_km": res["tusti_km"],
+            "versija": k["versija"].to_numpy(),
+        })
+
+
+def start(db, ref, nuo, iki):
+    """Nuskaito [nuo, iki] nesuplanuotus krovinius ir paleidžia solve() baseine."""
+    data, kroviniai, vilkikai = load(db, get_engine(db, ref), nuo, iki)
+    pool, manager = _executor()
+    progress, cancel = manager.Value("d", 0.0), manager.Event()
+    future = pool.submit(solve, data, progress, cancel)
+    return PlanJob(future, progress, cancel, kroviniai, vilkikai)
+
+
+# ─── Pasiūlymų patvirtinimas ──────────────────────────────────────────────────
+_KROVINIAI_SQL = "SELECT * FROM kroviniai WHERE id IN (SELECT value FROM json_each(?))"
+
+
+def accept(db, proposals):
+    """Patvirtina pasiūlymus vienoje transakcijoje; grąžina (priimta, praleisti).
+
+    Praleidžiami kroviniai, pakeisti po planavimo (versija, būsena), ir tie,
+    kuriems vilkikas ar priekaba jau užimti suplanuotais kroviniais.
+    """
+    ids = json.dumps([int(i) for i in proposals["id"]])
+
+    def run(conn):
+        seni = pd.read_sql_query(_KROVINIAI_SQL, conn, params=(ids,)).set_index("id")
+        priimti, praleisti = [], []
+        for p in proposals.itertuples(index=False):
+            if (p.id not in seni.index or seni.at[p.id, "versija"] != p.versija
+                    or seni.at[p.id, "busena"] != NESUPLANUOTAS):
+                praleisti.append((p.id, p.uzsakymo_numeris, "krovinys pakeistas po planavimo"))
+                continue
+            found = conflicts.find(conn, {
+                "vilkikas": p.vilkikas, "priekaba": p.priekaba,
+                "pakrovimo_data": seni.at[p.id, "pakrovimo_data"],
+                "iskrovimo_data": seni.at[p.id, "iskrovimo_data"],
+            }, exclude_id=int(p.id))
+            if len(found) and (found["busena"] != NESUPLANUOTAS).any():
+                praleisti.append((p.id, p.uzsakymo_numeris, "vilkikas ar priekaba jau užimti"))
+                continue
+            conn.execute("UPDATE kroviniai SET vilkikas = ?, priekaba = ?, busena = ? WHERE id = ?",
+                         (p.vilkikas, p.priekaba, SUPLANUOTAS, int(p.id)))
+            priimti.append(int(p.id))
+        if priimti:
+            kpi.apply(conn, seni.loc[priimti].reset_index(), -1)
+            kpi.apply(conn, pd.read_sql_query(_KROVINIAI_SQL, conn, params=(json.dumps(priimti),)))
+        return len(priimti), pd.DataFrame(praleisti, columns=["id", "uzsakymo_numeris", "priezastis"])
+    return db.transaction(run, tables=["kroviniai", "kpi"])
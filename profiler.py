@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+
+# ─── Perpaleidimų profiliavimas (DB užklausos ir puslapio sekcijos) ───────────
+MAX_RERUNS = int(os.environ.get("DISPO_PROFILE_RERUNS", "200"))
+LOG_PATH = os.environ.get("DISPO_PROFILE_LOG")  # JSON lines; nenustačius – nerašoma
+MAX_PARAM_LEN = 80
+
+
+def _param(value):
+    text = str(value)
+    return text if len(text) <= MAX_PARAM_LEN else text[:MAX_PARAM_LEN] + "…"
+
+
+def _params(params):
+    if isinstance(params, dict):
+        return {k: _param(v) for k, v in params.items()}
+    return [_param(v) for v in params]
+
+
+class Profiler:
+    """Renka vieno perpaleidimo sekcijų trukmes ir DB užklausas.
+
+    Streamlit kiekvieną sesijos perpaleidimą vykdo savo gijoje, todėl
+    einamasis įrašas laikomas threading.local; baigti įrašai dedami į
+    bendrą riboto dydžio žiedinį buferį (ir, jei nurodyta, į JSONL žurnalą).
+    Sekcijos žymimos mark() – sekcija trunka iki kitos žymės arba finish().
+    """
+
+    def __init__(self, db, max_reruns=MAX_RERUNS, log_path=LOG_PATH):
+        self.db = db
+        self.log_path = log_path
+        self._reruns = deque(maxlen=max_reruns)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        db.add_observer(self._on_query)
+
+    def start(self):
+        # st.rerun()/st.stop() puslapyje užbaigia main.py finally; čia lieka tik
+        # perpaleidimai, nutrūkę dar prieš jį (pvz. klaida migracijose ar paieškoje)
+        if getattr(self._local, "rerun", None) is not None:
+            self.finish(nutrauktas=True)
+        now = time.perf_counter()
+        self._local.rerun = {
+            "pradzia": datetime.now().isoformat(timespec="milliseconds"),
+            "puslapis": None,
+            "sekcijos": {},
+            "uzklausos": [],
+        }
+        self._local.t0 = self._local.last = now
+        self._local.section, self._local.section_t0 = None, now
+
+    def set_page(self, page):
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is not None:
+            rerun["puslapis"] = page
+
+    def mark(self, section):
+        """Užbaigia ankstesnę sekciją ir pradeda naują."""
+        if getattr(self._local, "rerun", None) is None:
+            return
+        self._close_section(time.perf_counter())
+        self._local.section = section
+
+    def finish(self, nutrauktas=False):
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is None:
+            return
+        # Nutraukto perpaleidimo pabaiga – paskutinis matytas veiksmas, ne laukimas
+        end = self._local.last if nutrauktas else time.perf_counter()
+        self._close_section(end)
+        rerun["trukme_ms"] = (end - self._local.t0) * 1000
+        rerun["nutrauktas"] = nutrauktas
+        self._local.rerun = None
+        with self._lock:
+            self._reruns.append(rerun)
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(rerun, ensure_ascii=False, default=str) + "\n")
+
+    def _close_section(self, now):
+        section = self._local.section
+        if section is not None:
+            sekcijos = self._local.rerun["sekcijos"]
+            sekcijos[section] = sekcijos.get(section, 0) + (now - self._local.section_t0) * 1000
+        self._local.section_t0 = self._local.last = now
+
+    def _on_query(self, sql, params, rows, seconds):
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is None:
+            return
+        rerun["uzklausos"].append({
+            "sql": " ".join(sql.split()),
+            "parametrai": _params(params),
+            "eilutes": rows,
+            "ms": seconds * 1000,
+            "sekcija": self._local.section,
+        })
+        self._local.last = time.perf_counter()
+
+    def reruns(self):
+        with self._lock:
+            return list(self._reruns)
+
+    def clear(self):
+        with self._lock:
+            self._reruns.clear()
+
+
+# ─── Suvestinės Diagnostikos puslapiui ────────────────────────────────────────
+def page_stats(reruns):
+    """Trukmės p50/p95, užklausų ir nuskaitytų eilučių mediana pagal puslapį."""
+    if not reruns:
+        return pd.DataFrame()
+    df = pd.DataFrame({
+        "puslapis": [r["puslapis"] for r in reruns],
+        "trukme_ms": [r["trukme_ms"] for r in reruns],
+        "db_ms": [sum(q["ms"] for q in r["uzklausos"]) for r in reruns],
+        "uzklausos": [len(r["uzklausos"]) for r in reruns],
+        "eilutes": [sum(q["eilutes"] or 0 for q in r["uzklausos"]) for r in reruns],
+    })
+    g = df.groupby("puslapis")
+    return pd.DataFrame({
+        "perpaleidimai": g.size(),
+        "p50_ms": g["trukme_ms"].quantile(0.5),
+        "p95_ms": g["trukme_ms"].quantile(0.95),
+        "db_p50_ms": g["db_ms"].quantile(0.5),
+        "uzklausos_p50": g["uzklausos"].median(),
+        "eilutes_p50": g["eilutes"].median(),
+    }).sort_values("p95_ms", ascending=False).round(1).reset_index()
+
+
+def query_stats(reruns):
+    """Užklausos sugrupuotos pagal tekstą, lėčiausios viršuje."""
+    rows = [q for r in reruns for q in r["uzklausos"]]
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows)
+    df["eilutes"] = pd.to_numeric(df["eilutes"], errors="coerce")
+    g = df.groupby("sql")
+    return pd.DataFrame({
+        "kartai": g.size(),
+        "viso_ms": g["ms"].sum(),
+        "vid_ms": g["ms"].mean(),
+        "max_ms": g["ms"].max(),
+        "eilutes_vid": g["eilutes"].mean(),
+        "sekcija": g["sekcija"].first(),
+    }).sort_values("max_ms", ascending=False).round(2).reset_index()
+
+
+def section_stats(reruns):
+    """Sekcijų trukmių p50/p95 (puslapis, sekcija)."""
+    rows = [(r["puslapis"], s, ms) for r in reruns for s, ms in r["sekcijos"].items()]
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows, columns=["puslapis", "sekcija", "ms"])
+    g = df.groupby(["puslapis", "sekcija"])["ms"]
+    return pd.DataFrame({
+        "p50_ms": g.quantile(0.5), "p95_ms": g.quantile(0.95),
+    }).sort_values("p95_ms", ascending=False).round(1).reset_index()
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler(db):
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None or _profiler.db is not db:
+            _profiler = Profiler(db)
+        return _profiler
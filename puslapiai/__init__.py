@@ -0,0 +1,22 @@
+import importlib
+
+# ─── Moduliai: pavadinimas meniu -> puslapiai.<modulis> ──────────────────────
+# Kiekvienas puslapis turi render(db, ref, prof) ir importuojamas tik tada,
+# kai pirmą kartą atidaromas; kiti moduliai perpaleidimo metu nevykdomi.
+PUSLAPIAI = {
+    "DISPO": "dispo",
+    "KPI": "kpi",
+    "Kroviniai": "kroviniai",
+    "Vilkikai": "vilkikai",
+    "Priekabos": "priekabos",
+    "Grupės": "grupes",
+    "Vairuotojai": "vairuotojai",
+    "Klientai": "klientai",
+    "Darbuotojai": "darbuotojai",
+    "Nustatymai": "nustatymai",
+    "Diagnostika": "diagnostika",
+}
+
+
+def load(modulis):
+    return importlib.import_module(f"{__name__}.{PUSLAPIAI[modulis]}")
@@ -0,0 +1,29 @@
+import streamlit as st
+
+
+# ─── DARBUOTOJAI ─────────────────────────────────────────────────────────────
+def render(db, ref, prof):
+    st.title("DISPO – Darbuotojai")
+    prof.mark("forma")
+    p_list = ref.lookup("pareigybe")
+    g_list = [r[2] for r in ref.grupes()]
+    with st.form("emp_form", clear_on_submit=True):
+        vd = st.text_input("Vardas"); pv = st.text_input("Pavardė")
+        pg = st.selectbox("Pareigybė", p_list) if p_list else st.text_input("Pareigybė")
+        gr = st.selectbox("Grupė", g_list) if g_list else st.text_input("Grupė")
+        em = st.text_input("El. paštas"); ph = st.text_input("Telefonas")
+        sb = st.form_submit_button("💾 Išsaugoti")
+    if sb:
+        if not vd or not pv: st.warning("⚠️ Vardas ir pavardė būtini.")
+        else:
+            try:
+                db.execute("""
+                    INSERT INTO darbuotojai (
+                        vardas,pavarde,pareigybe,el_pastas,telefonas,grupe
+                    ) VALUES(?,?,?,?,?,?)
+                """, (vd,pv,pg,em,ph,gr))
+                st.success("✅ Išsaugojau.")
+            except Exception as e:
+                st.error(f"❌ Klaida: {e}")
+    prof.mark("lentelė")
+    st.dataframe(db.query_df("SELECT * FROM darbuotojai"))
@@ -0,0 +1,37 @@
+import json
+
+import pandas as pd
+import streamlit as st
+
+from profiler import page_stats, query_stats, section_stats
+
+
+# ─── DIAGNOSTIKA: perpaleidimų profiliavimas ──────────────────────────────────
+def render(db, ref, prof):
+    st.title("DISPO – Diagnostika")
+    perpaleidimai = prof.reruns()
+    st.caption(f"Paskutiniai {len(perpaleidimai)} perpaleidimai (visos sesijos)."
+               + (f" Žurnalas: {prof.log_path}" if prof.log_path else ""))
+    if not perpaleidimai:
+        st.info("Dar nėra duomenų – paspaudinėk kitus modulius.")
+    else:
+        st.subheader("⏱ Puslapiai (p50 / p95)")
+        st.dataframe(page_stats(perpaleidimai), use_container_width=True, hide_index=True)
+        st.subheader("🐢 Lėčiausios užklausos")
+        st.dataframe(query_stats(perpaleidimai).head(30), use_container_width=True, hide_index=True)
+        st.subheader("🧩 Sekcijos")
+        st.dataframe(section_stats(perpaleidimai), use_container_width=True, hide_index=True)
+        st.subheader("🕒 Paskutinis perpaleidimas")
+        paskutinis = perpaleidimai[-1]
+        st.write(f"**{paskutinis['puslapis']}** · {paskutinis['trukme_ms']:.0f} ms · "
+                 f"{len(paskutinis['uzklausos'])} užklausų")
+        st.dataframe(pd.DataFrame(paskutinis["uzklausos"]), use_container_width=True, hide_index=True)
+        d1, d2 = st.columns(2)
+        d1.download_button(
+            "⬇️ Atsisiųsti (JSONL)",
+            "\n".join(json.dumps(r, ensure_ascii=False, default=str) for r in perpaleidimai),
+            file_name="diagnostika.jsonl", mime="application/json",
+        )
+        if d2.button("🧹 Išvalyti"):
+            prof.clear()
+            st.rerun()
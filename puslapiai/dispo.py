@@ -0,0 +1,148 @@
+from datetime import date, timedelta
+
+import streamlit as st
+
+import conflicts
+import dispo_edit
+import planner
+from dispo_grid import DispoGrid
+from distances import get_engine
+from tech_apziura import ta_panel
+
+REDAGAVIMO_RAKTAS = "dispo_redagavimas"
+
+
+# ─── DISPO ────────────────────────────────────────────────────────────────────
+def render(db, ref, prof):
+    st.title("DISPO – Planavimo lentelė")
+    # Datos horizontaliai, po dvi eilutes vienam vilkikui (iškrovimas / pakrovimas)
+    col1, col2 = st.columns(2)
+    start_date = col1.date_input("Pradžios data", date.today())
+    dienu_sk = col2.slider("Dienų skaičius", 7, 30, 14)
+    if "dispo_grid" not in st.session_state:
+        st.session_state["dispo_grid"] = DispoGrid()
+    grid = st.session_state["dispo_grid"]
+    prof.mark("TA")
+    ta, _ = ta_panel(db, ref, "dispo")
+    prof.mark("auto-planavimas")
+    pasiulymai = _planner_panel(db, ref, start_date, dienu_sk)
+    prof.mark("lentelės skaičiavimas")
+    # Kol yra neįrašytų pakeitimų, lentelė neatnaujinama – redaguojama ta pati
+    # momentinė kopija, su kuria vėliau lyginama
+    redagavimas = st.session_state.get(REDAGAVIMO_RAKTAS) or {}
+    laukia = bool(redagavimas.get("edited_rows"))
+    if laukia and grid.window == (str(start_date), dienu_sk):
+        df_dispo = grid.snapshot()[0]
+    else:
+        if laukia:
+            st.warning("⚠️ Pasikeitus langui neįrašyti pakeitimai atmesti.")
+        st.session_state.pop(REDAGAVIMO_RAKTAS, None)
+        df_dispo = grid.refresh(db, start_date, dienu_sk, ta, atstumai=get_engine(db, ref),
+                                pasiulymai=pasiulymai)
+    prof.mark("lentelės rodymas")
+    redaguojami = set(dispo_edit.editable_columns(df_dispo))
+    edited = st.data_editor(
+        df_dispo, key=REDAGAVIMO_RAKTAS, num_rows="fixed", use_container_width=True,
+        disabled=[c for c in df_dispo.columns if c not in redaguojami],
+    )
+    prof.mark("redagavimas")
+    _save_panel(db, grid, edited)
+    if "dispo_irasyta" in st.session_state:
+        st.success(st.session_state.pop("dispo_irasyta"))
+    prof.mark("konfliktai")
+    nuo, iki = start_date, start_date + timedelta(days=dienu_sk - 1)
+    persidengimai = ref.cached("kroviniai", ("konfliktai", nuo, iki),
+                               lambda: conflicts.report(db, nuo, iki))
+    with st.expander(f"⚠️ Persidengiantys kroviniai ({len(persidengimai)})"):
+        if len(persidengimai):
+            st.dataframe(persidengimai, use_container_width=True, hide_index=True)
+        else:
+            st.write("Persidengimų lange nėra.")
+
+
+def _save_panel(db, grid, edited):
+    # Be redagavimų visos lentelės nelyginame
+    if not (st.session_state.get(REDAGAVIMO_RAKTAS) or {}).get("edited_rows"):
+        return
+    df_dispo, kroviniai, vilkikai = grid.snapshot()
+    pakeitimai = dispo_edit.diff(df_dispo, edited)
+    if pakeitimai.empty:
+        return
+    c1, c2 = st.columns(2)
+    irasyti = c1.button(f"💾 Įrašyti pakeitimus ({len(pakeitimai)})", type="primary")
+    if c2.button("↩️ Atšaukti pakeitimus"):
+        st.session_state.pop(REDAGAVIMO_RAKTAS, None)
+        st.rerun()
+    kroviniu, vilkiku, praleisti = dispo_edit.plan(pakeitimai, df_dispo, kroviniai, vilkikai)
+    if len(praleisti):
+        with st.expander(f"⚠️ Neįrašomi langeliai ({len(praleisti)})"):
+            st.dataframe(praleisti, use_container_width=True, hide_index=True)
+    if not irasyti:
+        return
+    try:
+        k, v = dispo_edit.save(db, kroviniu, vilkiku)
+    except dispo_edit.StaleEditError as e:
+        st.error(f"❌ {e}. Atšaukite pakeitimus ir pakartokite atnaujintoje lentelėje.")
+        st.dataframe(e.stale, use_container_width=True, hide_index=True)
+        return
+    st.session_state.pop(REDAGAVIMO_RAKTAS, None)
+    st.session_state["dispo_irasyta"] = f"✅ Atnaujinta krovinių: {k}, vilkikų: {v}."
+    st.rerun()
+
+
+def _planner_panel(db, ref, start_date, dienu_sk):
+    """Auto-planavimo skydelis; grąžina krovinio id -> pasiūlytas vilkikas
+    peržiūrai DISPO lentelėje arba None."""
+    job = st.session_state.get("dispo_planas")
+    if job is not None and job.done():
+        del st.session_state["dispo_planas"]
+        try:
+            pasiulymai = job.proposals()
+        except Exception as e:
+            st.error(f"❌ Planavimas nepavyko: {e}")
+        else:
+            if pasiulymai is None:
+                st.info("Planavimas atšauktas.")
+            st.session_state["dispo_pasiulymai"] = pasiulymai
+        job = None
+    pasiulymai = st.session_state.get("dispo_pasiulymai")
+    with st.expander("🤖 Auto-planavimas (nesuplanuoti kroviniai)",
+                     expanded=job is not None or pasiulymai is not None):
+        if job is not None:
+            _planner_progress(job)
+            return None
+        if st.button("▶️ Planuoti lango krovinius"):
+            iki = start_date + timedelta(days=dienu_sk - 1)
+            st.session_state["dispo_planas"] = planner.start(db, ref, start_date, iki)
+            st.session_state.pop("dispo_pasiulymai", None)
+            st.rerun()
+        if pasiulymai is None:
+            return None
+        if pasiulymai.empty:
+            st.write("Tinkamų vilkikų nesuplanuotiems kroviniams nerasta.")
+            return None
+        st.caption(f"Pasiūlymų: {len(pasiulymai)}, tuščių km iš viso ~{pasiulymai['tusti_km'].sum():.0f}.")
+        rodyti = st.checkbox("Rodyti pasiūlymus DISPO lentelėje", True)
+        st.dataframe(pasiulymai.drop(columns=["versija"]), use_container_width=True, hide_index=True)
+        c1, c2 = st.columns(2)
+        if c1.button(f"✅ Patvirtinti visus ({len(pasiulymai)})", type="primary"):
+            priimta, praleisti = planner.accept(db, pasiulymai)
+            del st.session_state["dispo_pasiulymai"]
+            st.session_state["dispo_irasyta"] = (
+                f"✅ Suplanuota krovinių: {priimta}."
+                + (f" Praleista (užimta ar pakeista): {len(praleisti)}." if len(praleisti) else ""))
+            st.rerun()
+        if c2.button("🗑 Atmesti pasiūlymus"):
+            del st.session_state["dispo_pasiulymai"]
+            st.rerun()
+        return pasiulymai.set_index("id")["vilkikas"] if rodyti else None
+
+
+@st.fragment(run_every=1)
+def _planner_progress(job):
+    # Perpaleidžiamas tik šis fragmentas; baigus – visas puslapis
+    if job.done():
+        st.rerun()
+    st.progress(job.progress(), text=f"⏳ Planuojama... {job.progress():.0%}")
+    if st.button("⏹ Atšaukti planavimą"):
+        job.cancel()
@@ -0,0 +1,25 @@
+import streamlit as st
+
+
+# ─── GRUPĖS ─────────────────────────────────────────────────────────────────
+def render(db, ref, prof):
+    st.title("DISPO – Grupės")
+    prof.mark("forma")
+    with st.form("grp_form", clear_on_submit=True):
+        nr = st.text_input("Numeris")
+        pav = st.text_input("Pavadinimas")
+        apr = st.text_area("Aprašymas")
+        sb = st.form_submit_button("💾 Išsaugoti")
+    if sb:
+        if not nr or not pav: st.warning("⚠️ Numeris ir pavadinimas būtini.")
+        else:
+            try:
+                db.execute(
+                    "INSERT INTO grupes(numeris,pavadinimas,aprasymas) VALUES(?,?,?)",
+                    (nr,pav,apr)
+                )
+                st.success("✅ Išsaugojau.")
+            except Exception as e:
+                st.error(f"❌ Klaida: {e}")
+    prof.mark("lentelė")
+    st.dataframe(db.query_df("SELECT * FROM grupes"))
@@ -0,0 +1,26 @@
+import streamlit as st
+
+
+# ─── KLIENTAI ────────────────────────────────────────────────────────────────
+def render(db, ref, prof):
+    st.title("DISPO – Klientai")
+    prof.mark("forma")
+    with st.form("kl_form", clear_on_submit=True):
+        iv = st.text_input("Įmonės pavadinimas"); kt = st.text_input("Kontaktai")
+        sl = st.text_input("Šalis"); ms = st.text_input("Miestas")
+        rg = st.text_input("Regionas"); pv = st.text_input("PVM numeris")
+        sb = st.form_submit_button("💾 Išsaugoti")
+    if sb:
+        if not iv: st.warning("⚠️ Pavadinimas būtinas.")
+        else:
+            try:
+                db.execute("""
+                    INSERT INTO klientai (
+                        pavadinimas,kontaktai,salis,miestas,regionas,vat_numeris
+                    ) VALUES(?,?,?,?,?,?)
+                """, (iv,kt,sl,ms,rg,pv))
+                st.success("✅ Išsaugojau.")
+            except Exception as e:
+                st.error(f"❌ Klaida: {e}")
+    prof.mark("lentelė")
+    st.dataframe(db.query_df("SELECT * FROM klientai"))
@@ -0,0 +1,37 @@
+from datetime import date, timedelta
+
+import streamlit as st
+
+import kpi
+
+
+# ─── KPI ──────────────────────────────────────────────────────────────────────
+def render(db, ref, prof):
+    st.title("DISPO – KPI suvestinė")
+    col1, col2, col3, col4 = st.columns(4)
+    kpi_nuo = col1.date_input("Nuo", date.today() - timedelta(days=30))
+    kpi_iki = col2.date_input("Iki", date.today())
+    pjuviai = {"Vilkikas": "vilkikas", "Klientas": "klientas", "Vadybininkas": "vadybininkas"}
+    pjuvis = col3.selectbox("Pjūvis", list(pjuviai))
+    laikai = {"Diena": "diena", "Savaitė": "savaite", "Mėnuo": "menuo"}
+    laikas = col4.selectbox("Laiko žingsnis", list(laikai))
+    if kpi_nuo > kpi_iki:
+        st.error("❌ Pradžios data negali būti vėlesnė už pabaigos datą.")
+    else:
+        # Skaitomos tik suvestinės; podėlis galioja iki kito krovinių įrašymo
+        prof.mark("suvestinės")
+        suvestine = ref.cached("kpi", ("summary", pjuviai[pjuvis], kpi_nuo, kpi_iki),
+                               lambda: kpi.summary(db, pjuviai[pjuvis], kpi_nuo, kpi_iki))
+        eiga = ref.cached("kpi", ("timeline", laikai[laikas], kpi_nuo, kpi_iki),
+                          lambda: kpi.timeline(db, kpi_nuo, kpi_iki, laikai[laikas]))
+        prof.mark("rodymas")
+        m1, m2, m3, m4 = st.columns(4)
+        frachtas_viso = suvestine["frachtas"].sum()
+        km_viso = suvestine["kilometrai"].sum()
+        m1.metric("Krovinių", int(suvestine["kroviniu_sk"].sum()))
+        m2.metric("Frachtas (EUR)", f"{frachtas_viso:,.0f}")
+        m3.metric("Kilometrai", f"{km_viso:,.0f}")
+        m4.metric("EUR / km", f"{frachtas_viso / km_viso:.2f}" if km_viso else "–")
+        st.bar_chart(eiga.set_index("laikotarpis")[["frachtas"]])
+        st.dataframe(suvestine.rename(columns={"reiksme": pjuvis}),
+                     use_container_width=True, hide_index=True)
@@ -0,0 +1,166 @@
+from datetime import date, time, timedelta
+
+import numpy as np
+import streamlit as st
+
+import cargo
+import cargo_import
+import cargo_list
+import conflicts
+from distances import KM_NUOKRYPIS, city_key, get_engine
+from export import export_panel
+
+
+# ─── KROVINIAI ────────────────────────────────────────────────────────────────
+def render(db, ref, prof):
+    st.title("DISPO – Krovinių valdymas")
+    prof.mark("forma")
+    with st.form("krovinio_forma", clear_on_submit=False):
+        klientai = ref.klientai()
+        col1, col2 = st.columns(2)
+        if klientai:
+            klientas = col1.selectbox("Klientas", klientai)
+        else:
+            klientas = col1.text_input("Klientas (nėra įvestų)")
+        uzsakymo_numeris = col2.text_input("Užsakymo numeris")
+        pakrovimo_numeris = st.text_input("Pakrovimo numeris")
+        col3, col4 = st.columns(2)
+        pakrovimo_data = col3.date_input("Pakrovimo data", date.today())
+        pakrovimo_laikas_nuo = col3.time_input("Laikas nuo (pakrovimas)", time(8, 0))
+        pakrovimo_laikas_iki = col3.time_input("Laikas iki (pakrovimas)", time(17, 0))
+        iskrovimo_data = col4.date_input("Iškrovimo data", pakrovimo_data + timedelta(days=1))
+        iskrovimo_laikas_nuo = col4.time_input("Laikas nuo (iškrovimas)", time(8, 0))
+        iskrovimo_laikas_iki = col4.time_input("Laikas iki (iškrovimas)", time(17, 0))
+        col5, col6 = st.columns(2)
+        pakrovimo_salis = col5.text_input("Pakrovimo šalis")
+        pakrovimo_miestas = col5.text_input("Pakrovimo miestas")
+        iskrovimo_salis = col6.text_input("Iškrovimo šalis")
+        iskrovimo_miestas = col6.text_input("Iškrovimo miestą")
+        col7, col8 = st.columns(2)
+        vilkiku_priekabos = ref.truck_trailers()
+        if vilkiku_priekabos:
+            vilkikas = col7.selectbox("Vilkikas", list(vilkiku_priekabos))
+            priekaba = vilkiku_priekabos.get(vilkikas, "")
+        else:
+            vilkikas = col7.text_input("Vilkikas (nėra įvestų)")
+            priekaba = ""
+        col8.text_input("Priekaba", value=priekaba, disabled=True)
+        col9, col10, col11, col12 = st.columns(4)
+        kilometrai = col9.text_input("Kilometrai")
+        frachtas = col10.text_input("Frachtas (€)")
+        svoris = col11.text_input("Svoris (kg)")
+        paleciu = col12.text_input("Padėklų skaičius")
+        busena_opt = ref.lookup("busena")
+        col13, col14 = st.columns(2)
+        busena = col13.selectbox("Būsena", busena_opt or ["suplanuotas","nesuplanuotas","pakrautas","iškrautas"])
+        priekabu_tipas = col14.selectbox("Reikalingas priekabos tipas", [""] + ref.lookup("priekabu_tipas"))
+        nepaisyti = st.checkbox("Įrašyti net jei vilkikas ar priekaba tuo metu užimti")
+        submit = st.form_submit_button("💾 Įrašyti krovinį")
+    if submit:
+        if pakrovimo_data > iskrovimo_data:
+            st.error("❌ Pakrovimo data negali būti vėlesnė už iškrovimo datą.")
+        elif not klientas or not uzsakymo_numeris:
+            st.error("❌ Privalomi laukai: Klientas ir Užsakymo numeris.")
+        else:
+            km = int(kilometrai or 0)
+            apskaiciuota = get_engine(db, ref).km(
+                [city_key(pakrovimo_salis, pakrovimo_miestas)],
+                [city_key(iskrovimo_salis, iskrovimo_miestas)],
+            )[0]
+            if not np.isnan(apskaiciuota):
+                if not km:
+                    km = int(apskaiciuota)
+                    st.info(f"ℹ️ Kilometrai neįvesti – apskaičiuota ~{km} km.")
+                elif abs(km - apskaiciuota) > KM_NUOKRYPIS * apskaiciuota:
+                    st.warning(f"⚠️ Įvesta {km} km, o apskaičiuota ~{apskaiciuota:.0f} km.")
+            fr = float(frachtas or 0)
+            sv = int(svoris or 0)
+            pal = int(paleciu or 0)
+            krovinys = {
+                "klientas": klientas, "uzsakymo_numeris": uzsakymo_numeris,
+                "pakrovimo_numeris": pakrovimo_numeris,
+                "pakrovimo_data": str(pakrovimo_data),
+                "pakrovimo_laikas_nuo": str(pakrovimo_laikas_nuo),
+                "pakrovimo_laikas_iki": str(pakrovimo_laikas_iki),
+                "iskrovimo_data": str(iskrovimo_data),
+                "iskrovimo_laikas_nuo": str(iskrovimo_laikas_nuo),
+                "iskrovimo_laikas_iki": str(iskrovimo_laikas_iki),
+                "pakrovimo_salis": pakrovimo_salis, "pakrovimo_miestas": pakrovimo_miestas,
+                "iskrovimo_salis": iskrovimo_salis, "iskrovimo_miestas": iskrovimo_miestas,
+                "vilkikas": vilkikas, "priekaba": priekaba,
+                "atsakingas_vadybininkas": f"vadyb_{vilkikas.lower()}",
+                "kilometrai": km, "frachtas": fr, "svoris": sv,
+                "paleciu_skaicius": pal, "busena": busena, "priekabu_tipas": priekabu_tipas,
+            }
+            try:
+                _, issaugotas_nr = cargo.save(db, krovinys, check_conflicts=not nepaisyti)
+            except conflicts.ConflictError as e:
+                st.error("❌ Vilkikas ar priekaba tuo metu jau užimti – krovinys neįrašytas. "
+                         "Pažymėk varnelę, jei vis tiek reikia įrašyti.")
+                st.dataframe(e.conflicts, use_container_width=True, hide_index=True)
+            else:
+                if issaugotas_nr != uzsakymo_numeris:
+                    st.warning(f"🔔 Toks numeris jau egzistuoja – išsaugotas kaip {issaugotas_nr}.")
+                st.success("✅ Krovinį išsaugojau.")
+    prof.mark("importas")
+    with st.expander("📥 Masinis importas (CSV / XLSX)"):
+        st.caption("Stulpelių pavadinimai – kaip kroviniai lentelėje: "
+                   "klientas, uzsakymo_numeris, pakrovimo_data, iskrovimo_data, ...")
+        failas = st.file_uploader("Užsakymų failas", type=["csv", "xlsx"])
+        if failas is not None and st.button("📥 Importuoti"):
+            eiga = st.empty()
+            try:
+                irasyta, atmesta, ataskaita = cargo_import.import_file(
+                    db, failas, failas.name, ref.truck_trailers(),
+                    progress=lambda i, a: eiga.info(f"⏳ Įrašyta {i}, atmesta {a}..."),
+                )
+            except Exception as e:
+                st.error(f"❌ Klaida importuojant: {e}")
+            else:
+                eiga.empty()
+                st.success(f"✅ Importuota krovinių: {irasyta}.")
+                if atmesta:
+                    st.warning(f"⚠️ Atmesta eilučių: {atmesta}.")
+                    if atmesta > cargo_import.MAX_REPORT_ROWS:
+                        st.caption(f"Ataskaitoje – pirmos {cargo_import.MAX_REPORT_ROWS} atmestos eilutės.")
+                    st.download_button(
+                        "⬇️ Atsisiųsti klaidų ataskaitą", ataskaita,
+                        file_name=f"klaidos_{failas.name.rsplit('.', 1)[0]}.csv",
+                        mime="text/csv",
+                    )
+    prof.mark("sąrašas")
+    st.subheader("📋 Krovinių sąrašas")
+    f1, f2, f3, f4, f5 = st.columns(5)
+    filtrai = {
+        "data_nuo": f1.date_input("Pakrovimo data nuo", None),
+        "data_iki": f2.date_input("Pakrovimo data iki", None),
+        "klientas": f3.selectbox("Klientas", [""] + ref.klientai(), key="kroviniai_filtras_klientas"),
+        "vilkikas": f4.selectbox("Vilkikas", [""] + ref.vilkikai(), key="kroviniai_filtras_vilkikas"),
+        "busena": f5.selectbox("Būsena", [""] + (busena_opt or ["suplanuotas","nesuplanuotas","pakrautas","iškrautas"]),
+                               key="kroviniai_filtras_busena"),
+    }
+    s1, s2, s3 = st.columns([3, 1, 1])
+    stulpeliai = s1.multiselect("Stulpeliai", cargo_list.COLUMNS, cargo_list.DEFAULT_COLUMNS)
+    rikiuoti = s2.selectbox("Rikiuoti pagal", cargo_list.SORT_COLUMNS)
+    puslapio_dydis = s3.selectbox("Eilučių puslapyje", [25, 50, 100, 200], index=1)
+    # Žymeklių stekas: naujas filtras ar rikiavimas grąžina į pirmą puslapį
+    saraso_raktas = (tuple(filtrai.items()), rikiuoti, puslapio_dydis)
+    if st.session_state.get("kroviniai_filtrai") != saraso_raktas:
+        st.session_state["kroviniai_filtrai"] = saraso_raktas
+        st.session_state["kroviniai_zymekliai"] = [None]
+    zymekliai = st.session_state["kroviniai_zymekliai"]
+    puslapis, kitas = cargo_list.fetch_page(
+        db, stulpeliai, filtrai, sort=rikiuoti, after=zymekliai[-1], limit=puslapio_dydis
+    )
+    viso = cargo_list.count(db, ref, filtrai)
+    st.caption(f"Puslapis {len(zymekliai)} · rasta {viso} krovinių")
+    st.dataframe(puslapis, use_container_width=True, hide_index=True)
+    n1, n2 = st.columns(2)
+    if n1.button("⬅️ Ankstesnis", disabled=len(zymekliai) == 1):
+        zymekliai.pop()
+        st.rerun()
+    if n2.button("Kitas ➡️", disabled=kitas is None):
+        zymekliai.append(kitas)
+        st.rerun()
+    prof.mark("eksportas")
+    export_panel(db, "kroviniai")
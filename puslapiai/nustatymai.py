@@ -0,0 +1,61 @@
+import sqlite3
+
+import streamlit as st
+
+import distances
+
+
+# ─── NUSTATYMAI: visiškai dinamiškas dropdown valdymas ────────────────────────
+def render(db, ref, prof):
+    st.title("DISPO – Sąrašų valdymas")
+    kategorijos = ref.lookup_categories()
+    col1, col2 = st.columns(2)
+    esama = col1.selectbox("Esama kategorija", [""] + kategorijos)
+    nauja_kat = col2.text_input("Arba nauja kategorija")
+    kategorija = nauja_kat.strip() if nauja_kat else esama
+    st.markdown("---")
+    if kategorija:
+        st.subheader(f"Kategorija: **{kategorija}**")
+        values = ref.lookup(kategorija)
+        st.write(values or "_(nerasta reikšmių)_")
+        nauja_reiksme = st.text_input("Pridėti naują reikšmę")
+        if st.button("➕ Pridėti reikšmę"):
+            if nauja_reiksme:
+                try:
+                    db.execute(
+                        "INSERT INTO lookup(kategorija, reiksme) VALUES(?, ?)",
+                        (kategorija, nauja_reiksme)
+                    )
+                    st.success(f"✅ Pridėta: {nauja_reiksme}")
+                except sqlite3.IntegrityError:
+                    st.warning("⚠️ Toks elementas jau egzistuoja.")
+        istr = st.selectbox("Ištrinti reikšmę", [""] + values)
+        if st.button("🗑 Ištrinti reikšmę"):
+            if istr:
+                db.execute(
+                    "DELETE FROM lookup WHERE kategorija = ? AND reiksme = ?",
+                    (kategorija, istr)
+                )
+                st.success(f"✅ Ištrinta: {istr}")
+    else:
+        st.info("Pasirink arba sukurk kategoriją, kad valdytum reikšmes.")
+
+    prof.mark("miestai")
+    st.markdown("---")
+    with st.expander("🌍 Miestų koordinatės (atstumų skaičiavimui)"):
+        with st.form("miestu_forma", clear_on_submit=True):
+            c1, c2, c3, c4 = st.columns(4)
+            salis = c1.text_input("Šalis (pvz. LT)")
+            miestas = c2.text_input("Miestas")
+            platuma = c3.number_input("Platuma", -90.0, 90.0, 0.0, format="%.4f")
+            ilguma = c4.number_input("Ilguma", -180.0, 180.0, 0.0, format="%.4f")
+            sb = st.form_submit_button("💾 Išsaugoti miestą")
+        if sb:
+            if not salis or not miestas:
+                st.warning("⚠️ Šalis ir miestas būtini.")
+            else:
+                db.transaction(lambda conn: distances.save_cities(conn, [(salis, miestas, platuma, ilguma)]),
+                               tables=["miestai", "atstumai"])
+                st.success(f"✅ Išsaugojau: {miestas}")
+        st.dataframe(db.query_df("SELECT salis, miestas, platuma, ilguma FROM miestai ORDER BY salis, miestas"),
+                     use_container_width=True, hide_index=True)
@@ -0,0 +1,41 @@
+import streamlit as st
+
+import tech_apziura
+from export import export_panel
+
+
+# ─── PRIEKABOS ─────────────────────────────────────────────────────────────
+def render(db, ref, prof):
+    st.title("DISPO – Priekabų valdymas")
+    prof.mark("forma")
+    with st.form("priek_form", clear_on_submit=True):
+        tipai = ref.lookup("priekabu_tipas")
+        pr_tipas = st.selectbox("Tipas", tipai) if tipai else st.text_input("Tipas")
+        num = st.text_input("Numeris")
+        mr = st.text_input("Markė")
+        pm = st.text_input("Pagaminimo metai")
+        ta = st.date_input("Tech. apžiūra")
+        pv = st.text_input("Priskirtas vilkikas")
+        sb = st.form_submit_button("💾 Išsaugoti")
+    if sb:
+        if not num: st.warning("⚠️ Įveskite numerį.")
+        else:
+            try:
+                db.execute("""
+                    INSERT INTO priekabos (
+                        priekabu_tipas, numeris, marke,
+                        pagaminimo_metai, tech_apziura, priskirtas_vilkikas
+                    ) VALUES (?,?,?,?,?,?)
+                """, (pr_tipas, num, mr, int(pm or 0), str(ta), pv))
+                st.success("✅ Išsaugojau.")
+            except Exception as e:
+                st.error(f"❌ Klaida: {e}")
+    prof.mark("lentelė")
+    df_priekabos = db.query_df("SELECT * FROM priekabos")
+    df_priekabos["🛠 TA liko (d.)"] = tech_apziura.days_left(df_priekabos["tech_apziura"])
+    df_priekabos["TA Įspėjimas"] = tech_apziura.warning(df_priekabos["🛠 TA liko (d.)"])
+    st.dataframe(df_priekabos)
+    prof.mark("TA")
+    tech_apziura.ta_panel(db, ref, "priekabos")
+    prof.mark("eksportas")
+    export_panel(db, "priekabos")
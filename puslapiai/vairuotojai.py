@@ -0,0 +1,26 @@
+import streamlit as st
+
+
+# ─── VAIRUOTOJAI ─────────────────────────────────────────────────────────────
+def render(db, ref, prof):
+    st.title("DISPO – Vairuotojai")
+    prof.mark("forma")
+    with st.form("drv_form", clear_on_submit=True):
+        vd = st.text_input("Vardas"); pv = st.text_input("Pavardė")
+        gm = st.text_input("Gimimo metai"); tt = st.text_input("Tautybė")
+        pvk = st.text_input("Priskirtas vilkikas")
+        sb = st.form_submit_button("💾 Išsaugoti")
+    if sb:
+        if not vd or not pv: st.warning("⚠️ Reikia vardo ir pavardės.")
+        else:
+            try:
+                db.execute("""
+                    INSERT INTO vairuotojai (
+                        vardas,pavarde,gimimo_metai,tautybe,priskirtas_vilkikas
+                    ) VALUES(?,?,?,?,?)
+                """, (vd,pv,int(gm or 0),tt,pvk))
+                st.success("✅ Išsaugojau.")
+            except Exception as e:
+                st.error(f"❌ Klaida: {e}")
+    prof.mark("lentelė")
+    st.dataframe(db.query_df("SELECT * FROM vairuotojai"))
@@ -0,0 +1,44 @@
+import streamlit as st
+
+import tech_apziura
+from export import export_panel
+
+
+# ─── VILKIKAI ────────────────────────────────────────────────────────────────
+def render(db, ref, prof):
+    st.title("DISPO – Vilkikų valdymas")
+    prof.mark("forma")
+    with st.form("vilkikai_forma", clear_on_submit=True):
+        numeris = st.text_input("Numeris")
+        marks = ref.lookup("vilkiku_marke")
+        marke = st.selectbox("Markė", marks) if marks else st.text_input("Markė")
+        pag_metai = st.text_input("Pagaminimo metai")
+        tech_apz = st.date_input("Tech. apžiūra")
+        vadyb = st.text_input("Vadybininkas")
+        vair = st.text_input("Vairuotojai (kableliai)")
+        priek = st.text_input("Priekaba")
+        sub = st.form_submit_button("💾 Įrašyti vilkiką")
+    if sub:
+        if not numeris:
+            st.warning("⚠️ Įveskite numerį.")
+        else:
+            try:
+                db.execute("""
+                    INSERT INTO vilkikai (
+                        numeris, marke, pagaminimo_metai, tech_apziura,
+                        vadybininkas, vairuotojai, priekaba
+                    ) VALUES (?,?,?,?,?,?,?)
+                """, (numeris, marke, int(pag_metai or 0), str(tech_apz),
+                      vadyb, vair, priek))
+                st.success("✅ Išsaugojau.")
+            except Exception as e:
+                st.error(f"❌ Klaida: {e}")
+    prof.mark("lentelė")
+    df_vilkikai = db.query_df("SELECT * FROM vilkikai")
+    df_vilkikai["🛠 TA liko (d.)"] = tech_apziura.days_left(df_vilkikai["tech_apziura"])
+    df_vilkikai["TA Įspėjimas"] = tech_apziura.warning(df_vilkikai["🛠 TA liko (d.)"])
+    st.dataframe(df_vilkikai)
+    prof.mark("TA")
+    tech_apziura.ta_panel(db, ref, "vilkikai")
+    prof.mark("eksportas")
+    export_panel(db, "vilkikai")
@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 512
+
+
+class ReferenceCache:
+    """Procesui bendras žinynų (dropdown sąrašų) podėlis.
+
+    Kiekviena lentelė turi versijos skaitiklį; Database praneša apie
+    pakeistas lenteles po COMMIT, skaitiklis padidinamas ir kitas
+    kreipimasis duomenis perskaito. Kol niekas nesikeitė – DB nekviečiama.
+    Pasenę įrašai išmetami iškart po pakeitimo, o įrašų skaičius ribojamas
+    max_entries (seniausiai naudoti išmetami pirmi).
+    """
+
+    def __init__(self, db, max_entries=MAX_ENTRIES):
+        self.db = db
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._data = OrderedDict()
+        db.add_listener(self.bump)
+
+    def version(self, table):
+        return self._versions.get(table, 0)
+
+    def bump(self, tables):
+        tables = set(tables)
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            stale = [k for k in self._data
+                     if not tables.isdisjoint(k[0] if isinstance(k[0], tuple) else (k[0],))]
+            for k in stale:
+                del self._data[k]
+
+    def cached(self, table, key, loader):
+        """table – lentelė arba jų tuple, jei reikšmė priklauso nuo kelių."""
+        tables = table if isinstance(table, tuple) else (table,)
+        version = tuple(self.version(t) for t in tables)
+        with self._lock:
+            hit = self._data.get((table, key))
+            if hit is not None and hit[0] == version:
+                self._data.move_to_end((table, key))
+                return hit[1]
+        value = loader()
+        with self._lock:
+            self._data[(table, key)] = (version, value)
+            self._data.move_to_end((table, key))
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return value
+
+    # ─── Žinynai ──────────────────────────────────────────────────────────────
+    def lookup(self, kategorija):
+        return self.cached("lookup", kategorija, lambda: [r[0] for r in self.db.query(
+            "SELECT reiksme FROM lookup WHERE kategorija = ?", (kategorija,)
+        )])
+
+    def lookup_categories(self):
+        return self.cached("lookup", None, lambda: [r[0] for r in self.db.query(
+            "SELECT DISTINCT kategorija FROM lookup"
+        )])
+
+    def klientai(self):
+        return self.cached("klientai", "pavadinimas", lambda: [r[0] for r in self.db.query(
+            "SELECT pavadinimas FROM klientai"
+        )])
+
+    def vilkikai(self):
+        return list(self.truck_trailers())
+
+    def truck_trailers(self):
+        """Vilkiko numeris -> priekaba (tuščia eilutė, jei nepriskirta)."""
+        return self.cached("vilkikai", "priekaba", lambda: {
+            numeris: priekaba or "" for numeris, priekaba in self.db.query(
+                "SELECT numeris, priekaba FROM vilkikai"
+            )
+        })
+
+    def grupes(self):
+        return self.cached("grupes", None, lambda: self.db.query(
+            "SELECT id, numeris, pavadinimas FROM grupes"
+        ))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_reference_cache(db):
+    global _cache
+    with _cache_lock:
+        if _cache is None or _cache.db is not db:
+            _cache = ReferenceCache(db)
+        return _cache
@@ -0,0 +1,169 @@
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+import cargo
+import search
+from db import DB_PATH, Database
+from migrations import migrate
+
+# ─── Sintetinių duomenų generatorius (apkrovos testams) ───────────────────────
+MIESTAI = [
+    ("LT", "Vilnius"), ("LT", "Kaunas"), ("LT", "Klaipėda"), ("LT", "Šiauliai"),
+    ("LT", "Panevėžys"), ("LV", "Riga"), ("EE", "Tallinn"), ("PL", "Warszawa"),
+    ("PL", "Poznan"), ("PL", "Łódź"), ("DE", "Berlin"), ("DE", "Hamburg"),
+    ("DE", "München"), ("NL", "Rotterdam"), ("BE", "Antwerpen"), ("FR", "Paris"),
+    ("FR", "Lyon"), ("IT", "Milano"), ("CZ", "Praha"), ("SE", "Göteborg"),
+]
+LOOKUPS = {
+    "busena": ["suplanuotas", "nesuplanuotas", "pakrautas", "iškrautas"],
+    "vilkiku_marke": ["Volvo", "Scania", "DAF", "MAN", "Mercedes-Benz"],
+    "priekabu_tipas": ["Tentinė", "Šaldytuvas", "Platforma", "Konteineriovežis"],
+    "pareigybe": ["Ekspeditorius", "Transporto vadybininkas", "Vadovas"],
+}
+VARDAI = ["Tomas", "Jonas", "Greta", "Laura", "Andrius", "Rūta", "Mantas", "Eglė"]
+PAVARDES = ["Kairys", "Petrauskas", "Mickus", "Jankauskas", "Žukauskas", "Kazlauskas"]
+CHUNK = 50000
+
+
+def _pick(rng, seq, n):
+    return np.asarray(seq, dtype=object)[rng.integers(0, len(seq), n)]
+
+
+def _dates(offsets):
+    # Datos nuo šiandien, 'YYYY-MM-DD'
+    return (pd.Timestamp(date.today()) + pd.to_timedelta(offsets, unit="D")).strftime("%Y-%m-%d").tolist()
+
+
+def _plates(prefix, n):
+    return [f"{prefix}{i:05d}" for i in range(n)]
+
+
+def generate(db, vilkikai=1500, priekabos=1600, vairuotojai=3000, klientai=500,
+             kroviniai=100000, dienos=365, seed=42, progress=None):
+    rng = np.random.default_rng(seed)
+    migrate(db)
+
+    def fill(conn):
+        with search.deferred_index(conn, ["klientai", "priekabos", "vilkikai", "vairuotojai"]):
+            fill_tables(conn)
+
+    def fill_tables(conn):
+        conn.executemany(
+            "INSERT OR IGNORE INTO lookup(kategorija, reiksme) VALUES(?, ?)",
+            [(k, v) for k, vals in LOOKUPS.items() for v in vals],
+        )
+        grupes = [(f"G{i}", f"Grupė {i}", "") for i in range(1, 6)]
+        conn.executemany(
+            "INSERT OR IGNORE INTO grupes(numeris, pavadinimas, aprasymas) VALUES(?,?,?)", grupes)
+        conn.executemany(
+            "INSERT INTO darbuotojai(vardas, pavarde, pareigybe, el_pastas, telefonas, grupe) "
+            "VALUES(?,?,?,?,?,?)",
+            zip(_pick(rng, VARDAI, 40), _pick(rng, PAVARDES, 40),
+                _pick(rng, LOOKUPS["pareigybe"], 40), [""] * 40, [""] * 40,
+                _pick(rng, [g[1] for g in grupes], 40)),
+        )
+        miestai = [MIESTAI[i] for i in rng.integers(0, len(MIESTAI), klientai)]
+        conn.executemany(
+            "INSERT INTO klientai(pavadinimas, kontaktai, salis, miestas, regionas, vat_numeris) "
+            "VALUES(?,?,?,?,?,?)",
+            [(f"Klientas {i:05d} UAB", "", s, m, "", f"LT{i:09d}") for i, (s, m) in enumerate(miestai)],
+        )
+        p_nr = _plates("PR", priekabos)
+        ta_p = _dates(rng.integers(-30, 365, priekabos))
+        conn.executemany(
+            "INSERT OR IGNORE INTO priekabos(priekabu_tipas, numeris, marke, pagaminimo_metai, "
+            "tech_apziura, priskirtas_vilkikas) VALUES(?,?,?,?,?,?)",
+            zip(_pick(rng, LOOKUPS["priekabu_tipas"], priekabos), p_nr,
+                _pick(rng, ["Krone", "Schmitz", "Kögel"], priekabos),
+                rng.integers(2010, 2025, priekabos).tolist(),
+                ta_p,
+                [f"VK{i:05d}" if i < vilkikai else "" for i in range(priekabos)]),
+        )
+        v_nr = _plates("VK", vilkikai)
+        ta_v = _dates(rng.integers(-30, 365, vilkikai))
+        vair = [", ".join(_pick(rng, VARDAI, k)) for k in rng.integers(1, 3, vilkikai)]
+        conn.executemany(
+            "INSERT OR IGNORE INTO vilkikai(numeris, marke, pagaminimo_metai, tech_apziura, "
+            "vadybininkas, vairuotojai, priekaba) VALUES(?,?,?,?,?,?,?)",
+            zip(v_nr, _pick(rng, LOOKUPS["vilkiku_marke"], vilkikai),
+                rng.integers(2012, 2025, vilkikai).tolist(), ta_v,
+                _pick(rng, VARDAI, vilkikai), vair,
+                [p_nr[i] if i < priekabos else "" for i in range(vilkikai)]),
+        )
+        conn.executemany(
+            "INSERT INTO vairuotojai(vardas, pavarde, gimimo_metai, tautybe, priskirtas_vilkikas) "
+            "VALUES(?,?,?,?,?)",
+            zip(_pick(rng, VARDAI, vairuotojai), _pick(rng, PAVARDES, vairuotojai),
+                rng.integers(1960, 2000, vairuotojai).tolist(), ["LT"] * vairuotojai,
+                [v_nr[i % vilkikai] for i in range(vairuotojai)]),
+        )
+
+    db.transaction(fill, tables=["lookup", "grupes", "darbuotojai", "klientai",
+                                 "priekabos", "vilkikai", "vairuotojai"])
+
+    # Kroviniai – dalimis, per tą patį kelią kaip masinis importas
+    start = date.today() - timedelta(days=dienos)
+    v_nr = np.asarray(_plates("VK", vilkikai), dtype=object)
+    p_nr = np.asarray([f"PR{i:05d}" if i < priekabos else "" for i in range(vilkikai)], dtype=object)
+    miestai = np.asarray(MIESTAI, dtype=object)
+    irasyta = 0
+    while irasyta < kroviniai:
+        n = min(CHUNK, kroviniai - irasyta)
+        trucks = rng.integers(0, vilkikai, n)
+        pak = pd.to_datetime(start) + pd.to_timedelta(rng.integers(0, dienos + 30, n), unit="D")
+        isk = pak + pd.to_timedelta(rng.integers(0, 4, n), unit="D")
+        a, b = rng.integers(0, len(MIESTAI), n), rng.integers(0, len(MIESTAI), n)
+        frame = pd.DataFrame({
+            "klientas": [f"Klientas {i:05d} UAB" for i in rng.integers(0, klientai, n)],
+            "uzsakymo_numeris": [f"U{i:07d}" for i in rng.integers(0, kroviniai, n)],
+            "pakrovimo_numeris": "",
+            "pakrovimo_data": pak.strftime("%Y-%m-%d"),
+            "pakrovimo_laikas_nuo": "08:00:00", "pakrovimo_laikas_iki": "16:00:00",
+            "iskrovimo_data": isk.strftime("%Y-%m-%d"),
+            "iskrovimo_laikas_nuo": "08:00:00", "iskrovimo_laikas_iki": "17:00:00",
+            "pakrovimo_salis": miestai[a, 0], "pakrovimo_miestas": miestai[a, 1],
+            "iskrovimo_salis": miestai[b, 0], "iskrovimo_miestas": miestai[b, 1],
+            "vilkikas": v_nr[trucks], "priekaba": p_nr[trucks],
+            "atsakingas_vadybininkas": [f"vadyb_{v.lower()}" for v in v_nr[trucks]],
+            "kilometrai": rng.integers(50, 2500, n),
+            "frachtas": np.round(rng.uniform(300, 4000, n), 2),
+            "svoris": rng.integers(500, 24000, n),
+            "paleciu_skaicius": rng.integers(1, 34, n),
+            "busena": _pick(rng, LOOKUPS["busena"], n),
+        })
+        irasyta += db.transaction(lambda conn: cargo.insert_many(conn, frame),
+                                  tables=["kroviniai", "kpi"])
+        if progress:
+            progress(irasyta)
+    return irasyta
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="DISPO sintetinių duomenų generatorius")
+    p.add_argument("--db", default=DB_PATH)
+    p.add_argument("--vilkikai", type=int, default=1500)
+    p.add_argument("--priekabos", type=int, default=1600)
+    p.add_argument("--vairuotojai", type=int, default=3000)
+    p.add_argument("--klientai", type=int, default=500)
+    p.add_argument("--kroviniai", type=int, default=100000)
+    p.add_argument("--dienos", type=int, default=365, help="istorijos ilgis dienomis")
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args(argv)
+
+    db = Database(args.db, readers=1)
+    t0 = time.perf_counter()
+    try:
+        n = generate(db, args.vilkikai, args.priekabos, args.vairuotojai, args.klientai,
+                     args.kroviniai, args.dienos, args.seed,
+                     progress=lambda i: print(f"  kroviniai: {i}", flush=True))
+    finally:
+        db.close()
+    print(f"Sugeneruota krovinių: {n} per {time.perf_counter() - t0:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# ─── Techninės apžiūros (TA) galiojimo stebėjimas: vilkikai ir priekabos ──────
+HORIZON_DAYS = 30
+
+# tech_apziura – galiojimo pabaigos data 'YYYY-MM-DD'; pagal indeksą imami tik
+# vienetai, kurių TA baigiasi iki ribos (įskaitant jau pasibaigusias)
+DUE_SQL = """
+    SELECT 'Vilkikas' AS tipas, numeris, tech_apziura,
+           CAST(julianday(tech_apziura) - julianday(:siandien) AS INTEGER) AS liko_d
+    FROM vilkikai
+    WHERE tech_apziura > '' AND tech_apziura <= :riba
+      AND julianday(tech_apziura) IS NOT NULL
+    UNION ALL
+    SELECT 'Priekaba', numeris, tech_apziura,
+           CAST(julianday(tech_apziura) - julianday(:siandien) AS INTEGER)
+    FROM priekabos
+    WHERE tech_apziura > '' AND tech_apziura <= :riba
+      AND julianday(tech_apziura) IS NOT NULL
+    ORDER BY liko_d, numeris
+"""
+
+
+def due(db, ref, horizon=HORIZON_DAYS, today=None):
+    """Vienetai, kurių TA baigiasi per horizon dienų; podėlyje iki datos ar parko pakeitimo."""
+    today = today or date.today()
+    riba = str(today + timedelta(days=horizon))
+    return ref.cached(("vilkikai", "priekabos"), ("ta", str(today), horizon), lambda: db.query_df(
+        DUE_SQL, {"siandien": str(today), "riba": riba}
+    ))
+
+
+def days_left(tech_apziura, today=None):
+    """Vektoriškai: dienos iki TA pabaigos (NaN – data nežinoma)."""
+    today = pd.Timestamp(today or date.today())
+    return (pd.to_datetime(tech_apziura, errors="coerce", format="%Y-%m-%d") - today).dt.days
+
+
+def warning(liko, horizon=HORIZON_DAYS):
+    liko = np.asarray(liko, dtype="float64")
+    return np.where(liko < 0, "❌ Pasibaigusi", np.where(liko <= horizon, "⚠️ Baigiasi", ""))
+
+
+def truck_days(ta, vilkikai, priekabos):
+    """Vilkiko eilutei – mažiausias likęs dienų sk. iš vilkiko ir jo priekabos."""
+    liko = ta.set_index(["tipas", "numeris"])["liko_d"]
+    v = pd.Series(vilkikai).map(liko.get("Vilkikas", pd.Series(dtype="float64")))
+    p = pd.Series(priekabos).map(liko.get("Priekaba", pd.Series(dtype="float64")))
+    return np.fmin(v.to_numpy(dtype="float64"), p.to_numpy(dtype="float64"))
+
+
+# ─── Streamlit skydelis ───────────────────────────────────────────────────────
+def ta_panel(db, ref, key):
+    """Rodo vienetus su artėjančia TA; grąžina (lentelė, horizontas)."""
+    import streamlit as st
+    with st.expander("🛠 Techninės apžiūros galiojimas"):
+        horizon = st.number_input("Rodyti, kai liko ne daugiau dienų", 0, 365,
+                                  HORIZON_DAYS, key=f"ta_horizontas_{key}")
+        ta = due(db, ref, int(horizon))
+        c1, c2 = st.columns(2)
+        c1.metric("Pasibaigusios", int((ta["liko_d"] < 0).sum()))
+        c2.metric(f"Baigiasi per {int(horizon)} d.", int((ta["liko_d"] >= 0).sum()))
+        if len(ta):
+            st.dataframe(ta.assign(ispejimas=warning(ta["liko_d"], horizon)),
+                         use_container_width=True, hide_index=True)
+    return ta, int(horizon)
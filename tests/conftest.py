@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import migrations  # noqa: E402
+from db import Database  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Tuščia laikina bazė su visa schema."""
+    database = Database(str(tmp_path / "dispo.db"), readers=4)
+    migrations.migrate(database)
+    yield database
+    database.close()
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+import cargo_import
+
+TRAILERS = {"VK001": "PR001"}
+
+
+def _eilute(**laukai):
+    row = {"klientas": "Klientas", "uzsakymo_numeris": "ORD1",
+           "pakrovimo_data": "2026-01-05", "iskrovimo_data": "2026-01-06", "vilkikas": "VK001"}
+    return {**row, **laukai}
+
+
+def _validate(*rows):
+    chunk = pd.DataFrame(list(rows), dtype=str).fillna("")
+    chunk.index = pd.RangeIndex(2, 2 + len(chunk), name="eilute")
+    return cargo_import.validate(chunk, TRAILERS)
+
+
+def test_valid_row_is_normalized():
+    good, rejected = _validate(_eilute(
+        klientas="  Klientas  ", pakrovimo_data="2026.01.05", iskrovimo_data="2026-01-06 00:00:00",
+        pakrovimo_laikas_nuo="7:30", frachtas="1200,50", kilometrai="850",
+        svoris="", busena=""))
+    assert rejected.empty
+    r = good.iloc[0]
+    assert r["klientas"] == "Klientas"
+    assert (r["pakrovimo_data"], r["iskrovimo_data"]) == ("2026-01-05", "2026-01-06")
+    assert r["pakrovimo_laikas_nuo"] == "07:30:00"
+    assert r["pakrovimo_laikas_iki"] == cargo_import.TIME_DEFAULTS["pakrovimo_laikas_iki"]
+    assert (r["frachtas"], r["kilometrai"], r["svoris"]) == (1200.5, 850, 0)
+    assert good["kilometrai"].dtype == "int64" and good["frachtas"].dtype == "float64"
+    # Kaip formoje: priekaba pagal vilkiką, vadybininkas ir būsena – numatytieji
+    assert r["priekaba"] == "PR001"
+    assert r["atsakingas_vadybininkas"] == "vadyb_vk001"
+    assert r["busena"] == cargo_import.DEFAULT_BUSENA
+
+
+def test_explicit_values_are_kept():
+    good, _ = _validate(_eilute(priekaba="PR777", atsakingas_vadybininkas="jonas",
+                                busena="suplanuotas", vilkikas="VK404"))
+    r = good.iloc[0]
+    assert (r["priekaba"], r["atsakingas_vadybininkas"], r["busena"]) == ("PR777", "jonas", "suplanuotas")
+    good, _ = _validate(_eilute(vilkikas="VK404"))
+    assert good.iloc[0]["priekaba"] == ""
+
+
+@pytest.mark.parametrize("laukai, klaida", [
+    ({"klientas": ""}, "Privalomi laukai: Klientas ir Užsakymo numeris"),
+    ({"uzsakymo_numeris": "   "}, "Privalomi laukai: Klientas ir Užsakymo numeris"),
+    ({"pakrovimo_data": "05/01/2026"}, "Neteisinga data (laukiama YYYY-MM-DD)"),
+    ({"iskrovimo_data": "2026-02-30"}, "Neteisinga data (laukiama YYYY-MM-DD)"),
+    ({"iskrovimo_data": ""}, "Neteisinga data (laukiama YYYY-MM-DD)"),
+    ({"iskrovimo_data": "2026-01-04"}, "Pakrovimo data negali būti vėlesnė už iškrovimo datą"),
+    ({"iskrovimo_laikas_iki": "25:99"}, "Neteisingas laikas: iskrovimo_laikas_iki"),
+    ({"kilometrai": "12,5"}, "Neteisingas skaičius: kilometrai"),
+    ({"paleciu_skaicius": "daug"}, "Neteisingas skaičius: paleciu_skaicius"),
+    ({"frachtas": "1.2.3"}, "Neteisingas skaičius: frachtas"),
+    # Kelios klaidos – pranešama pirmoji
+    ({"klientas": "", "pakrovimo_data": "x", "kilometrai": "x"},
+     "Privalomi laukai: Klientas ir Užsakymo numeris"),
+])
+def test_invalid_row_is_rejected_with_reason(laukai, klaida):
+    good, rejected = _validate(_eilute(uzsakymo_numeris="GERAS"), _eilute(**laukai))
+    assert good["uzsakymo_numeris"].tolist() == ["GERAS"]
+    assert rejected.index.tolist() == [3]
+    assert rejected.columns[0] == "klaida"
+    assert rejected["klaida"].tolist() == [klaida]
+    # Ataskaitoje – originalios (nenormalizuotos) reikšmės
+    assert rejected.iloc[0]["klientas"] == _eilute(**laukai)["klientas"]
@@ -0,0 +1,115 @@
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import cargo
+import conflicts
+
+PRADZIA = date(2026, 1, 1)
+
+
+def _atsitiktiniai(n, seed=3):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        pak = PRADZIA + timedelta(days=rng.randrange(60))
+        rows.append({
+            "klientas": "Klientas", "uzsakymo_numeris": f"ORD{i}",
+            "pakrovimo_data": str(pak), "iskrovimo_data": str(pak + timedelta(days=rng.choice([0, 0, 1, 2, 3, 6]))),
+            "vilkikas": rng.choice(["VK1", "VK2", "VK3", "VK4", ""]),
+            "priekaba": rng.choice(["PR1", "PR2", "PR3", ""]),
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def kroviniai(db):
+    frame = _atsitiktiniai(300).reindex(columns=cargo.FIELDS)
+    db.transaction(lambda conn: cargo.insert_many(conn, frame), tables=["kroviniai", "kpi"])
+    return db.query_df("SELECT id, vilkikas, priekaba, pakrovimo_data, iskrovimo_data FROM kroviniai")
+
+
+def _persidengia(a_pak, a_isk, b_pak, b_isk):
+    # Griežtai: bendra kraštinė diena (iškrauti ir pakrauti tą pačią dieną) – ne konfliktas
+    return a_pak < b_isk and b_pak < a_isk
+
+
+def _brute_find(kroviniai, values, exclude_id=None):
+    out = set()
+    for r in kroviniai.itertuples():
+        for col, label in conflicts.UNITS.items():
+            if (values.get(col) and getattr(r, col) == values[col] and r.id != exclude_id
+                    and _persidengia(r.pakrovimo_data, r.iskrovimo_data,
+                                     values["pakrovimo_data"], values["iskrovimo_data"])):
+                out.add((label, r.id))
+    return out
+
+
+def test_find_matches_brute_force(db, kroviniai):
+    rng = random.Random(11)
+    with db.reader() as conn:
+        for _ in range(200):
+            pak = PRADZIA + timedelta(days=rng.randrange(-5, 65))
+            values = {"pakrovimo_data": str(pak),
+                      "iskrovimo_data": str(pak + timedelta(days=rng.randrange(5))),
+                      "vilkikas": rng.choice(["VK1", "VK3", "", None]),
+                      "priekaba": rng.choice(["PR2", ""])}
+            exclude = int(kroviniai["id"].sample(random_state=rng.randrange(1000)).iloc[0])
+            for ex in (None, exclude):
+                found = conflicts.find(conn, values, ex)
+                got = set(zip(found.get("tipas", []), found.get("id", [])))
+                assert got == _brute_find(kroviniai, values, ex)
+
+
+def test_check_raises_and_save_writes_nothing(db, kroviniai):
+    r = kroviniai[(kroviniai["vilkikas"] == "VK2")
+                  & (kroviniai["iskrovimo_data"] > kroviniai["pakrovimo_data"])].iloc[0]
+    values = {"klientas": "Naujas", "uzsakymo_numeris": "NAUJAS", "vilkikas": "VK2",
+              "pakrovimo_data": r["pakrovimo_data"], "iskrovimo_data": r["iskrovimo_data"]}
+    with pytest.raises(conflicts.ConflictError) as e:
+        cargo.save(db, values, check_conflicts=True)
+    assert r["id"] in set(e.value.conflicts["id"])
+    assert db.query("SELECT COUNT(*) FROM kroviniai WHERE uzsakymo_numeris = 'NAUJAS'")[0][0] == 0
+    # Be persidengimų – įrašoma
+    values.update(vilkikas="VK-LAISVAS", pakrovimo_data="2027-01-01", iskrovimo_data="2027-01-02")
+    with db.reader() as conn:
+        conflicts.check(conn, values)
+    assert cargo.save(db, values, check_conflicts=True)[1] == "NAUJAS"
+
+
+def _raktas(r):
+    return (r.pakrovimo_data, r.iskrovimo_data, r.id)
+
+
+def _brute_report(kroviniai, nuo, iki):
+    lange = kroviniai[(kroviniai["pakrovimo_data"] <= str(iki))
+                      & (kroviniai["iskrovimo_data"] >= str(nuo))]
+    out = set()
+    for col, label in conflicts.UNITS.items():
+        eil = [r for r in lange.itertuples() if getattr(r, col)]
+        for b in eil:
+            # Pranešamas vėlesnis (pagal pakrovimą, iškrovimą, id) iš persidengiančios poros
+            if any(getattr(a, col) == getattr(b, col) and _raktas(a) < _raktas(b)
+                   and _persidengia(a.pakrovimo_data, a.iskrovimo_data, b.pakrovimo_data, b.iskrovimo_data)
+                   for a in eil):
+                out.add((label, b.id))
+    return out
+
+
+@pytest.mark.parametrize("nuo, iki", [
+    (PRADZIA - timedelta(days=10), PRADZIA + timedelta(days=80)),
+    (PRADZIA + timedelta(days=20), PRADZIA + timedelta(days=27)),
+    (PRADZIA + timedelta(days=33), PRADZIA + timedelta(days=33)),
+])
+def test_report_matches_brute_force(db, kroviniai, nuo, iki):
+    df = conflicts.report(db, nuo, iki)
+    assert set(zip(df["tipas"], df["id"])) == _brute_report(kroviniai, nuo, iki)
+    # persidengia_su_id – iš tiesų persidengiantis to paties vieneto krovinys
+    by_id = kroviniai.set_index("id")
+    col = {label: c for c, label in conflicts.UNITS.items()}
+    for r in df.itertuples():
+        a, b = by_id.loc[r.persidengia_su_id], by_id.loc[r.id]
+        assert a[col[r.tipas]] == b[col[r.tipas]]
+        assert _persidengia(a.pakrovimo_data, a.iskrovimo_data, b.pakrovimo_data, b.iskrovimo_data)
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from db import Database
+
+RASYTOJAI = 8
+SKAITYTOJAI = 8
+IRASAI = 200
+
+
+@pytest.fixture
+def plain_db(tmp_path):
+    database = Database(str(tmp_path / "concurrency.db"), readers=4, batch_size=32)
+    database.transaction(lambda conn: conn.execute(
+        "CREATE TABLE irasai (id INTEGER PRIMARY KEY, gija INTEGER, nr INTEGER)"))
+    yield database
+    database.close()
+
+
+def test_parallel_reads_and_writes(plain_db):
+    db = plain_db
+    klaidos = []
+    baigta = threading.Event()
+
+    def rasytojas(gija):
+        try:
+            futures = []
+            for nr in range(IRASAI):
+                sql, params = "INSERT INTO irasai(gija, nr) VALUES(?, ?)", (gija, nr)
+                if nr % 2:
+                    futures.append(db.submit(lambda conn, p=params: conn.execute(sql, p)))
+                else:
+                    db.transaction(lambda conn, p=params: conn.execute(sql, p))
+            for fut in futures:
+                fut.result()
+        except Exception as e:
+            klaidos.append(e)
+
+    def skaitytojas():
+        try:
+            pries = 0
+            while not baigta.is_set():
+                kiek = db.query_one("SELECT COUNT(*) FROM irasai")[0]
+                assert kiek >= pries
+                pries = kiek
+                db.query("SELECT gija, MAX(nr) FROM irasai GROUP BY gija")
+        except Exception as e:
+            klaidos.append(e)
+
+    skaitytojai = [threading.Thread(target=skaitytojas) for _ in range(SKAITYTOJAI)]
+    rasytojai = [threading.Thread(target=rasytojas, args=(g,)) for g in range(RASYTOJAI)]
+    for t in skaitytojai + rasytojai:
+        t.start()
+    for t in rasytojai:
+        t.join()
+    baigta.set()
+    for t in skaitytojai:
+        t.join()
+
+    assert not klaidos, klaidos  # be "database is locked" ir kitų klaidų
+    assert db.query_one("SELECT COUNT(*) FROM irasai")[0] == RASYTOJAI * IRASAI
+    per_gija = db.query("SELECT gija, COUNT(DISTINCT nr) FROM irasai GROUP BY gija ORDER BY gija")
+    assert per_gija == [(g, IRASAI) for g in range(RASYTOJAI)]
+
+
+def test_failed_job_does_not_undo_batch(plain_db):
+    db = plain_db
+    gera = db.submit(lambda conn: conn.execute("INSERT INTO irasai(gija, nr) VALUES(0, 0)"))
+    bloga = db.submit(lambda conn: conn.execute("INSERT INTO nera(x) VALUES(1)"))
+    assert gera.result() is not None
+    with pytest.raises(Exception):
+        bloga.result()
+    assert db.query_one("SELECT COUNT(*) FROM irasai")[0] == 1
+
+
+def test_writer_connect_error_is_raised(tmp_path):
+    with pytest.raises(Exception):
+        Database(str(tmp_path / "nera" / "x.db"))
@@ -0,0 +1,121 @@
+from datetime import date
+
+import pytest
+
+import cargo
+import dispo_edit
+import kpi
+from dispo_grid import DispoGrid
+
+PRADZIA = date(2026, 3, 9)
+
+
+@pytest.fixture
+def lentele(db):
+    db.transaction(lambda conn: conn.executemany(
+        "INSERT INTO vilkikai(numeris, vadybininkas) VALUES(?, ?)",
+        [("VK001", "Tomas"), ("VK002", "Greta")]), tables=["vilkikai"])
+    bendri = {"klientas": "Klientas", "pakrovimo_miestas": "Vilnius", "iskrovimo_miestas": "Lyon"}
+    ids = {
+        "A": cargo.save(db, {**bendri, "uzsakymo_numeris": "A", "vilkikas": "VK001",
+                             "pakrovimo_data": "2026-03-10", "iskrovimo_data": "2026-03-11",
+                             "frachtas": 1000.0, "kilometrai": 500})[0],
+        "B": cargo.save(db, {**bendri, "uzsakymo_numeris": "B", "vilkikas": "VK002",
+                             "pakrovimo_data": "2026-03-12", "iskrovimo_data": "2026-03-12"})[0],
+        "C": cargo.save(db, {**bendri, "uzsakymo_numeris": "C", "vilkikas": "VK002",
+                             "pakrovimo_data": "2026-03-12", "iskrovimo_data": "2026-03-13"})[0],
+    }
+    grid = DispoGrid()
+    grid.refresh(db, PRADZIA, 7)
+    return grid, ids
+
+
+# Eilutės: 0/1 – VK001 iškrovimas/pakrovimas, 2/3 – VK002
+PAKEITIMAI = [
+    (1, "2026-03-10 – Frachtas (EUR)", 1500.0),
+    (1, "2026-03-10 – Laikas nuo", "07:30"),
+    (0, "2026-03-11 – Vieta", "Paris"),
+    (0, "Trans. vadybininkas", "Jonas"),
+    (3, "2026-03-12 – Frachtas (EUR)", 10.0),     # du kroviniai langelyje
+    (1, "2026-03-13 – Vieta", "Kaunas"),          # langelyje nėra krovinio
+    (0, "2026-03-11 – Frachtas (EUR)", 5.0),      # iškrovimo eilutėje neredaguojama
+    (1, "2026-03-10 – Krauti km", -5.0),          # neigiama reikšmė
+]
+
+
+def _redaguota(grid):
+    before = grid.snapshot()[0]
+    after = before.copy()
+    for eil, col, v in PAKEITIMAI:
+        after.loc[eil, col] = v
+    return before, after
+
+
+def _planas(grid):
+    before, after = _redaguota(grid)
+    _, kroviniai, vilkikai = grid.snapshot()
+    return dispo_edit.plan(dispo_edit.diff(before, after), before, kroviniai, vilkikai)
+
+
+def test_diff_lists_only_changed_editable_cells(lentele):
+    grid, _ = lentele
+    before, after = _redaguota(grid)
+    after.loc[2, "Vilkiko nr."] = "NEREDAGUOJAMAS"
+    changes = dispo_edit.diff(before, after)
+    assert sorted(zip(changes["eilute"], changes["stulpelis"], changes["dabar"]),
+                  key=str) == sorted(PAKEITIMAI, key=str)
+    buvo = dict(zip(zip(changes["eilute"], changes["stulpelis"]), changes["buvo"]))
+    assert buvo[(1, "2026-03-10 – Frachtas (EUR)")] == 1000.0
+    assert buvo[(0, "Trans. vadybininkas")] == "Tomas"
+    assert dispo_edit.diff(before, before.copy()).empty
+
+
+def test_plan_maps_cells_and_skips_unsafe_ones(db, lentele):
+    grid, ids = lentele
+    kroviniu, vilkiku, praleisti = _planas(grid)
+    assert sorted(zip(kroviniu["id"], kroviniu["laukas"], kroviniu["reiksme"]), key=str) == sorted([
+        (ids["A"], "frachtas", 1500.0),
+        (ids["A"], "pakrovimo_laikas_nuo", "07:30:00"),
+        (ids["A"], "iskrovimo_miestas", "Paris"),
+    ], key=str)
+    assert set(kroviniu["versija"]) == {db.query("SELECT versija FROM kroviniai WHERE id = ?", (ids["A"],))[0][0]}
+    assert vilkiku[["numeris", "laukas", "reiksme"]].values.tolist() == [["VK001", "vadybininkas", "Jonas"]]
+    priezastys = dict(zip(praleisti["stulpelis"], praleisti["priezastis"]))
+    assert priezastys == {
+        "2026-03-12 – Frachtas (EUR)": "langelyje keli kroviniai – taisykite Kroviniuose",
+        "2026-03-13 – Vieta": "langelyje nėra krovinio",
+        "2026-03-11 – Frachtas (EUR)": "šioje eilutėje laukas neredaguojamas",
+        "2026-03-10 – Krauti km": "reikšmė negali būti neigiama",
+    }
+
+
+def _frachtas_viso(db):
+    return kpi.summary(db, "viso", date(2026, 3, 1), date(2026, 3, 31))["frachtas"].iloc[0]
+
+
+def test_save_writes_rows_bumps_versions_and_fixes_kpi(db, lentele):
+    grid, ids = lentele
+    kroviniu, vilkiku, _ = _planas(grid)
+    versija = kroviniu["versija"].iloc[0]
+    assert _frachtas_viso(db) == 1000.0
+    assert dispo_edit.save(db, kroviniu, vilkiku) == (1, 1)
+    row = db.query("SELECT frachtas, pakrovimo_laikas_nuo, iskrovimo_miestas, versija "
+                   "FROM kroviniai WHERE id = ?", (ids["A"],))[0]
+    assert tuple(row[:3]) == (1500.0, "07:30:00", "Paris")
+    assert row[3] > versija
+    assert db.query("SELECT vadybininkas FROM vilkikai WHERE numeris = 'VK001'")[0][0] == "Jonas"
+    assert _frachtas_viso(db) == 1500.0
+
+
+def test_save_rejects_stale_rows_and_writes_nothing(db, lentele):
+    grid, ids = lentele
+    kroviniu, vilkiku, _ = _planas(grid)
+    # Kitas naudotojas spėjo pakeisti krovinį A
+    db.transaction(lambda conn: conn.execute(
+        "UPDATE kroviniai SET klientas = 'Kitas' WHERE id = ?", (ids["A"],)), tables=["kroviniai"])
+    with pytest.raises(dispo_edit.StaleEditError) as e:
+        dispo_edit.save(db, kroviniu, vilkiku)
+    assert e.value.stale.values.tolist() == [["Krovinys", ids["A"]]]
+    assert db.query("SELECT frachtas FROM kroviniai WHERE id = ?", (ids["A"],))[0][0] == 1000.0
+    assert db.query("SELECT vadybininkas FROM vilkikai WHERE numeris = 'VK001'")[0][0] == "Tomas"
+    assert _frachtas_viso(db) == 1000.0
@@ -0,0 +1,31 @@
+from datetime import date
+
+import cargo
+from dispo_grid import DispoGrid
+
+PRADZIA = date(2026, 3, 9)
+DIENOS = 7
+
+
+def _krovinys(numeris, pak, isk, km=0):
+    return {"klientas": "Klientas", "uzsakymo_numeris": numeris, "vilkikas": "VK001",
+            "pakrovimo_data": pak, "iskrovimo_data": isk,
+            "pakrovimo_miestas": "Vilnius", "iskrovimo_miestas": "Lyon", "kilometrai": km}
+
+
+def test_cargo_spanning_window_is_loaded(db):
+    db.transaction(lambda conn: conn.execute("INSERT INTO vilkikai(numeris) VALUES('VK001')"))
+    ilgas = cargo.save(db, _krovinys("ILGAS", "2026-03-05", "2026-03-20", km=2400))[0]
+    cargo.save(db, _krovinys("ANKSTESNIS", "2026-02-20", "2026-03-01"))
+    pries_pat = cargo.save(db, _krovinys("PRIEŠ", "2026-03-02", "2026-03-09"))[0]
+    po = cargo.save(db, _krovinys("PO", "2026-03-15", "2026-03-21"))[0]
+    cargo.save(db, _krovinys("VĖLIAU", "2026-03-21", "2026-03-22"))
+
+    grid = DispoGrid()
+    lentele = grid.refresh(db, PRADZIA, DIENOS)
+    kroviniai = grid.snapshot()[1]
+    assert sorted(kroviniai["id"]) == sorted([ilgas, pries_pat, po])
+    # Ilgas krovinys be pakrovimo ar iškrovimo lange – vairavimas kiekvieną lango dieną
+    darbas = lentele.loc[lentele["Vilkiko nr."] == "VK001",
+                         [f"{d} – Bendras darbo laikas" for d in ("2026-03-10", "2026-03-14")]]
+    assert (darbas.max() > 0).all()
@@ -0,0 +1,40 @@
+import distances
+from reference_cache import ReferenceCache
+
+
+def _poros(db):
+    return {(r[0], r[1]) for r in db.query("SELECT is_raktas, i_raktas FROM atstumai")}
+
+
+def _issaugoti(db, cities):
+    return db.transaction(lambda conn: distances.save_cities(conn, cities), tables=["miestai", "atstumai"])
+
+
+def test_save_cities_drops_only_changed_pairs(db, monkeypatch):
+    monkeypatch.setattr(distances, "_engine", None)
+    engine = distances.get_engine(db, ReferenceCache(db))
+    engine.km(["lt|vilnius", "lt|vilnius", "lt|kaunas", "de|berlin"],
+              ["lt|kaunas", "pl|warszawa", "pl|warszawa", "lt|kaunas"])
+    db.transaction(lambda conn: None)  # palaukiama _store
+    pries = _poros(db)
+    assert len(pries) == 4 and engine._pairs == 4
+
+    # Tos pačios koordinatės (pvz. pataisytas rašymas) – podėlis nekeičiamas
+    (lat, lon), = db.query("SELECT platuma, ilguma FROM miestai WHERE raktas = 'lt|kaunas'")
+    assert _issaugoti(db, [("LT", "Kaunas", lat, lon)]) == 0
+    assert _poros(db) == pries and engine._pairs == 4
+
+    # Kauno koordinatės pakeistos – šalinamos tik poros su Kaunu (ir kitos šalies Kaunu)
+    db.transaction(lambda conn: conn.execute(
+        "INSERT INTO atstumai VALUES('xx|kaunas', 'lt|vilnius', 1, 0)"))
+    istrinta = _issaugoti(db, [("LT", "Kaunas", 54.0, 24.0)])
+    assert istrinta == 4
+    assert _poros(db) == {("lt|vilnius", "pl|warszawa")}
+    assert engine._pairs is None
+
+    # Naujas miestas irgi išmeta poras, kuriose jis buvo nežinomas / rastas be šalies
+    engine.km(["lt|vilnius"], ["lt|kaunas"])
+    db.transaction(lambda conn: None)
+    assert engine._pairs == 2
+    _issaugoti(db, [("LV", "Kaunas", 57.0, 25.0)])
+    assert _poros(db) == {("lt|vilnius", "pl|warszawa")}
@@ -0,0 +1,130 @@
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import cargo
+import kpi
+
+
+def _krovinys(numeris, pak, frachtas=100.0, km=200):
+    return {"klientas": "Klientas", "uzsakymo_numeris": numeris, "vilkikas": "VK001",
+            "pakrovimo_data": pak, "iskrovimo_data": pak, "frachtas": frachtas, "kilometrai": km}
+
+
+def test_weekly_timeline_uses_iso_weeks(db):
+    # 2025-12-29 (pirmadienis) – 2026-01-04 priklauso ISO savaitei 2026-W01
+    for i, pak in enumerate(["2025-12-28", "2025-12-29", "2026-01-01", "2026-01-04", "2026-01-05"]):
+        cargo.save(db, _krovinys(f"ORD{i}", pak))
+    df = kpi.timeline(db, date(2025, 12, 22), date(2026, 1, 11), "savaite")
+    assert df["laikotarpis"].tolist() == ["2025-W52", "2026-W01", "2026-W02"]
+    assert df["kroviniu_sk"].tolist() == [1, 3, 1]
+    assert df["frachtas"].tolist() == [100.0, 300.0, 100.0]
+
+
+# ─── apply(±) = rebuild ───────────────────────────────────────────────────────
+def _suvestines(db):
+    # Nulinės eilutės (viskas atimta) rebuild'e neatsiranda – praleidžiamos
+    out = {}
+    for dim in kpi.DIMENSIONS:
+        for level in kpi.LEVELS:
+            rows = db.query(f"SELECT * FROM {kpi.table_name(dim, level)}")
+            rows = [tuple(round(v, 6) if isinstance(v, float) else v for v in r) for r in rows]
+            n = len(kpi.MEASURES)
+            out[(dim, level)] = sorted(r for r in rows if any(r[-n:]))
+    return out
+
+
+def _rebuilt(db):
+    db.transaction(kpi.rebuild)
+    return _suvestines(db)
+
+
+def _pakeisti(db, ids, **laukai):
+    # Kaip dispo_edit.save / planner.accept: senas indėlis atimamas, naujas pridedamas
+    def run(conn):
+        sql = f"SELECT * FROM kroviniai WHERE id IN ({', '.join('?' for _ in ids)})"
+        kpi.apply(conn, pd.read_sql_query(sql, conn, params=ids), -1)
+        conn.executemany(
+            f"UPDATE kroviniai SET {', '.join(f'{k} = ?' for k in laukai)} WHERE id = ?",
+            [(*laukai.values(), i) for i in ids])
+        kpi.apply(conn, pd.read_sql_query(sql, conn, params=ids))
+    db.transaction(run, tables=["kroviniai", "kpi"])
+
+
+def _istrinti(db, ids):
+    def run(conn):
+        sql = f"SELECT * FROM kroviniai WHERE id IN ({', '.join('?' for _ in ids)})"
+        kpi.apply(conn, pd.read_sql_query(sql, conn, params=ids), -1)
+        conn.executemany("DELETE FROM kroviniai WHERE id = ?", [(i,) for i in ids])
+    db.transaction(run, tables=["kroviniai", "kpi"])
+
+
+def test_incremental_apply_matches_rebuild(db):
+    ids = [cargo.save(db, {**_krovinys(f"ORD{i}", f"2026-0{1 + i % 3}-{10 + i:02d}",
+                                       frachtas=100.5 + i, km=150 * i),
+                           "vilkikas": f"VK00{i % 2}", "atsakingas_vadybininkas": f"vadyb_{i % 3}"})[0]
+           for i in range(12)]
+    # Be vilkiko ir be pakrovimo datos (pastarasis į suvestines nepatenka)
+    ids.append(cargo.save(db, {**_krovinys("BE-VILKIKO", "2026-02-01"), "vilkikas": None})[0])
+    ids.append(cargo.save(db, _krovinys("BE-DATOS", ""))[0])
+    frame = pd.DataFrame([{**_krovinys(f"MAS{i}", "2026-03-31", frachtas=0.1 * i, km=i)}
+                          for i in range(20)]).reindex(columns=cargo.FIELDS)
+    db.transaction(lambda conn: cargo.insert_many(conn, frame), tables=["kroviniai", "kpi"])
+    po_iterpimo = _suvestines(db)
+    assert po_iterpimo == _rebuilt(db)
+
+    _pakeisti(db, ids[:4], frachtas=999.99, kilometrai=1234)
+    _pakeisti(db, ids[4:7], pakrovimo_data="2026-04-01", vilkikas="VK009")
+    _pakeisti(db, ids[-1:], pakrovimo_data="2026-01-15")
+    po_keitimo = _suvestines(db)
+    assert po_keitimo != po_iterpimo
+    assert po_keitimo == _rebuilt(db)
+
+    _istrinti(db, ids[::3])
+    po_trynimo = _suvestines(db)
+    assert po_trynimo == _rebuilt(db)
+
+    _istrinti(db, [r[0] for r in db.query("SELECT id FROM kroviniai")])
+    assert all(not rows for rows in _suvestines(db).values())
+
+
+# ─── _split_range ─────────────────────────────────────────────────────────────
+def _dienos(nuo, iki):
+    return {nuo + timedelta(days=i) for i in range((iki - nuo).days + 1)}
+
+
+def _menesio_dienos(men):
+    pradzia = date.fromisoformat(f"{men}-01")
+    pabaiga = (pradzia.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return _dienos(pradzia, pabaiga)
+
+
+@pytest.mark.parametrize("nuo, iki, months, edges", [
+    (date(2026, 1, 1), date(2026, 1, 31), ("2026-01", "2026-01"), []),
+    (date(2026, 1, 5), date(2026, 1, 20), None, [(date(2026, 1, 5), date(2026, 1, 20))]),
+    (date(2026, 1, 15), date(2026, 2, 10), None, [(date(2026, 1, 15), date(2026, 2, 10))]),
+    (date(2025, 12, 31), date(2026, 3, 1), ("2026-01", "2026-02"),
+     [(date(2025, 12, 31), date(2025, 12, 31)), (date(2026, 3, 1), date(2026, 3, 1))]),
+    (date(2024, 2, 1), date(2024, 2, 29), ("2024-02", "2024-02"), []),
+    (date(2026, 2, 1), date(2026, 2, 27), None, [(date(2026, 2, 1), date(2026, 2, 27))]),
+])
+def test_split_range_cases(nuo, iki, months, edges):
+    assert kpi._split_range(nuo, iki) == (months, edges)
+
+
+def test_split_range_covers_each_day_once():
+    rng = random.Random(7)
+    for _ in range(2000):
+        nuo = date(2023, 1, 1) + timedelta(days=rng.randrange(1200))
+        iki = nuo + timedelta(days=rng.randrange(400))
+        months, edges = kpi._split_range(nuo, iki)
+        dalys = [_dienos(a, b) for a, b in edges]
+        if months:
+            m = date.fromisoformat(f"{months[0]}-01")
+            while m.strftime("%Y-%m") <= months[1]:
+                dalys.append(_menesio_dienos(m.strftime("%Y-%m")))
+                m = (m.replace(day=28) + timedelta(days=4)).replace(day=1)
+        assert sum(len(d) for d in dalys) == len(_dienos(nuo, iki))
+        assert set().union(*dalys) == _dienos(nuo, iki)
@@ -0,0 +1,60 @@
+import threading
+
+import pandas as pd
+
+import cargo
+
+GIJOS = 8
+KARTAI = 25
+
+
+def _krovinys(numeris):
+    return {"klientas": "Klientas", "uzsakymo_numeris": numeris,
+            "pakrovimo_data": "2026-01-05", "iskrovimo_data": "2026-01-06"}
+
+
+def _numeriai(db):
+    return [r[0] for r in db.query("SELECT uzsakymo_numeris FROM kroviniai")]
+
+
+def test_manual_suffix_is_skipped(db):
+    assert cargo.save(db, _krovinys("ORD"))[1] == "ORD"
+    assert cargo.save(db, _krovinys("ORD-1"))[1] == "ORD-1"
+    assert cargo.save(db, _krovinys("ORD"))[1] == "ORD-2"
+    assert sorted(_numeriai(db)) == ["ORD", "ORD-1", "ORD-2"]
+
+
+def test_concurrent_saves_get_unique_numbers(db):
+    # Ranka įvesti numeriai su priesaga, kuriuos skaitiklis turi praleisti
+    for numeris in ("ORD-3", "ORD-7"):
+        cargo.save(db, _krovinys(numeris))
+    klaidos = []
+
+    def darbas():
+        try:
+            for _ in range(KARTAI):
+                cargo.save(db, _krovinys("ORD"))
+        except Exception as e:
+            klaidos.append(e)
+
+    gijos = [threading.Thread(target=darbas) for _ in range(GIJOS)]
+    for g in gijos:
+        g.start()
+    for g in gijos:
+        g.join()
+
+    assert not klaidos
+    numeriai = _numeriai(db)
+    assert len(numeriai) == GIJOS * KARTAI + 2
+    assert len(set(numeriai)) == len(numeriai)
+
+
+
+def test_insert_many_skips_taken_numbers(db):
+    cargo.save(db, _krovinys("ORD"))
+    cargo.save(db, _krovinys("ORD-1"))
+    # "ORD-2" paketo viduje sutampa su trečiu "ORD" panaudojimu
+    frame = pd.DataFrame([_krovinys(n) for n in ("ORD", "ORD-2", "ORD")]).reindex(columns=cargo.FIELDS)
+    db.transaction(lambda conn: cargo.insert_many(conn, frame), tables=["kroviniai", "kpi"])
+    numeriai = _numeriai(db)
+    assert len(set(numeriai)) == len(numeriai) == 5
@@ -0,0 +1,31 @@
+import profiler
+from db import Database
+
+
+def test_profiler_follows_database(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "_profiler", None)
+    prof = profiler.get_profiler(db)
+    assert profiler.get_profiler(db) is prof
+
+    kita = Database(str(tmp_path / "kita.db"), readers=1)
+    try:
+        naujas = profiler.get_profiler(kita)
+        assert naujas is not prof and naujas.db is kita
+        naujas.start()
+        kita.query("SELECT 1")
+        naujas.finish()
+        assert [q["sql"] for q in naujas.reruns()[0]["uzklausos"]] == ["SELECT 1"]
+    finally:
+        kita.close()
+
+
+def test_unfinished_rerun_is_closed_on_next_start(db):
+    prof = profiler.Profiler(db, log_path=None)
+    prof.start()
+    prof.mark("schema")
+    db.query("SELECT 1")
+    prof.start()  # ankstesnis nutrūko prieš main.py try/finally
+    prof.finish()
+    pirmas, antras = prof.reruns()
+    assert pirmas["nutrauktas"] and not antras["nutrauktas"]
+    assert len(pirmas["uzklausos"]) == 1 and "schema" in pirmas["sekcijos"]
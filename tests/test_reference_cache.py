@@ -0,0 +1,27 @@
+from reference_cache import ReferenceCache
+
+
+class _Db:
+    def add_listener(self, fn):
+        self.listener = fn
+
+
+def test_bump_drops_stale_entries():
+    db = _Db()
+    ref = ReferenceCache(db)
+    kvietimai = []
+    ref.cached("lookup", "a", lambda: kvietimai.append("a") or 1)
+    ref.cached(("vilkikai", "priekabos"), "b", lambda: kvietimai.append("b") or 2)
+    db.listener({"priekabos"})
+    assert list(ref._data) == [("lookup", "a")]
+    assert ref.cached(("vilkikai", "priekabos"), "b", lambda: 3) == 3
+    assert ref.cached("lookup", "a", lambda: 4) == 1
+
+
+def test_entries_are_bounded():
+    ref = ReferenceCache(_Db(), max_entries=3)
+    for i in range(10):
+        ref.cached("kroviniai", i, lambda i=i: i)
+    ref.cached("kroviniai", 7, lambda: None)  # naudotas neseniai
+    ref.cached("kroviniai", 10, lambda: 10)
+    assert [k for _, k in ref._data] == [9, 7, 10]
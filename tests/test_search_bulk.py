@@ -0,0 +1,54 @@
+import time
+
+import pandas as pd
+import pytest
+
+import cargo
+import search
+
+KIEKIS = 20000
+# Su trigeriu eilutė po eilutės SAVEPOINT'e tai užtrukdavo ~10 s
+RIBA_S = 5
+
+
+def _kroviniai(n):
+    return pd.DataFrame({
+        "klientas": [f"Klientas {i % 50:03d} UAB" for i in range(n)],
+        "uzsakymo_numeris": [f"MAS{i:06d}" for i in range(n)],
+        "pakrovimo_data": "2026-01-05", "iskrovimo_data": "2026-01-06",
+        "pakrovimo_miestas": "Vilnius", "iskrovimo_miestas": "Berlin",
+        "vilkikas": [f"VK{i % 300:05d}" for i in range(n)],
+    }).reindex(columns=cargo.FIELDS)
+
+
+def _rasta(db, text):
+    rezultatai = search.search(db, text, limit=KIEKIS)
+    return len(rezultatai.get("Kroviniai", []))
+
+
+def test_bulk_insert_with_search_is_fast_and_indexed(db):
+    frame = _kroviniai(KIEKIS)
+    t0 = time.perf_counter()
+    db.transaction(lambda conn: cargo.insert_many(conn, frame), tables=["kroviniai", "kpi"])
+    assert time.perf_counter() - t0 < RIBA_S
+
+    assert _rasta(db, "MAS000123") == 1
+    assert _rasta(db, "vilnius") == KIEKIS
+    # INSERT trigeris atkurtas – pavienis įrašas indeksuojamas iškart
+    cargo.save(db, {"klientas": "Pavienis", "uzsakymo_numeris": "VIEN-1",
+                    "pakrovimo_data": "2026-01-07", "iskrovimo_data": "2026-01-08"})
+    assert _rasta(db, "pavienis") == 1
+    assert db.query("SELECT COUNT(*) FROM sqlite_master WHERE name = 'tr_paieska_kroviniai_ai'")[0][0] == 1
+
+
+def test_failed_bulk_insert_keeps_trigger(db):
+    def darbas(conn):
+        cargo.insert_many(conn, _kroviniai(10))
+        raise RuntimeError("nutrauktas importas")
+
+    with pytest.raises(RuntimeError):
+        db.transaction(darbas, tables=["kroviniai", "kpi"])
+    assert db.query("SELECT COUNT(*) FROM kroviniai")[0][0] == 0
+    cargo.save(db, {"klientas": "Pavienis", "uzsakymo_numeris": "VIEN-2",
+                    "pakrovimo_data": "2026-01-07", "iskrovimo_data": "2026-01-08"})
+    assert _rasta(db, "pavienis") == 1